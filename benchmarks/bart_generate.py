@@ -0,0 +1,67 @@
+"""
+Benchmark autoregressive decoding with BartModel.generate on the CPU.
+
+Greedy generation is timed with the key/value cache, where the decoder only
+processes the last token at every step, and without it, where the whole prefix
+is decoded again at every step. The generated tokens per second are reported
+for both, on a randomly initialized model of the given size.
+
+    python benchmarks/bart_generate.py --batch-size 4 --max-length 64
+"""
+import time
+import argparse
+
+import ivy
+from ivy_models import BartConfig, BartModel
+
+
+def tokens_per_second(model, input_ids, max_length, use_cache, runs):
+    model.generate(input_ids, max_length=max_length, use_cache=use_cache)
+    start = time.perf_counter()
+    num_tokens = 0
+    for _ in range(runs):
+        sequences = model.generate(
+            input_ids, max_length=max_length, use_cache=use_cache
+        )
+        num_tokens += sequences.shape[0] * (sequences.shape[1] - 1)
+    return num_tokens / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--backend", default="torch")
+    parser.add_argument("--batch-size", type=int, default=4)
+    parser.add_argument("--source-length", type=int, default=64)
+    parser.add_argument("--max-length", type=int, default=64)
+    parser.add_argument("--layers", type=int, default=6)
+    parser.add_argument("--d-model", type=int, default=512)
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    ivy.set_backend(args.backend)
+    ivy.set_default_device("cpu")
+    config = BartConfig(
+        encoder_layers=args.layers,
+        decoder_layers=args.layers,
+        d_model=args.d_model,
+        encoder_attention_heads=args.d_model // 64,
+        decoder_attention_heads=args.d_model // 64,
+        encoder_ffn_dim=args.d_model * 4,
+        decoder_ffn_dim=args.d_model * 4,
+        # never stop early, so that both runs generate the same number of tokens
+        eos_token_id=-1,
+    )
+    model = BartModel(config)
+    input_ids = ivy.randint(
+        3, config.vocab_size, shape=(args.batch_size, args.source_length)
+    )
+
+    cached = tokens_per_second(model, input_ids, args.max_length, True, args.runs)
+    uncached = tokens_per_second(model, input_ids, args.max_length, False, args.runs)
+    print(f"cached:   {cached:.1f} tokens/s")
+    print(f"uncached: {uncached:.1f} tokens/s")
+    print(f"speedup:  {cached / uncached:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
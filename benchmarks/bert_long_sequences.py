@@ -0,0 +1,75 @@
+"""
+Benchmark BERT on sequences longer than its 512 positions.
+
+A BERT base encoder with the sliding window attention, whose position
+embeddings are extended past `max_position_embeddings`, is timed on single
+sequences of growing length, against the dense attention on the same
+weights. The time of the sliding window attention grows linearly with the
+length, the one of the dense attention quadratically.
+
+    python benchmarks/bert_long_sequences.py --seq-len 512 1024 2048 4096
+"""
+import time
+import argparse
+
+import numpy as np
+import ivy
+from ivy_models.bert import BertConfig, BertModel
+
+
+def latency(model, input_ids, runs):
+    model(input_ids)
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        model(input_ids)
+        times.append(time.perf_counter() - start)
+    return np.median(times) * 1e3
+
+
+def config(**kwargs):
+    return BertConfig(
+        vocab_size=30522,
+        hidden_size=768,
+        num_hidden_layers=12,
+        num_attention_heads=12,
+        intermediate_size=3072,
+        hidden_act="gelu",
+        max_position_embeddings=512,
+        **kwargs,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--backend", default="torch")
+    parser.add_argument("--seq-len", type=int, nargs="+", default=[512, 1024, 4096])
+    parser.add_argument("--window", type=int, default=256)
+    parser.add_argument("--global-tokens", type=int, default=1)
+    parser.add_argument("--position-extension", default="tile")
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    ivy.set_backend(args.backend)
+    dense = BertModel(config(position_extension=args.position_extension))
+    window = BertModel(
+        config(
+            attention_mode="sliding_window",
+            attention_window=args.window,
+            num_global_tokens=args.global_tokens,
+            position_extension=args.position_extension,
+        ),
+        v=dense.v,
+    )
+    for seq_len in args.seq_len:
+        input_ids = ivy.randint(0, 30522, shape=(1, seq_len))
+        dense_ms = latency(dense, input_ids, args.runs)
+        window_ms = latency(window, input_ids, args.runs)
+        print(
+            f"seq len {seq_len}: dense {dense_ms:.1f}ms, "
+            f"sliding window {window_ms:.1f}ms ({dense_ms / window_ms:.2f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Report the top-1 predictions of pretrained classifiers on the images in
+`images/` with full precision weights and with weights stored in reduced
+precision.
+
+By default the reduced precision weights are cast back to float32 before the
+forward pass, which measures the effect of storing them as float16/bfloat16 on
+disk. With `--in-memory` the weights and inputs stay in reduced precision.
+Either way the normalization parameters, batch norm statistics and position
+embeddings are kept in float32 unless `--no-keep-fp32` is passed.
+
+    python benchmarks/dtype_policy_accuracy.py --dtype bfloat16 --models vit_b_16
+"""
+import os
+import argparse
+
+import numpy as np
+import ivy
+import ivy_models
+from ivy_models.helpers import cast_weights
+from ivy_models_tests import helpers
+
+# the data format of the inputs each factory expects by default
+MODELS = {
+    "resnet_50": "NHWC",
+    "efficientnet_b0": "NHWC",
+    "vit_b_16": "NHWC",
+    "convnext_tiny": "NCHW",
+}
+IMAGES_DIR = os.path.join(os.path.dirname(os.path.realpath(__file__)), "..", "images")
+
+
+def softmax(x):
+    x = np.exp(x - x.max(axis=-1, keepdims=True))
+    return x / x.sum(axis=-1, keepdims=True)
+
+
+def predict(model, images, dtype=None):
+    probs = []
+    for img in images:
+        img = img if dtype is None else ivy.astype(img, dtype)
+        logits = ivy.to_numpy(ivy.astype(model(img), "float32"))
+        probs.append(softmax(logits[0]))
+    return np.stack(probs)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--models", nargs="+", default=list(MODELS.keys()))
+    parser.add_argument("--dtype", default="float16", choices=["float16", "bfloat16"])
+    parser.add_argument("--in-memory", action="store_true")
+    parser.add_argument("--no-keep-fp32", action="store_true")
+    parser.add_argument("--backend", default="torch")
+    args = parser.parse_args()
+
+    ivy.set_backend(args.backend)
+    keep_fp32 = not args.no_keep_fp32
+    names = sorted(n for n in os.listdir(IMAGES_DIR) if n.endswith(".jpg"))
+
+    print(
+        f"{'model':<18}{'image':<12}{'top-1 fp32':>11}{'top-1 ' + args.dtype:>16}"
+        f"{'max |dp|':>11}"
+    )
+    for name in args.models:
+        data_format = MODELS[name]
+        images = [
+            ivy.asarray(
+                helpers.load_and_preprocess_img(
+                    os.path.join(IMAGES_DIR, image),
+                    256,
+                    224,
+                    data_format=data_format,
+                    to_ivy=True,
+                )
+            )
+            for image in names
+        ]
+        factory = getattr(ivy_models, name)
+        reference = predict(factory(pretrained=True), images)
+
+        model = factory(pretrained=True, dtype=args.dtype, keep_fp32=keep_fp32)
+        if args.in_memory:
+            reduced = predict(model, images, dtype=args.dtype)
+        else:
+            model.v = cast_weights(model.v, "float32", keep_fp32=False)
+            reduced = predict(model, images)
+
+        for image, p_ref, p_red in zip(names, reference, reduced):
+            print(
+                f"{name:<18}{image:<12}{p_ref.argmax():>11}{p_red.argmax():>16}"
+                f"{np.abs(p_ref - p_red).max():>11.2e}"
+            )
+        agreement = np.mean(reference.argmax(-1) == reduced.argmax(-1))
+        print(f"{name:<18}top-1 agreement: {agreement:.0%}")
+
+
+if __name__ == "__main__":
+    main()
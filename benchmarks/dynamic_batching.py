@@ -0,0 +1,76 @@
+"""
+Benchmark BERT inference with and without the length-bucketing batcher.
+
+Concurrent clients send requests of skewed lengths back to back, either
+calling the model directly at batch size 1 or through a `DynamicBatcher`. The
+throughput and the p50/p99 request latencies are reported for both.
+
+    python benchmarks/dynamic_batching.py --clients 16 --requests 512
+"""
+import time
+import argparse
+import threading
+
+import numpy as np
+import ivy
+import ivy_models
+from ivy_models.helpers import DynamicBatcher
+
+
+def run(call, requests, clients):
+    latencies = []
+    lock = threading.Lock()
+
+    def client(rows):
+        for row in rows:
+            start = time.perf_counter()
+            call(row)
+            with lock:
+                latencies.append(time.perf_counter() - start)
+
+    threads = [
+        threading.Thread(target=client, args=(requests[i::clients],))
+        for i in range(clients)
+    ]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    p50, p99 = np.percentile(np.array(latencies) * 1e3, [50, 99])
+    return (
+        f"{len(requests) / elapsed:.1f} requests/s, "
+        f"p50 {p50:.1f}ms, p99 {p99:.1f}ms"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--backend", default="torch")
+    parser.add_argument("--clients", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=512)
+    parser.add_argument("--max-batch-size", type=int, default=16)
+    parser.add_argument("--max-delay", type=float, default=0.005)
+    args = parser.parse_args()
+
+    ivy.set_backend(args.backend)
+    model = ivy_models.bert_base_uncased(pretrained=False)
+    # most requests are short with a long tail, as in production traffic
+    rng = np.random.default_rng(0)
+    lengths = np.clip(rng.lognormal(3.5, 0.8, args.requests), 4, 512).astype(int)
+    requests = [rng.integers(1000, 30000, n).tolist() for n in lengths]
+
+    def unbatched(row):
+        return model(ivy.asarray([row]))
+
+    batcher = DynamicBatcher(
+        model, max_batch_size=args.max_batch_size, max_delay=args.max_delay
+    )
+    print(f"unbatched: {run(unbatched, requests, args.clients)}")
+    print(f"batched:   {run(batcher, requests, args.clients)}")
+    batcher.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Benchmark the fused query/key/value projection of the attention layers.
+
+A single BERT layer and BART encoder layer are timed with the three separate
+projections and with the fused one, sharing the same weights, on batches of
+hidden states of the given size. ViT isn't included as `ivy.MultiHeadAttention`
+already projects the queries, keys and values with a single fused weight.
+
+    python benchmarks/fused_qkv.py --batch-size 8 --seq-len 128 384
+"""
+import time
+import argparse
+
+import numpy as np
+import ivy
+from ivy_models.bart import BartConfig
+from ivy_models.bart.layers import BartEncoderLayer
+from ivy_models.bert import BertConfig
+from ivy_models.bert.bert import BertLayer
+from ivy_models.helpers import fuse_linear_weights
+
+FUSED_NAMES = {
+    "bert": (["query", "key", "value"], "qkv"),
+    "bart": (["q_proj", "k_proj", "v_proj"], "qkv_proj"),
+}
+
+
+def latency(layer, hidden_states, runs):
+    layer(hidden_states)
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        layer(hidden_states)
+        times.append(time.perf_counter() - start)
+    return np.median(times) * 1e3
+
+
+def layers(hidden_size, fused_qkv, v=None):
+    bert_config = BertConfig(
+        vocab_size=30522,
+        hidden_size=hidden_size,
+        num_hidden_layers=1,
+        num_attention_heads=hidden_size // 64,
+        intermediate_size=hidden_size * 4,
+        hidden_act="gelu",
+        max_position_embeddings=512,
+        fused_qkv=fused_qkv,
+    )
+    bart_config = BartConfig(
+        d_model=hidden_size,
+        encoder_attention_heads=hidden_size // 64,
+        encoder_ffn_dim=hidden_size * 4,
+        dropout=0.0,
+        fused_qkv=fused_qkv,
+    )
+    v = v or {}
+    return {
+        "bert": BertLayer(bert_config, v=v.get("bert")),
+        "bart": BartEncoderLayer(bart_config, v=v.get("bart")),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--backend", default="torch")
+    parser.add_argument("--batch-size", type=int, default=8)
+    parser.add_argument("--seq-len", type=int, nargs="+", default=[128, 384])
+    parser.add_argument("--hidden-size", type=int, default=768)
+    parser.add_argument("--runs", type=int, default=20)
+    args = parser.parse_args()
+
+    ivy.set_backend(args.backend)
+    separate = layers(args.hidden_size, False)
+    # the same weights, with the projections of each layer fused
+    fused = layers(
+        args.hidden_size,
+        True,
+        {
+            name: fuse_linear_weights(layer.v, *FUSED_NAMES[name])
+            for name, layer in separate.items()
+        },
+    )
+    for name in separate.keys():
+        for seq_len in args.seq_len:
+            x = ivy.random_uniform(shape=(args.batch_size, seq_len, args.hidden_size))
+            separate_ms = latency(separate[name], x, args.runs)
+            fused_ms = latency(fused[name], x, args.runs)
+            print(
+                f"{name} layer, seq len {seq_len}: separate {separate_ms:.2f}ms, "
+                f"fused {fused_ms:.2f}ms ({separate_ms / fused_ms:.2f}x)"
+            )
+
+
+if __name__ == "__main__":
+    main()
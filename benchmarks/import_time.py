@@ -0,0 +1,65 @@
+"""
+Profile the time it takes to import `ivy_models`, and then to access a model
+of each family, which imports the family on first access.
+
+Every measurement runs in a fresh interpreter, the slowest modules of the bare
+`import ivy_models` are listed from `-X importtime` as well.
+
+    python benchmarks/import_time.py --models resnet_18 vit_b_16 --top 15
+"""
+import sys
+import argparse
+import subprocess
+
+
+def import_profile(statement):
+    """Return the cumulative import time in seconds of every module imported."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    profile = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, module = line[len("import time:") :].split("|")
+        profile[module.strip()] = int(cumulative) / 1e6
+    return profile
+
+
+def first_access_time(name):
+    statement = (
+        "import time, ivy_models; start = time.perf_counter(); "
+        f"ivy_models.{name}; print(time.perf_counter() - start)"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", statement], check=True, capture_output=True, text=True
+    )
+    return float(result.stdout.strip())
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--models", nargs="+", default=["resnet_18", "bert_base_uncased"]
+    )
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args()
+
+    profile = import_profile("import ivy_models")
+    print(f"import ivy_models: {profile['ivy_models']:.3f}s")
+    print(f"\n{'slowest imports':<48}{'cumulative (s)':>16}")
+    profile.pop("ivy_models")
+    slowest = sorted(profile.items(), key=lambda item: -item[1])
+    for module, seconds in slowest[: args.top]:
+        print(f"{module:<48}{seconds:>16.3f}")
+
+    print(f"\n{'first access':<48}{'time (s)':>16}")
+    for name in args.models:
+        print(f"ivy_models.{name:<37}{first_access_time(name):>16.3f}")
+
+
+if __name__ == "__main__":
+    main()
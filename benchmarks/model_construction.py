@@ -0,0 +1,66 @@
+"""
+Benchmark the construction time of every model factory exported by
+`ivy_models`, with randomly initialized weights so that no checkpoint is
+downloaded or converted, and as an uninitialized skeleton, which is how the
+factories build models before binding pretrained weights to them.
+
+    python benchmarks/model_construction.py --models densenet201 vit_h_14
+"""
+import time
+import inspect
+import argparse
+
+import ivy
+import ivy_models
+from ivy_models.helpers import skeleton_weights
+
+
+def factories():
+    """Return the factories of `ivy_models` which can be called without arguments."""
+    found = {}
+    for name in sorted(dir(ivy_models)):
+        fn = getattr(ivy_models, name)
+        if name.startswith("_") or not inspect.isfunction(fn):
+            continue
+        params = inspect.signature(fn).parameters
+        if "pretrained" in params and all(
+            p.default is not p.empty or p.kind in (p.VAR_POSITIONAL, p.VAR_KEYWORD)
+            for p in params.values()
+        ):
+            found[name] = fn
+    return found
+
+
+def time_construction(factory, repeats, skeleton=False):
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        if skeleton:
+            with skeleton_weights():
+                factory(pretrained=False)
+        else:
+            factory(pretrained=False)
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--models", nargs="+")
+    parser.add_argument("--backend", default="torch")
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    ivy.set_backend(args.backend)
+    available = factories()
+    names = args.models or list(available.keys())
+
+    print(f"{'model':<32}{'random init (s)':>17}{'skeleton (s)':>14}")
+    for name in names:
+        random_time = time_construction(available[name], args.repeats)
+        skeleton_time = time_construction(available[name], args.repeats, True)
+        print(f"{name:<32}{random_time:>17.3f}{skeleton_time:>14.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+"""
+Benchmark the tiled attention against the dense one on long sequences.
+
+A single BERT layer, BART encoder layer and ViT encoder block are run in a
+fresh process per sequence length and attention mode, sharing the same random
+weights, and the median latency and the peak resident memory of the process
+are reported. The dense attention holds the `(batch, heads, T, T)` weights of
+the layer while the tiled one only holds `(batch, heads, T, tile)` scores at a
+time, so the gap grows with the sequence length.
+
+    python benchmarks/tiled_attention.py --seq-len 1024 4096 --tile-size 256
+"""
+import sys
+import json
+import time
+import argparse
+import resource
+import subprocess
+
+import numpy as np
+
+MODELS = ("bert", "bart", "vit")
+
+
+def _peak_rss():
+    # ru_maxrss is in kilobytes on linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def _layer(name, hidden_size, attention_mode, tile_size):
+    from ivy_models.bart import BartConfig
+    from ivy_models.bart.layers import BartEncoderLayer
+    from ivy_models.bert import BertConfig
+    from ivy_models.bert.bert import BertLayer
+    from ivy_models.vit.layers import VIT_EncoderBlock
+
+    num_heads = hidden_size // 64
+    if name == "bert":
+        config = BertConfig(
+            vocab_size=30522,
+            hidden_size=hidden_size,
+            num_hidden_layers=1,
+            num_attention_heads=num_heads,
+            intermediate_size=hidden_size * 4,
+            hidden_act="gelu",
+            max_position_embeddings=512,
+            attention_mode=attention_mode,
+            attention_tile_size=tile_size,
+        )
+        return BertLayer(config)
+    if name == "bart":
+        config = BartConfig(
+            d_model=hidden_size,
+            encoder_attention_heads=num_heads,
+            encoder_ffn_dim=hidden_size * 4,
+            dropout=0.0,
+            attention_mode=attention_mode,
+            attention_tile_size=tile_size,
+        )
+        return BartEncoderLayer(config)
+    return VIT_EncoderBlock(
+        num_heads,
+        hidden_size,
+        hidden_size * 4,
+        0.0,
+        0.0,
+        attention_mode=attention_mode,
+        attention_tile_size=tile_size,
+    )
+
+
+def _child(args):
+    import ivy
+
+    ivy.set_backend(args.backend)
+    ivy.seed(seed_value=0)
+    layer = _layer(args.child, args.hidden_size, args.mode, args.tile_size)
+    x = ivy.random_uniform(shape=(args.batch_size, args.seq_len[0], args.hidden_size))
+    layer(x)
+    times = []
+    for _ in range(args.runs):
+        start = time.perf_counter()
+        layer(x)
+        times.append(time.perf_counter() - start)
+    print(json.dumps({"ms": np.median(times) * 1e3, "peak_rss": _peak_rss()}))
+
+
+def _run(args, name, mode, seq_len):
+    cmd = [
+        sys.executable,
+        __file__,
+        "--child",
+        name,
+        "--mode",
+        mode,
+        "--seq-len",
+        str(seq_len),
+        "--backend",
+        args.backend,
+        "--batch-size",
+        str(args.batch_size),
+        "--hidden-size",
+        str(args.hidden_size),
+        "--tile-size",
+        str(args.tile_size),
+        "--runs",
+        str(args.runs),
+    ]
+    out = subprocess.run(cmd, check=True, capture_output=True, text=True).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--models", nargs="+", default=list(MODELS))
+    parser.add_argument("--backend", default="torch")
+    parser.add_argument("--batch-size", type=int, default=1)
+    parser.add_argument("--seq-len", type=int, nargs="+", default=[1024, 4096])
+    parser.add_argument("--hidden-size", type=int, default=768)
+    parser.add_argument("--tile-size", type=int, default=256)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--child", choices=MODELS)
+    parser.add_argument("--mode", default="dense")
+    args = parser.parse_args()
+
+    if args.child:
+        return _child(args)
+
+    for name in args.models:
+        for seq_len in args.seq_len:
+            dense = _run(args, name, "dense", seq_len)
+            tiled = _run(args, name, "tiled", seq_len)
+            print(
+                f"{name} layer, seq len {seq_len}: "
+                f"dense {dense['ms']:.1f}ms {dense['peak_rss'] / 2**20:.0f}MiB, "
+                f"tiled {tiled['ms']:.1f}ms {tiled['peak_rss'] / 2**20:.0f}MiB "
+                f"({dense['peak_rss'] / tiled['peak_rss']:.2f}x less memory)"
+            )
+
+
+if __name__ == "__main__":
+    main()
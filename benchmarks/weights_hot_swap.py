@@ -0,0 +1,80 @@
+"""
+Benchmark swapping the weights of a model which is serving requests.
+
+A client thread sends requests back to back while the main thread swaps the
+weights a number of times, the request latencies are then reported for the
+requests served with no swap in progress and for the ones overlapping a swap,
+along with the time taken to prepare the new weights and to publish them.
+
+    python benchmarks/weights_hot_swap.py --model resnet_50 --swaps 5
+"""
+import time
+import argparse
+import threading
+
+import numpy as np
+import ivy
+import ivy_models
+from ivy_models.helpers import HotSwapModel
+
+
+def percentiles(latencies):
+    if not latencies:
+        return "n/a"
+    p50, p99 = np.percentile(np.array(latencies) * 1e3, [50, 99])
+    return f"p50 {p50:.1f}ms, p99 {p99:.1f}ms ({len(latencies)} requests)"
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--model", default="resnet_50")
+    parser.add_argument("--backend", default="torch")
+    parser.add_argument("--swaps", type=int, default=5)
+    parser.add_argument("--interval", type=float, default=1.0)
+    args = parser.parse_args()
+
+    ivy.set_backend(args.backend)
+    model = getattr(ivy_models, args.model)(pretrained=False)
+    server = HotSwapModel(model)
+    # numpy copies of the weights stand in for a freshly loaded checkpoint
+    new_weights = model.v.cont_map(lambda x, kc: ivy.to_numpy(x))
+    x = ivy.random_uniform(shape=(1, 224, 224, 3))
+
+    swapping = threading.Event()
+    stop = threading.Event()
+    latencies = {False: [], True: []}
+
+    def client():
+        while not stop.is_set():
+            overlaps = swapping.is_set()
+            start = time.perf_counter()
+            server(x)
+            overlaps = overlaps or swapping.is_set()
+            latencies[overlaps].append(time.perf_counter() - start)
+
+    thread = threading.Thread(target=client)
+    thread.start()
+    prepare_times, flip_times = [], []
+    for _ in range(args.swaps):
+        time.sleep(args.interval)
+        swapping.set()
+        start = time.perf_counter()
+        prepared = server.prepare(new_weights)
+        prepare_times.append(time.perf_counter() - start)
+        start = time.perf_counter()
+        server.swap(prepared, prepared=True)
+        flip_times.append(time.perf_counter() - start)
+        swapping.clear()
+    time.sleep(args.interval)
+    stop.set()
+    thread.join()
+    server.close()
+
+    print(f"prepare: {np.mean(prepare_times) * 1e3:.1f}ms on average")
+    print(f"publish: {np.mean(flip_times) * 1e6:.1f}us on average")
+    print(f"requests without a swap: {percentiles(latencies[False])}")
+    print(f"requests during a swap: {percentiles(latencies[True])}")
+
+
+if __name__ == "__main__":
+    main()
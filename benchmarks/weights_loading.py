@@ -0,0 +1,55 @@
+"""
+Benchmark the load time of pretrained weights for a number of conversion
+workers.
+
+The weights cache is disabled so every load goes through the checkpoint
+conversion, the first load of each model is discarded as it also downloads
+the checkpoint and compiles the mapping plan.
+
+    python benchmarks/weights_loading.py --models vit_h_14 densenet201 --workers 1 8 32
+"""
+import time
+import argparse
+
+import ivy
+import ivy_models
+from ivy_models import helpers
+
+
+def time_load(factory, num_workers, repeats):
+    helpers.set_weights_num_workers(num_workers)
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        factory(pretrained=True)
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--models", nargs="+", default=["resnet_50", "densenet201"])
+    parser.add_argument("--workers", nargs="+", type=int, default=[1, 4, 16])
+    parser.add_argument("--backend", default="torch")
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    ivy.set_backend(args.backend)
+    helpers.set_weights_cache_size_limit(0)
+
+    print(f"{'model':<20}{'workers':>8}{'load (s)':>12}{'speedup':>10}")
+    for name in args.models:
+        factory = getattr(ivy_models, name)
+        factory(pretrained=True)
+        baseline = None
+        for num_workers in args.workers:
+            load_time = time_load(factory, num_workers, args.repeats)
+            baseline = baseline or load_time
+            print(
+                f"{name:<20}{num_workers:>8}{load_time:>12.2f}"
+                f"{baseline / load_time:>10.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
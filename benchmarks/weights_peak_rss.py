@@ -0,0 +1,77 @@
+"""
+Benchmark the peak resident memory of loading pretrained weights.
+
+Every model is loaded in a fresh process, once with random weights and once
+with pretrained ones, the difference between the two peaks is the memory the
+checkpoint conversion needs on top of the model itself. The weights cache is
+disabled so that every load converts the checkpoint. A zero-copy loader
+keeps it close to one copy of the weights.
+
+    python benchmarks/weights_peak_rss.py --models resnet_152 vit_l_16
+"""
+import sys
+import json
+import argparse
+import resource
+import subprocess
+
+import numpy as np
+
+
+def _peak_rss():
+    # ru_maxrss is in kilobytes on linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def _child(name, backend, pretrained):
+    import ivy
+    import ivy_models
+
+    ivy.set_backend(backend)
+    ivy_models.helpers.set_weights_cache_size_limit(0)
+    model = getattr(ivy_models, name)(pretrained=pretrained)
+    weights_bytes = sum(
+        int(np.prod(ivy.shape(x))) * ivy.dtype_bits(ivy.dtype(x)) // 8
+        for _, x in model.v.cont_to_iterator()
+    )
+    print(json.dumps({"peak_rss": _peak_rss(), "weights_bytes": weights_bytes}))
+
+
+def _run(name, backend, pretrained):
+    cmd = [sys.executable, __file__, "--child", name, "--backend", backend]
+    if pretrained:
+        cmd.append("--pretrained")
+    out = subprocess.run(cmd, check=True, capture_output=True, text=True).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--models", nargs="+", default=["resnet_152", "vit_l_16"])
+    parser.add_argument("--backend", default="torch")
+    parser.add_argument("--child")
+    parser.add_argument("--pretrained", action="store_true")
+    args = parser.parse_args()
+
+    if args.child:
+        return _child(args.child, args.backend, args.pretrained)
+
+    # make sure the checkpoints are downloaded before measuring anything
+    for name in args.models:
+        _run(name, args.backend, True)
+
+    gb = 1024**3
+    print(f"{'model':<16}{'weights (GB)':>14}{'extra peak (GB)':>17}{'copies':>8}")
+    for name in args.models:
+        random = _run(name, args.backend, False)
+        pretrained = _run(name, args.backend, True)
+        extra = pretrained["peak_rss"] - random["peak_rss"]
+        weights_bytes = pretrained["weights_bytes"]
+        print(
+            f"{name:<16}{weights_bytes / gb:>14.2f}{extra / gb:>17.2f}"
+            f"{extra / weights_bytes:>8.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,32 +1,166 @@
+import importlib
+
 from . import base
 from .base import *
 from . import helpers
+from .helpers import model_factory
+
+
+# Model zoo registry #
+# -------------------#
+
+# the model families are only imported the first time one of their names is
+# accessed, so that `import ivy_models` stays cheap for a worker serving a
+# single family
+_REGISTRY = {
+    "transformers.perceiver_io": [
+        "PerceiverIOSpec",
+        "PerceiverIO",
+        "perceiver_io_img_classification",
+    ],
+    "resnet": [
+        "ResNetSpec",
+        "ResNet",
+        "resnet_18",
+        "resnet_34",
+        "resnet_50",
+        "resnet_101",
+        "resnet_152",
+    ],
+    "vgg": [
+        "VGGSpec",
+        "VGG",
+        "vgg11",
+        "vgg11_bn",
+        "vgg13",
+        "vgg13_bn",
+        "vgg16",
+        "vgg16_bn",
+        "vgg19",
+        "vgg19_bn",
+    ],
+    "convnext": [
+        "ConvNeXtSpec",
+        "ConvNeXt",
+        "convnext_tiny",
+        "convnext_base",
+        "convnext_large",
+        "convnext_small",
+        "convnextv2_base",
+        "convnextv2_atto",
+    ],
+    "alexnet": ["AlexNetSpec", "AlexNet", "alexnet"],
+    "unet": ["UNetSpec", "UNET", "unet_carvana"],
+    "efficientnet": [
+        "MBConvConfig",
+        "FusedMBConvConfig",
+        "EfficientNetMBConv",
+        "EfficientNetFusedMBConv",
+        "EfficientNetSpec",
+        "EfficientNet",
+        "efficientnet_b0",
+        "efficientnet_b1",
+        "efficientnet_b2",
+        "efficientnet_b3",
+        "efficientnet_b4",
+        "efficientnet_b5",
+        "efficientnet_b6",
+        "efficientnet_b7",
+        "efficientnet_v2_s",
+        "efficientnet_v2_m",
+        "efficientnet_v2_l",
+    ],
+    "squeezenet": ["SqueezeNetSpec", "SqueezeNet", "squeezenet1_0", "squeezenet1_1"],
+    "densenet": [
+        "DenseNetLayerSpec",
+        "DenseNet",
+        "densenet",
+        "densenet121",
+        "densenet161",
+        "densenet169",
+        "densenet201",
+    ],
+    "bart": ["BartConfig", "BartEncoder", "BartDecoder", "BartModel"],
+    "bert": ["BertConfig", "BertModel", "bert_base_uncased"],
+    "vit": [
+        "VisionTransformerSpec",
+        "VisionTransformer",
+        "vit_b_16",
+        "vit_b_32",
+        "vit_h_14",
+        "vit_l_16",
+        "vit_l_32",
+    ],
+    "googlenet": ["GoogLeNetSpec", "GoogLeNet", "inceptionNet_v1"],
+    "inceptionnet": ["InceptionNetSpec", "InceptionV3", "inceptionNet_v3"],
+}
+# the layers and outputs which the families export along with their models
+_LAYERS = {
+    "transformers.perceiver_io": ["PreNorm", "FeedForward"],
+    "efficientnet": [
+        "EfficientNetConv2dNormActivation",
+        "EfficientNetSqueezeExcitation",
+        "EfficientNetStochasticDepth",
+    ],
+    "bart": [
+        "BartLearnedPositionalEmbedding",
+        "BartEncoderLayer",
+        "BartDecoderLayer",
+        "BaseModelOutput",
+        "BaseModelOutputWithPastAndCrossAttentions",
+        "Seq2SeqModelOutput",
+        "shift_tokens_right",
+    ],
+    "googlenet": ["InceptionConvBlock", "InceptionBlock", "InceptionAuxiliaryBlock"],
+    "inceptionnet": [
+        "InceptionBasicConv2d",
+        "InceptionAux",
+        "InceptionA",
+        "InceptionB",
+        "InceptionC",
+        "InceptionD",
+        "InceptionE",
+    ],
+}
+_FAMILIES = {
+    name: family
+    for registry in (_REGISTRY, _LAYERS)
+    for family, names in registry.items()
+    for name in names
+}
+_SUBMODULES = {
+    "transformers": "transformers",
+    "perceiver_io": "transformers.perceiver_io",
+    **{family: family for family in _REGISTRY if "." not in family},
+}
 
-from . import transformers
-from .transformers import perceiver_io
-from .transformers.perceiver_io import *
 
-from .resnet import *
-from .vgg import *
-from .convnext import *
-from .alexnet import *
-from .unet import *
+def models():
+    """Return the names of all the models and specs in the zoo."""
+    return sorted(name for names in _REGISTRY.values() for name in names)
 
-from . import efficientnet
-from .efficientnet import *
 
-from .squeezenet import *
-from .densenet import *
+def _import_family(family):
+    module = importlib.import_module("." + family, __name__)
+    # importing a subpackage binds it here under its own name, which a factory
+    # of the same name, such as `densenet`, takes precedence over
+    package = family.split(".")[0]
+    if _FAMILIES.get(package) == family:
+        globals()[package] = getattr(module, package)
+    return module
 
-from . import bart
-from .bart import *
 
-from . import bert
-from .bert import *
-from .vit import *
+def __getattr__(name):
+    if name in _FAMILIES:
+        value = getattr(_import_family(_FAMILIES[name]), name)
+    elif name in _SUBMODULES:
+        value = importlib.import_module("." + _SUBMODULES[name], __name__)
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    # cache the attribute so that the next accesses don't go through here
+    globals()[name] = value
+    return value
 
-from . import googlenet
-from .googlenet import *
 
-from . import inceptionnet
-from .inceptionnet import *
+def __dir__():
+    return sorted(set(globals().keys()) | set(_FAMILIES.keys()) | set(_SUBMODULES))
@@ -1,6 +1,7 @@
 import ivy
 import ivy_models
 from ivy_models.base import BaseSpec, BaseModel
+from ivy_models.helpers import model_factory
 
 
 class AlexNetSpec(BaseSpec):
@@ -77,6 +78,7 @@ def _alexnet_torch_weights_mapping(old_key, new_key):
     return new_mapping
 
 
+@model_factory
 def alexnet(pretrained=True, num_classes=1000, dropout=0, data_format="NCHW"):
     """Ivy AlexNet model"""
     model = AlexNet(num_classes=num_classes, dropout=dropout, data_format=data_format)
@@ -1,5 +1,11 @@
 import ivy
 from ivy_models.base import BaseModel
+from ivy_models.helpers import (
+    EncoderOutputCache,
+    StaticKVCache,
+    fuse_linear_weights,
+    past_key_values_length as _past_key_values_length,
+)
 from .config_bart import BartConfig
 from typing import Optional, Tuple, Union, List
 from .layers import BartLearnedPositionalEmbedding, BartEncoderLayer, BartDecoderLayer
@@ -9,12 +15,29 @@ from .modeling_outputs import (
     BaseModelOutputWithPastAndCrossAttentions,
     Seq2SeqModelOutput,
 )
-from .helper_func import _expand_mask, _make_causal_mask, shift_tokens_right
+from .helper_func import (
+    _expand_mask,
+    _make_causal_mask,
+    _top_k_top_p_filtering,
+    shift_tokens_right,
+)
 
 
 logger = logging.getLogger(__name__)
 
 
+def _set_training(module, mode, visited=None):
+    visited = set() if visited is None else visited
+    if id(module) in visited:
+        return
+    visited.add(id(module))
+    module.training = mode
+    for value in vars(module).values():
+        for child in value if isinstance(value, (list, tuple)) else [value]:
+            if isinstance(child, ivy.Module):
+                _set_training(child, mode, visited)
+
+
 class BartEncoder(ivy.Module):
     """
     Transformer encoder consisting of *config.encoder_layers* self attention layers.
@@ -160,17 +183,14 @@ class BartEncoder(ivy.Module):
             inputs_embeds = self.embed_tokens(input_ids) * self.embed_scale
 
         embed_pos = self.embed_positions(input)
-        embed_pos = embed_pos.to(inputs_embeds.device)
 
         hidden_states = inputs_embeds + embed_pos
         hidden_states = self.layernorm_embedding(hidden_states)
-        hidden_states = ivy.functional.dropout(
-            hidden_states, p=self.dropout, training=self.training
-        )
+        hidden_states = ivy.dropout(hidden_states, self.dropout, training=self.training)
 
         # expand attention_mask
         if attention_mask is not None:
-            # [bsz, seq_len] -> [bsz, 1, tgt_seq_len, src_seq_len]
+            # [bsz, seq_len] -> [bsz, 1, 1, src_seq_len], shared by all the layers
             attention_mask = _expand_mask(attention_mask, inputs_embeds.dtype)
 
         encoder_states = () if output_hidden_states else None
@@ -281,21 +301,20 @@ class BartDecoder(ivy.Module):
         self, attention_mask, input_shape, inputs_embeds, past_key_values_length
     ):
         # create causal mask
-        # [bsz, seq_len] -> [bsz, 1, tgt_seq_len, src_seq_len]
+        # [1, 1, tgt_seq_len, src_seq_len], sliced from a cached buffer
         combined_attention_mask = None
         if input_shape[-1] > 1:
             combined_attention_mask = _make_causal_mask(
-                input_shape,
+                input_shape[-1],
                 inputs_embeds.dtype,
-                device=inputs_embeds.device,
                 past_key_values_length=past_key_values_length,
+                max_length=self.max_target_positions,
+                device=ivy.dev(inputs_embeds),
             )
 
         if attention_mask is not None:
-            # [bsz, seq_len] -> [bsz, 1, tgt_seq_len, src_seq_len]
-            expanded_attn_mask = _expand_mask(
-                attention_mask, inputs_embeds.dtype, tgt_len=input_shape[-1]
-            ).to(inputs_embeds.device)
+            # [bsz, seq_len] -> [bsz, 1, 1, src_seq_len]
+            expanded_attn_mask = _expand_mask(attention_mask, inputs_embeds.dtype)
             combined_attention_mask = (
                 expanded_attn_mask
                 if combined_attention_mask is None
@@ -436,9 +455,7 @@ class BartDecoder(ivy.Module):
             )
 
         # past_key_values_length
-        past_key_values_length = (
-            past_key_values[0][0].shape[2] if past_key_values is not None else 0
-        )
+        past_key_values_length = _past_key_values_length(past_key_values)
 
         if inputs_embeds is None:
             inputs_embeds = self.embed_tokens(input) * self.embed_scale
@@ -449,21 +466,18 @@ class BartDecoder(ivy.Module):
 
         # expand encoder attention mask
         if encoder_hidden_states is not None and encoder_attention_mask is not None:
-            # [bsz, seq_len] -> [bsz, 1, tgt_seq_len, src_seq_len]
+            # [bsz, seq_len] -> [bsz, 1, 1, src_seq_len]
             encoder_attention_mask = _expand_mask(
-                encoder_attention_mask, inputs_embeds.dtype, tgt_len=input_shape[-1]
+                encoder_attention_mask, inputs_embeds.dtype
             )
 
         # embed positions
         positions = self.embed_positions(input, past_key_values_length)
-        positions = positions.to(inputs_embeds.device)
 
         hidden_states = inputs_embeds + positions
         hidden_states = self.layernorm_embedding(hidden_states)
 
-        hidden_states = ivy.dropout(
-            hidden_states, p=self.dropout, training=self.training
-        )
+        hidden_states = ivy.dropout(hidden_states, self.dropout, training=self.training)
 
         # decoder layers
         all_hidden_states = () if output_hidden_states else None
@@ -490,7 +504,7 @@ class BartDecoder(ivy.Module):
             if output_hidden_states:
                 all_hidden_states += (hidden_states,)
             if self.training:
-                dropout_probability = ivy.random_uniform([])
+                dropout_probability = ivy.random_uniform(low=0, high=1)
                 if dropout_probability < self.layerdrop:
                     continue
 
@@ -530,6 +544,9 @@ class BartDecoder(ivy.Module):
             all_hidden_states += (hidden_states,)
 
         next_cache = next_decoder_cache if use_cache else None
+        if isinstance(past_key_values, StaticKVCache):
+            # the static cache was updated in place by the layers
+            next_cache = past_key_values if use_cache else None
         if not return_dict:
             return tuple(
                 v
@@ -552,10 +569,20 @@ class BartDecoder(ivy.Module):
 
 
 class BartModel(BaseModel):
-    _tied_weights_keys = ["encoder.embed_tokens.v.w", "decoder.embed_tokens.v.w"]
+    # the encoder and decoder also track the embedding passed to their
+    # constructor under `kwargs`
+    _tied_weights_keys = {
+        "encoder/embed_tokens/w": "shared/w",
+        "encoder/kwargs/embed_tokens/w": "shared/w",
+        "decoder/embed_tokens/w": "shared/w",
+        "decoder/kwargs/embed_tokens/w": "shared/w",
+    }
 
     def __init__(self, config: BartConfig, v=None):
         self.config = config
+        if v is not None and config.fused_qkv:
+            # the weights of the checkpoints have separate projections
+            v = fuse_linear_weights(v, ["q_proj", "k_proj", "v_proj"], "qkv_proj")
         super(BartModel, self).__init__(v=v)
 
     @classmethod
@@ -679,3 +706,298 @@ class BartModel(BaseModel):
             encoder_hidden_states=encoder_outputs.hidden_states,
             encoder_attentions=encoder_outputs.attentions,
         )
+
+    def _lm_logits(self, hidden_states):
+        # the language modeling head is tied to the shared embeddings
+        return ivy.matmul(hidden_states, ivy.swapaxes(self.shared.v.w, 0, 1))
+
+    def _static_cache(
+        self, batch_size, max_length, encoder_hidden_states, cross_key_values=None
+    ):
+        config = self.config
+        cache = StaticKVCache(
+            config.decoder_layers,
+            batch_size,
+            config.decoder_attention_heads,
+            max_length,
+            config.d_model // config.decoder_attention_heads,
+            dtype=encoder_hidden_states.dtype,
+            device=ivy.dev(encoder_hidden_states),
+        )
+        if cross_key_values is not None:
+            for layer, cross_key_value in zip(cache, cross_key_values):
+                layer.cross_key_value = cross_key_value
+        return cache
+
+    def _next_token_logits(
+        self, sequences, encoder_hidden_states, attention_mask, past_key_values
+    ):
+        use_cache = past_key_values is not None
+        decoder_outputs = self.decoder(
+            input_ids=sequences[:, -1:] if use_cache else sequences,
+            encoder_hidden_states=encoder_hidden_states,
+            encoder_attention_mask=attention_mask,
+            past_key_values=past_key_values,
+            use_cache=use_cache,
+            output_attentions=False,
+            output_hidden_states=False,
+            return_dict=False,
+        )
+        return self._lm_logits(decoder_outputs[0][:, -1])
+
+    def generate(
+        self,
+        input_ids: ivy.Array,
+        attention_mask: Optional[ivy.Array] = None,
+        max_length: int = 20,
+        do_sample: bool = False,
+        top_k: int = 0,
+        top_p: float = 1.0,
+        temperature: float = 1.0,
+        num_beams: int = 1,
+        length_penalty: float = 1.0,
+        early_stopping: bool = False,
+        use_cache: bool = True,
+        seed: Optional[int] = None,
+        encoder_cache: Optional[EncoderOutputCache] = None,
+    ) -> ivy.Array:
+        """
+        Generate sequences of at most `max_length` tokens, including the decoder
+        start token, for a batch of `input_ids`.
+
+        The encoder runs once, then the decoder advances one token per step,
+        only feeding the last token along with the self-attention keys and
+        values of the previous ones, held in a `StaticKVCache` preallocated for
+        `max_length` positions, and the cross-attention keys and values of the
+        encoder outputs. With `use_cache=False` the whole prefix is decoded
+        again at every step instead. The next token is the most likely one,
+        unless `do_sample` in which case it is sampled from the distribution
+        scaled by `temperature` and restricted by `top_k` and `top_p`. A
+        sequence stops once it produces `config.eos_token_id` and is then padded
+        with `config.pad_token_id`, generation stops when all of them have.
+
+        With `num_beams > 1` the most likely sequence of a beam search is
+        returned instead, see `_beam_search`.
+
+        With an `encoder_cache`, the encoder hidden states and the
+        cross-attention keys and values of every decoder layer are looked up by
+        a hash of `input_ids` and `attention_mask`, and stored after a miss, so
+        that a repeated source skips the encoder and the cross-attention
+        projections.
+        """
+        training = getattr(self, "training", False)
+        _set_training(self, False)
+        try:
+            cached = None
+            if encoder_cache is not None:
+                key = encoder_cache.key(input_ids, attention_mask)
+                cached = encoder_cache.get(key)
+            if cached is not None:
+                encoder_hidden_states, cross_key_values = cached
+            else:
+                encoder_hidden_states = self.encoder(
+                    input_ids=input_ids,
+                    attention_mask=attention_mask,
+                    output_attentions=False,
+                    output_hidden_states=False,
+                    return_dict=False,
+                )[0]
+                cross_key_values = None
+
+            # the padding mask of the sources is expanded once for all the steps
+            encoder_attention_mask = (
+                None
+                if attention_mask is None
+                else _expand_mask(attention_mask, encoder_hidden_states.dtype)
+            )
+            past_key_values = None
+            if use_cache:
+                past_key_values = self._static_cache(
+                    encoder_hidden_states.shape[0] * num_beams,
+                    max_length,
+                    encoder_hidden_states,
+                    cross_key_values,
+                )
+            if num_beams > 1:
+                sequences = self._beam_search(
+                    encoder_hidden_states,
+                    encoder_attention_mask,
+                    past_key_values,
+                    max_length,
+                    num_beams,
+                    length_penalty,
+                    early_stopping,
+                )
+            else:
+                sequences = self._sample(
+                    encoder_hidden_states,
+                    encoder_attention_mask,
+                    past_key_values,
+                    max_length,
+                    do_sample,
+                    top_k,
+                    top_p,
+                    temperature,
+                    seed,
+                )
+
+            if encoder_cache is not None:
+                if past_key_values is not None:
+                    # the cross-attention keys and values are per source, even
+                    # with beams, and were computed by the first step
+                    cross_key_values = tuple(
+                        layer.cross_key_value for layer in past_key_values
+                    )
+                if cached is None or cached[1] is None:
+                    encoder_cache.put(key, (encoder_hidden_states, cross_key_values))
+            return sequences
+        finally:
+            _set_training(self, training)
+
+    def _sample(
+        self,
+        encoder_hidden_states,
+        attention_mask,
+        past_key_values,
+        max_length,
+        do_sample,
+        top_k,
+        top_p,
+        temperature,
+        seed,
+    ):
+        config = self.config
+        bsz = encoder_hidden_states.shape[0]
+        sequences = ivy.full((bsz, 1), config.decoder_start_token_id, dtype=ivy.int64)
+        finished = ivy.zeros((bsz,), dtype=ivy.bool)
+        for step in range(max_length - 1):
+            logits = self._next_token_logits(
+                sequences, encoder_hidden_states, attention_mask, past_key_values
+            )
+            if do_sample:
+                logits = _top_k_top_p_filtering(logits / temperature, top_k, top_p)
+                next_tokens = ivy.multinomial(
+                    logits.shape[-1],
+                    1,
+                    batch_size=bsz,
+                    probs=ivy.softmax(logits, axis=-1),
+                    seed=None if seed is None else seed + step,
+                )[:, 0]
+            else:
+                next_tokens = ivy.argmax(logits, axis=-1)
+            next_tokens = ivy.where(
+                finished,
+                config.pad_token_id,
+                ivy.astype(next_tokens, sequences.dtype),
+            )
+
+            sequences = ivy.concat([sequences, next_tokens[:, None]], axis=-1)
+            finished = ivy.logical_or(finished, next_tokens == config.eos_token_id)
+            if ivy.all(finished):
+                break
+        return sequences
+
+    def _beam_search(
+        self,
+        encoder_hidden_states,
+        attention_mask,
+        past_key_values,
+        max_length,
+        num_beams,
+        length_penalty,
+        early_stopping,
+    ):
+        """
+        Beam search over the `num_beams` beams of every row at once, in a single
+        batch of `bsz * num_beams` decoder rows.
+
+        The encoder outputs aren't repeated for the beams, so the cross-attention
+        keys and values are computed once per source. At every step the
+        `num_beams` best extensions of all the beams of a row are kept, and the
+        cache is reordered with a gather of the beams they extend. A finished
+        beam keeps its score and is only extended with padding. Once all the
+        beams have finished, or with `early_stopping` once the best beam of every
+        row has, the finished beam with the best score divided by its length to
+        the power of `length_penalty` is returned for every row.
+        """
+        config = self.config
+        bsz = encoder_hidden_states.shape[0]
+        sequences = ivy.full(
+            (bsz * num_beams, 1), config.decoder_start_token_id, dtype=ivy.int64
+        )
+        # only the first beam of a row is live at first, so that the beams don't
+        # all start with the same token
+        beam_scores = ivy.reshape(
+            ivy.concat(
+                [ivy.zeros((bsz, 1)), ivy.full((bsz, num_beams - 1), -1e9)], axis=-1
+            ),
+            (-1,),
+        )
+        lengths = ivy.zeros((bsz * num_beams,))
+        finished = ivy.zeros((bsz * num_beams,), dtype=ivy.bool)
+        eos_reached = ivy.zeros((bsz * num_beams,), dtype=ivy.bool)
+        row_offsets = ivy.arange(bsz, dtype=ivy.int64)[:, None] * num_beams
+        for _ in range(max_length - 1):
+            logits = self._next_token_logits(
+                sequences, encoder_hidden_states, attention_mask, past_key_values
+            )
+            log_probs = ivy.log_softmax(ivy.astype(logits, "float32"), axis=-1)
+            vocab_size = log_probs.shape[-1]
+            pad_only = ivy.where(
+                ivy.arange(vocab_size) == config.pad_token_id, 0.0, -1e9
+            )
+            log_probs = ivy.where(finished[:, None], pad_only[None], log_probs)
+
+            scores = ivy.reshape(
+                beam_scores[:, None] + log_probs, (bsz, num_beams * vocab_size)
+            )
+            beam_scores, indices = ivy.top_k(scores, num_beams, axis=-1)
+            beam_scores = ivy.reshape(beam_scores, (-1,))
+            beam_idx = ivy.reshape(indices // vocab_size + row_offsets, (-1,))
+            next_tokens = ivy.reshape(indices % vocab_size, (-1,))
+
+            sequences = ivy.concat(
+                [
+                    ivy.gather(sequences, beam_idx, axis=0),
+                    ivy.astype(next_tokens, sequences.dtype)[:, None],
+                ],
+                axis=-1,
+            )
+            if past_key_values is not None:
+                past_key_values.reorder(beam_idx)
+            was_finished = ivy.gather(finished, beam_idx, axis=0)
+            lengths = ivy.gather(lengths, beam_idx, axis=0) + ivy.astype(
+                ivy.logical_not(was_finished), lengths.dtype
+            )
+            new_eos = ivy.logical_and(
+                ivy.logical_not(was_finished), next_tokens == config.eos_token_id
+            )
+            eos_reached = ivy.logical_or(
+                ivy.gather(eos_reached, beam_idx, axis=0), new_eos
+            )
+            finished = ivy.logical_or(was_finished, new_eos)
+            if early_stopping:
+                # the beams of a row are sorted by score, the row is done once
+                # its best beam has finished
+                row_finished = ivy.reshape(finished, (bsz, num_beams))
+                finished = ivy.reshape(
+                    ivy.logical_or(row_finished, row_finished[:, :1]), (-1,)
+                )
+            if ivy.all(finished):
+                break
+
+        # with max_length <= 1 no token is generated and the lengths are 0
+        lengths = ivy.maximum(lengths, 1)
+        scores = ivy.reshape(beam_scores / lengths**length_penalty, (bsz, num_beams))
+        # prefer the beams which ended with an EOS token when a row has any
+        eos_reached = ivy.reshape(eos_reached, (bsz, num_beams))
+        scores = ivy.where(
+            ivy.logical_or(
+                eos_reached,
+                ivy.logical_not(ivy.any(eos_reached, axis=-1, keepdims=True)),
+            ),
+            scores,
+            -float("inf"),
+        )
+        best = ivy.argmax(scores, axis=-1) + row_offsets[:, 0]
+        return ivy.gather(sequences, best, axis=0)
@@ -40,6 +40,9 @@ class BartConfig(BaseSpec):
     output_attentions: bool = False
     output_hidden_states: bool = False
     use_return_dict: bool = False
+    fused_qkv: bool = False
+    attention_mode: str = "dense"
+    attention_tile_size: int = 128
 
     def get(self, *attr_names):
         new_dict = {}
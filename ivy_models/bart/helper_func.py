@@ -1,59 +1,84 @@
+import functools
 import ivy
 from typing import Optional
 
 
-def _expand_mask(mask: ivy.Array, dtype: ivy.dtype, tgt_len: Optional[int] = None):
+def _expand_mask(mask: ivy.Array, dtype: ivy.dtype):
     """
-    Expands attention_mask from `[bsz, seq_len]` to
-    `[bsz, 1, tgt_seq_len, src_seq_len]`.
+    Expands attention_mask from `[bsz, seq_len]` to an additive mask of shape
+    `[bsz, 1, 1, src_seq_len]`, which broadcasts over the heads and the target
+    positions rather than being materialized for every one of them. A mask which
+    is already 4-dimensional is assumed to be expanded and is returned as is.
     """
-    bsz, src_len = mask.shape
-    tgt_len = tgt_len if tgt_len is not None else src_len
+    if len(mask.shape) == 4:
+        return mask
+    mask = ivy.astype(mask[:, None, None, :], dtype)
+    return (1.0 - mask) * ivy.finfo(dtype).min
 
-    expanded_mask = mask[:, None, None, :].expand(bsz, 1, tgt_len, src_len).to(dtype)
 
-    inverted_mask = 1.0 - expanded_mask
-
-    return inverted_mask.masked_fill(inverted_mask.to(ivy.bool), ivy.finfo(dtype).min)
+@functools.lru_cache(maxsize=8)
+def _causal_mask_buffer(size: int, dtype: str, device: str, backend: str):
+    return ivy.triu(
+        ivy.full((size, size), ivy.finfo(dtype).min, dtype=dtype, device=device),
+        k=1,
+    )
 
 
 def _make_causal_mask(
-    input_ids_shape: ivy.Shape,
+    tgt_len: int,
     dtype: ivy.dtype,
-    device: ivy.device,
     past_key_values_length: int = 0,
+    max_length: Optional[int] = None,
+    device: Optional[ivy.Device] = None,
 ):
-    """Make causal mask used for bi-directional self-attention."""
-    bsz, tgt_len = input_ids_shape
-    mask = ivy.full((tgt_len, tgt_len), ivy.finfo(dtype).min, device=device)
-    mask_cond = ivy.arange(mask.size(-1), device=device)
-    mask.masked_fill_(mask_cond < (mask_cond + 1).view(mask.size(-1), 1), 0)
-    mask = mask.to(dtype)
-
-    if past_key_values_length > 0:
-        mask = ivy.concat(
-            [
-                ivy.zeros(tgt_len, past_key_values_length, dtype=dtype, device=device),
-                mask,
-            ],
-            dim=-1,
-        )
-    return mask[None, None, :, :].expand(
-        bsz, 1, tgt_len, tgt_len + past_key_values_length
-    )
+    """
+    Make the additive causal mask of `tgt_len` positions following
+    `past_key_values_length` cached ones, of shape `[1, 1, tgt_len, src_len]`.
+
+    It's a slice of a buffer of `max_length` positions, typically
+    `max_position_embeddings`, built once per dtype and device.
+    """
+    src_len = tgt_len + past_key_values_length
+    size = src_len if max_length is None else max(max_length, src_len)
+    device = ivy.default_device() if device is None else device
+    mask = _causal_mask_buffer(size, str(dtype), str(device), ivy.current_backend_str())
+    return mask[None, None, past_key_values_length:src_len, :src_len]
 
 
 def shift_tokens_right(
     input_ids: ivy.Array, pad_token_id: int, decoder_start_token_id: int
 ):
     """Shift input ids one token to the right."""
-    shifted_input_ids = input_ids.new_zeros(input_ids.shape)
-    shifted_input_ids[:, 1:] = input_ids[:, :-1].clone()
-    shifted_input_ids[:, 0] = decoder_start_token_id
-
     if pad_token_id is None:
         raise ValueError("self.model.config.pad_token_id has to be defined.")
+
+    start_tokens = ivy.full(
+        (input_ids.shape[0], 1), decoder_start_token_id, dtype=input_ids.dtype
+    )
+    shifted_input_ids = ivy.concat([start_tokens, input_ids[:, :-1]], axis=-1)
     # replace possible -100 values in labels by `pad_token_id`
-    shifted_input_ids.masked_fill_(shifted_input_ids == -100, pad_token_id)
+    return ivy.where(shifted_input_ids == -100, pad_token_id, shifted_input_ids)
+
+
+def _top_k_top_p_filtering(logits: ivy.Array, top_k: int = 0, top_p: float = 1.0):
+    """
+    Mask the logits of `[bsz, vocab_size]` outside of the `top_k` highest ones
+    and of the smallest set of tokens whose probabilities add up to `top_p`.
+    """
+    if top_k > 0:
+        top_k = min(top_k, logits.shape[-1])
+        kth_logits = ivy.sort(logits, axis=-1)[:, -top_k][:, None]
+        logits = ivy.where(logits < kth_logits, -float("inf"), logits)
+
+    if top_p < 1.0:
+        sorted_logits = ivy.flip(ivy.sort(logits, axis=-1), axis=-1)
+        sorted_probs = ivy.softmax(sorted_logits, axis=-1)
+        # a token is kept if the tokens more likely than it don't reach top_p,
+        # so that the most likely token is always kept
+        keep = ivy.cumsum(sorted_probs, axis=-1) - sorted_probs < top_p
+        min_logits = ivy.min(
+            ivy.where(keep, sorted_logits, float("inf")), axis=-1, keepdims=True
+        )
+        logits = ivy.where(logits < min_logits, -float("inf"), logits)
 
-    return shifted_input_ids
+    return logits
@@ -1,5 +1,6 @@
 import ivy
 from typing import Optional, Tuple
+from ivy_models.helpers import StaticKVCacheLayer, linear_slice, tiled_attention
 from .config_bart import BartConfig
 
 
@@ -15,9 +16,8 @@ class BartLearnedPositionalEmbedding(ivy.Embedding):
             past_key_values_length,
             past_key_values_length + seq_len,
             dtype=ivy.int64,
-            device=self.v.w.device,
+            device=ivy.dev(self.v.w),
         )
-        ivy.expand(positions, (bsz, -1))
 
         return super()._forward(positions + self.offset)
 
@@ -30,6 +30,9 @@ class BartAttention(ivy.Module):
         dropout: float = 0.0,
         is_decoder: bool = False,
         with_bias: bool = True,
+        fused_qkv: bool = False,
+        attention_mode: str = "dense",
+        attention_tile_size: int = 128,
         v=None,
     ):
         self.training = True
@@ -45,14 +48,37 @@ class BartAttention(ivy.Module):
             )
         self.scaling = self.head_dim**-0.5
         self.is_decoder = is_decoder
+        # project the queries, keys and values with a single matmul of a
+        # `qkv_proj` layer, the weights of the checkpoints are fused by `BartModel`
+        self.fused_qkv = fused_qkv
+        if attention_mode not in ("dense", "tiled"):
+            raise ValueError(
+                f"attention_mode must be 'dense' or 'tiled' "
+                f"(got `attention_mode`: {attention_mode})."
+            )
+        # the tiled attention goes through the keys and values a tile at a time,
+        # never holding the weights of all the keys at once
+        self.attention_mode = attention_mode
+        self.attention_tile_size = attention_tile_size
 
         super(BartAttention, self).__init__(v=v, with_bias=with_bias)
 
     def _build(self, *args, **kwargs):
         with_bias = kwargs.get("with_bias")
-        self.k_proj = ivy.Linear(self.embed_dim, self.embed_dim, with_bias=with_bias)
-        self.v_proj = ivy.Linear(self.embed_dim, self.embed_dim, with_bias=with_bias)
-        self.q_proj = ivy.Linear(self.embed_dim, self.embed_dim, with_bias=with_bias)
+        if self.fused_qkv:
+            self.qkv_proj = ivy.Linear(
+                self.embed_dim, 3 * self.embed_dim, with_bias=with_bias
+            )
+        else:
+            self.k_proj = ivy.Linear(
+                self.embed_dim, self.embed_dim, with_bias=with_bias
+            )
+            self.v_proj = ivy.Linear(
+                self.embed_dim, self.embed_dim, with_bias=with_bias
+            )
+            self.q_proj = ivy.Linear(
+                self.embed_dim, self.embed_dim, with_bias=with_bias
+            )
         self.out_proj = ivy.Linear(self.embed_dim, self.embed_dim, with_bias=with_bias)
 
     def _shape(self, tensor: ivy.Array, seq_len: int, bsz: int):
@@ -76,8 +102,21 @@ class BartAttention(ivy.Module):
 
         bsz, tgt_len, _ = hidden_states.shape
 
-        # get query proj
-        query_states = self.q_proj(hidden_states) * self.scaling
+        # get query proj, along with the key and value proj for self-attention
+        if is_cross_attention and self.fused_qkv:
+            query_states = linear_slice(
+                hidden_states, self.v.qkv_proj, 0, self.embed_dim
+            )
+        elif is_cross_attention:
+            query_states = self.q_proj(hidden_states)
+        elif self.fused_qkv:
+            query_states, keys, values = ivy.split(
+                self.qkv_proj(hidden_states), num_or_size_splits=3, axis=-1
+            )
+        else:
+            query_states = self.q_proj(hidden_states)
+            keys, values = self.k_proj(hidden_states), self.v_proj(hidden_states)
+        query_states = query_states * self.scaling
         # get key, value proj
         # `past_key_value[0].shape[2] == key_value_states.shape[1]`
         # is checking that the `sequence_length` of the `past_key_value` is the same as
@@ -92,31 +131,144 @@ class BartAttention(ivy.Module):
             value_states = past_key_value[1]
         elif is_cross_attention:
             # cross_attentions
-            key_states = self._shape(self.k_proj(key_value_states), -1, bsz)
-            value_states = self._shape(self.v_proj(key_value_states), -1, bsz)
+            kv_bsz = key_value_states.shape[0]
+            if self.fused_qkv:
+                keys, values = ivy.split(
+                    linear_slice(
+                        key_value_states,
+                        self.v.qkv_proj,
+                        self.embed_dim,
+                        3 * self.embed_dim,
+                    ),
+                    num_or_size_splits=2,
+                    axis=-1,
+                )
+            else:
+                keys = self.k_proj(key_value_states)
+                values = self.v_proj(key_value_states)
+            key_states = self._shape(keys, -1, kv_bsz)
+            value_states = self._shape(values, -1, kv_bsz)
+        elif isinstance(past_key_value, StaticKVCacheLayer):
+            # write k, v in place in the static cache, self_attention
+            key_states, value_states = past_key_value.update(
+                self._shape(keys, -1, bsz), self._shape(values, -1, bsz)
+            )
         elif past_key_value is not None:
             # reuse k, v, self_attention
-            key_states = self._shape(self.k_proj(hidden_states), -1, bsz)
-            value_states = self._shape(self.v_proj(hidden_states), -1, bsz)
-            key_states = ivy.concat([past_key_value[0], key_states], dim=2)
-            value_states = ivy.concat([past_key_value[1], value_states], dim=2)
+            key_states = self._shape(keys, -1, bsz)
+            value_states = self._shape(values, -1, bsz)
+            key_states = ivy.concat([past_key_value[0], key_states], axis=2)
+            value_states = ivy.concat([past_key_value[1], value_states], axis=2)
         else:
             # self_attention
-            key_states = self._shape(self.k_proj(hidden_states), -1, bsz)
-            value_states = self._shape(self.v_proj(hidden_states), -1, bsz)
+            key_states = self._shape(keys, -1, bsz)
+            value_states = self._shape(values, -1, bsz)
 
-        if self.is_decoder:
+        if self.is_decoder and not isinstance(past_key_value, StaticKVCacheLayer):
             past_key_value = (key_states, value_states)
 
+        # during beam search the beams of a source share its cross-attention keys
+        # and values, the beams are then folded into the query length instead of
+        # repeating the keys and values for every beam
+        out_bsz, out_tgt_len = bsz, tgt_len
+        num_beams = bsz // key_states.shape[0]
+        if num_beams > 1:
+            bsz, tgt_len = key_states.shape[0], num_beams * tgt_len
+            query_states = ivy.reshape(query_states, (bsz, tgt_len, self.embed_dim))
+            if attention_mask is not None:
+                # a padding mask is the same for all the queries
+                attention_mask = attention_mask[:, :, :1]
+
+        src_len = key_states.shape[2]
+        if attention_mask is not None:
+            # the additive mask only needs to broadcast to the attention weights
+            mask_shape = tuple(attention_mask.shape)
+            if len(mask_shape) != 4 or any(
+                dim not in (1, size)
+                for dim, size in zip(mask_shape, (bsz, 1, tgt_len, src_len))
+            ):
+                raise ValueError(
+                    f"Attention mask should broadcast to size "
+                    f"{(bsz, 1, tgt_len, src_len)}, but is {attention_mask.shape}"
+                )
+        if layer_head_mask is not None:
+            if tuple(layer_head_mask.shape) != (self.num_heads,):
+                raise ValueError(
+                    f"Head mask for a single layer should be of size "
+                    f"{(self.num_heads,)}, but is {layer_head_mask.shape}"
+                )
+            layer_head_mask = ivy.reshape(layer_head_mask, (1, -1, 1, 1))
+
+        # the attention weights can only be returned by the dense attention
+        if self.attention_mode == "tiled" and not output_attentions:
+            attn_output = tiled_attention(
+                self._shape(query_states, tgt_len, bsz),
+                key_states,
+                value_states,
+                attention_mask,
+                layer_head_mask,
+                tile_size=self.attention_tile_size,
+                dropout=self._attn_dropout,
+            )
+            attn_weights_reshaped = None
+        else:
+            attn_output, attn_weights_reshaped = self._dense_attention(
+                query_states,
+                key_states,
+                value_states,
+                attention_mask,
+                layer_head_mask,
+                output_attentions,
+            )
+        attn_output = ivy.swapaxes(attn_output, 1, 2)
+
+        # Use the `embed_dim` from the config (stored in the class) rather than
+        # `hidden_state` because `attn_output` can be partitioned across GPUs
+        # when using tensor-parallelism.
+        attn_output = ivy.reshape(attn_output, (bsz, tgt_len, self.embed_dim))
+
+        attn_output = self.out_proj(attn_output)
+
+        if num_beams > 1:
+            attn_output = ivy.reshape(
+                attn_output, (out_bsz, out_tgt_len, self.embed_dim)
+            )
+            if attn_weights_reshaped is not None:
+                attn_weights_reshaped = ivy.reshape(
+                    ivy.permute_dims(
+                        ivy.reshape(
+                            attn_weights_reshaped,
+                            (bsz, self.num_heads, num_beams, out_tgt_len, src_len),
+                        ),
+                        (0, 2, 1, 3, 4),
+                    ),
+                    (out_bsz, self.num_heads, out_tgt_len, src_len),
+                )
+
+        return attn_output, attn_weights_reshaped, past_key_value
+
+    def _attn_dropout(self, attn_weights):
+        return ivy.dropout(attn_weights, self.dropout, training=self.training)
+
+    def _dense_attention(
+        self,
+        query_states,
+        key_states,
+        value_states,
+        attention_mask,
+        layer_head_mask,
+        output_attentions,
+    ):
+        bsz, tgt_len, _ = query_states.shape
         proj_shape = (bsz * self.num_heads, -1, self.head_dim)
-        query_states = ivy.reshape(self._shape(query_states, tgt_len, bsz), *proj_shape)
-        key_states = ivy.reshape(key_states, *proj_shape)
-        value_states = ivy.reshape(value_states, *proj_shape)
+        query_states = ivy.reshape(self._shape(query_states, tgt_len, bsz), proj_shape)
+        key_states = ivy.reshape(key_states, proj_shape)
+        value_states = ivy.reshape(value_states, proj_shape)
 
         src_len = key_states.shape[1]
         attn_weights = ivy.matmul(query_states, ivy.swapaxes(key_states, 1, 2))
 
-        if attn_weights.shape != (bsz * self.num_heads, tgt_len, src_len):
+        if tuple(attn_weights.shape) != (bsz * self.num_heads, tgt_len, src_len):
             raise ValueError(
                 f"Attention weights should be of size "
                 f"{(bsz * self.num_heads, tgt_len, src_len)}, "
@@ -124,67 +276,53 @@ class BartAttention(ivy.Module):
             )
 
         if attention_mask is not None:
-            if attention_mask.shape != (bsz, 1, tgt_len, src_len):
-                raise ValueError(
-                    f"Attention mask should be of size {(bsz, 1, tgt_len, src_len)}, "
-                    f"but is {attention_mask.shape}"
-                )
             attn_weights = (
-                attn_weights.shape[bsz, self.num_heads, tgt_len, src_len]
+                ivy.reshape(attn_weights, (bsz, self.num_heads, tgt_len, src_len))
                 + attention_mask
             )
-            attn_weights = attn_weights.shape[bsz * self.num_heads, tgt_len, src_len]
+            attn_weights = ivy.reshape(
+                attn_weights, (bsz * self.num_heads, tgt_len, src_len)
+            )
 
-        attn_weights = ivy.softmax(attn_weights, dim=-1)
+        attn_weights = ivy.softmax(attn_weights, axis=-1)
 
         if layer_head_mask is not None:
-            if layer_head_mask.shape != (self.num_heads,):
-                raise ValueError(
-                    f"Head mask for a single layer should be of size "
-                    f"{(self.num_heads,)}, but is {layer_head_mask.shape}"
-                )
-            attn_weights = (
-                layer_head_mask.shape[1, -1, 1, 1]
-                * attn_weights.shape[bsz, self.num_heads, tgt_len, src_len]
+            attn_weights = layer_head_mask * ivy.reshape(
+                attn_weights, (bsz, self.num_heads, tgt_len, src_len)
+            )
+            attn_weights = ivy.reshape(
+                attn_weights, (bsz * self.num_heads, tgt_len, src_len)
             )
-            attn_weights = attn_weights.shape[bsz * self.num_heads, tgt_len, src_len]
 
         if output_attentions:
             # this operation is a bit awkward, but it's required to
             # make sure that attn_weights keeps its gradient.
             # In order to do so, attn_weights have to be reshaped
             # twice and have to be reused in the following
-            attn_weights_reshaped = attn_weights.shape[
-                bsz, self.num_heads, tgt_len, src_len
-            ]
-            attn_weights = attn_weights_reshaped.shape[
-                bsz * self.num_heads, tgt_len, src_len
-            ]
+            attn_weights_reshaped = ivy.reshape(
+                attn_weights, (bsz, self.num_heads, tgt_len, src_len)
+            )
+            attn_weights = ivy.reshape(
+                attn_weights_reshaped, (bsz * self.num_heads, tgt_len, src_len)
+            )
         else:
             attn_weights_reshaped = None
 
-        attn_probs = ivy.dropout(attn_weights, p=self.dropout, training=self.training)
+        attn_probs = self._attn_dropout(attn_weights)
 
         attn_output = ivy.matmul(attn_probs, value_states)
 
-        if attn_output.shape != (bsz * self.num_heads, tgt_len, self.head_dim):
+        if tuple(attn_output.shape) != (bsz * self.num_heads, tgt_len, self.head_dim):
             raise ValueError(
                 f"`attn_output` should be of size "
                 f"{(bsz * self.num_heads, tgt_len, self.head_dim)}, "
                 f"but is {attn_output.shape}"
             )
 
-        attn_output = attn_output.shape[bsz, self.num_heads, tgt_len, self.head_dim]
-        attn_output = ivy.swapaxes(attn_output, 1, 2)
-
-        # Use the `embed_dim` from the config (stored in the class) rather than
-        # `hidden_state` because `attn_output` can be partitioned across GPUs
-        # when using tensor-parallelism.
-        attn_output = ivy.reshape(attn_output, (bsz, tgt_len, self.embed_dim))
-
-        attn_output = self.out_proj(attn_output)
-
-        return attn_output, attn_weights_reshaped, past_key_value
+        attn_output = ivy.reshape(
+            attn_output, (bsz, self.num_heads, tgt_len, self.head_dim)
+        )
+        return attn_output, attn_weights_reshaped
 
 
 class BartEncoderLayer(ivy.Module):
@@ -203,110 +341,51 @@ class BartEncoderLayer(ivy.Module):
 
         self.self_attn = BartAttention(
             embed_dim=self.embed_dim,
-            num_heads=config.decoder_attention_heads,
+            num_heads=config.encoder_attention_heads,
             dropout=config.attention_dropout,
-            is_decoder=True,
+            fused_qkv=config.fused_qkv,
+            attention_mode=config.attention_mode,
+            attention_tile_size=config.attention_tile_size,
         )
         self.self_attn_layer_norm = ivy.LayerNorm(self.embed_dim)
-        self.encoder_attn = BartAttention(
-            embed_dim=self.embed_dim,
-            num_heads=config.decoder_attention_heads,
-            dropout=config.attention_dropout,
-            is_decoder=True,
-        )
-        self.encoder_attn_layer_norm = ivy.LayerNorm(self.embed_dim)
-        self.fc1 = ivy.Linear(self.embed_dim, config.decoder_ffn_dim)
-        self.fc2 = ivy.Linear(config.decoder_ffn_dim, self.embed_dim)
+        self.fc1 = ivy.Linear(self.embed_dim, config.encoder_ffn_dim)
+        self.fc2 = ivy.Linear(config.encoder_ffn_dim, self.embed_dim)
         self.final_layer_norm = ivy.LayerNorm(self.embed_dim)
 
     def _forward(
         self,
         hidden_states: ivy.Array,
         attention_mask: Optional[ivy.Array] = None,
-        encoder_hidden_states: Optional[ivy.Array] = None,
-        encoder_attention_mask: Optional[ivy.Array] = None,
         layer_head_mask: Optional[ivy.Array] = None,
-        cross_attn_layer_head_mask: Optional[ivy.Array] = None,
-        past_key_value: Optional[Tuple[ivy.Array]] = None,
         output_attentions: Optional[bool] = False,
-        use_cache: Optional[bool] = True,
-    ) -> Tuple[ivy.Array, Optional[Tuple[ivy.Array, ivy.Array]]]:
+    ) -> Tuple[ivy.Array, Optional[ivy.Array]]:
         residual = hidden_states
-
-        # Self Attention
-        # decoder uni-directional self-attention cached key/values tuple
-        # is at positions 1,2
-        self_attn_past_key_value = (
-            past_key_value[:2] if past_key_value is not None else None
-        )
-        # add present self-attn cache to positions 1,2 of present_key_value tuple
-        hidden_states, self_attn_weights, present_key_value = self.self_attn(
+        hidden_states, attn_weights, _ = self.self_attn(
             hidden_states=hidden_states,
-            past_key_value=self_attn_past_key_value,
             attention_mask=attention_mask,
             layer_head_mask=layer_head_mask,
             output_attentions=output_attentions,
         )
-        hidden_states = ivy.dropout(
-            hidden_states, p=self.dropout, training=self.training
-        )
+        hidden_states = ivy.dropout(hidden_states, self.dropout, training=self.training)
         hidden_states = residual + hidden_states
         hidden_states = self.self_attn_layer_norm(hidden_states)
 
-        # Cross-Attention Block
-        cross_attn_present_key_value = None
-        cross_attn_weights = None
-        if encoder_hidden_states is not None:
-            residual = hidden_states
-
-            # cross_attn cached key/values tuple is at positions 3,4
-            # of present_key_value tuple
-            cross_attn_past_key_value = (
-                past_key_value[-2:] if past_key_value is not None else None
-            )
-            (
-                hidden_states,
-                cross_attn_weights,
-                cross_attn_present_key_value,
-            ) = self.encoder_attn(
-                hidden_states=hidden_states,
-                key_value_states=encoder_hidden_states,
-                attention_mask=encoder_attention_mask,
-                layer_head_mask=cross_attn_layer_head_mask,
-                past_key_value=cross_attn_past_key_value,
-                output_attentions=output_attentions,
-            )
-            hidden_states = ivy.dropout(
-                hidden_states, p=self.dropout, training=self.training
-            )
-            hidden_states = residual + hidden_states
-            hidden_states = self.encoder_attn_layer_norm(hidden_states)
-
-            # add cross-attn to positions 3,4 of present_key_value tuple
-            present_key_value = present_key_value + cross_attn_present_key_value
-
-            # Fully Connected
-            residual = hidden_states
-            hidden_states = self.activation_fn(self.fc1(hidden_states))
-            hidden_states = ivy.dropout(
-                hidden_states, p=self.activation_dropout, training=self.training
-            )
-            hidden_states = self.fc2(hidden_states)
-            hidden_states = ivy.dropout(
-                hidden_states, p=self.dropout, training=self.training
-            )
-            hidden_states = residual + hidden_states
-            hidden_states = self.final_layer_norm(hidden_states)
-
-            outputs = (hidden_states,)
+        residual = hidden_states
+        hidden_states = self.activation_fn(self.fc1(hidden_states))
+        hidden_states = ivy.dropout(
+            hidden_states, self.activation_dropout, training=self.training
+        )
+        hidden_states = self.fc2(hidden_states)
+        hidden_states = ivy.dropout(hidden_states, self.dropout, training=self.training)
+        hidden_states = residual + hidden_states
+        hidden_states = self.final_layer_norm(hidden_states)
 
-            if output_attentions:
-                outputs += (self_attn_weights, cross_attn_weights)
+        outputs = (hidden_states,)
 
-            if use_cache:
-                outputs += (present_key_value,)
+        if output_attentions:
+            outputs += (attn_weights,)
 
-            return outputs
+        return outputs
 
 
 class BartDecoderLayer(ivy.Module):
@@ -328,6 +407,9 @@ class BartDecoderLayer(ivy.Module):
             num_heads=config.decoder_attention_heads,
             dropout=config.attention_dropout,
             is_decoder=True,
+            fused_qkv=config.fused_qkv,
+            attention_mode=config.attention_mode,
+            attention_tile_size=config.attention_tile_size,
         )
         self.self_attn_layer_norm = ivy.LayerNorm(self.embed_dim)
         self.encoder_attn = BartAttention(
@@ -335,6 +417,9 @@ class BartDecoderLayer(ivy.Module):
             num_heads=config.decoder_attention_heads,
             dropout=config.attention_dropout,
             is_decoder=True,
+            fused_qkv=config.fused_qkv,
+            attention_mode=config.attention_mode,
+            attention_tile_size=config.attention_tile_size,
         )
         self.encoder_attn_layer_norm = ivy.LayerNorm(self.embed_dim)
         self.fc1 = ivy.Linear(self.embed_dim, config.decoder_ffn_dim)
@@ -357,9 +442,12 @@ class BartDecoderLayer(ivy.Module):
 
         # Self Attention
         # decoder uni-directional self-attention cached key/values tuple
-        # is at positions 1,2
+        # is at positions 1,2, a static cache holds them itself
+        static_cache = isinstance(past_key_value, StaticKVCacheLayer)
         self_attn_past_key_value = (
-            past_key_value[:2] if past_key_value is not None else None
+            past_key_value
+            if static_cache or past_key_value is None
+            else past_key_value[:2]
         )
         # add present self-attn cache to positions 1,2 of
         # present_key_value tuple
@@ -370,9 +458,7 @@ class BartDecoderLayer(ivy.Module):
             layer_head_mask=layer_head_mask,
             output_attentions=output_attentions,
         )
-        hidden_states = ivy.dropout(
-            hidden_states, p=self.dropout, training=self.training
-        )
+        hidden_states = ivy.dropout(hidden_states, self.dropout, training=self.training)
         hidden_states = residual + hidden_states
         hidden_states = self.self_attn_layer_norm(hidden_states)
 
@@ -384,9 +470,12 @@ class BartDecoderLayer(ivy.Module):
 
             # cross_attn cached key/values tuple is at positions 3,4
             # of present_key_value tuple
-            cross_attn_past_key_value = (
-                past_key_value[-2:] if past_key_value is not None else None
-            )
+            if static_cache:
+                cross_attn_past_key_value = past_key_value.cross_key_value
+            else:
+                cross_attn_past_key_value = (
+                    past_key_value[-2:] if past_key_value is not None else None
+                )
             (
                 hidden_states,
                 cross_attn_weights,
@@ -400,24 +489,25 @@ class BartDecoderLayer(ivy.Module):
                 output_attentions=output_attentions,
             )
             hidden_states = ivy.dropout(
-                hidden_states, p=self.dropout, training=self.training
+                hidden_states, self.dropout, training=self.training
             )
             hidden_states = residual + hidden_states
             hidden_states = self.encoder_attn_layer_norm(hidden_states)
 
             # add cross-attn to positions 3,4 of present_key_value tuple
-            present_key_value = present_key_value + cross_attn_present_key_value
+            if static_cache:
+                past_key_value.cross_key_value = cross_attn_present_key_value
+            else:
+                present_key_value = present_key_value + cross_attn_present_key_value
 
         # Fully Connected
         residual = hidden_states
         hidden_states = self.activation_fn(self.fc1(hidden_states))
         hidden_states = ivy.dropout(
-            hidden_states, p=self.activation_dropout, training=self.training
+            hidden_states, self.activation_dropout, training=self.training
         )
         hidden_states = self.fc2(hidden_states)
-        hidden_states = ivy.dropout(
-            hidden_states, p=self.dropout, training=self.training
-        )
+        hidden_states = ivy.dropout(hidden_states, self.dropout, training=self.training)
         hidden_states = residual + hidden_states
         hidden_states = self.final_layer_norm(hidden_states)
 
@@ -457,7 +547,7 @@ class BartClassificationHead(ivy.Module):
         num_classes = kwargs.get("num_classes")
         pooler_dropout = kwargs.get("pooler_dropout")
         self.dense = ivy.Linear(input_dim, inner_dim)
-        self.dropout = ivy.Dropout(p=pooler_dropout)
+        self.dropout = ivy.Dropout(prob=pooler_dropout)
         self.out_proj = ivy.Linear(inner_dim, num_classes)
 
     def _forward(self, hidden_states: ivy.Array) -> ivy.Array:
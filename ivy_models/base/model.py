@@ -1,7 +1,46 @@
 import ivy
 import os
-import inspect
-from typing import Optional
+import sys
+from typing import Optional, Union
+from concurrent.futures import ThreadPoolExecutor
+from ivy_models.helpers.flat_weights import (
+    FLAT_WEIGHTS_NAME,
+    save_flat_weights,
+    load_flat_weights,
+    flat_weights_to_backend,
+)
+from ivy_models.helpers.lazy_weights import (
+    load_lazy_weights,
+    enable_lazy_weights,
+    materialize_weights,
+    lazy_weights_stats,
+)
+from ivy_models.helpers.weights_helpers import get_weights_num_workers
+from ivy_models.helpers.dtype_policy import cast_weights
+from ivy_models.helpers.factory_helpers import skeleton_weights
+from ivy_models.helpers.sharded_weights import (
+    sharded_weights_index_path,
+    sharded_weights_files,
+    save_sharded_weights,
+    load_sharded_weights,
+)
+
+HDF5_WEIGHTS_NAME = "weights.hdf5"
+
+
+def _default_weights_path(safe_serialization):
+    return FLAT_WEIGHTS_NAME if safe_serialization else HDF5_WEIGHTS_NAME
+
+
+def _restore_dtypes(weights, ref):
+    # weights stored in reduced precision get back the dtypes of the model
+    def restore(x, kc):
+        dtype = ivy.dtype(ref.cont_at_key_chain(kc))
+        if not ivy.is_float_dtype(x) or ivy.dtype(x) == dtype:
+            return x
+        return ivy.astype(x, dtype)
+
+    return weights.cont_map(restore)
 
 
 class abstractclassmethod(classmethod):
@@ -13,26 +52,135 @@ class abstractclassmethod(classmethod):
 
 
 class BaseModel(ivy.Module):
+    # maps the key chains of tied weights to the key chain of the weight they
+    # alias, tied weights are saved once and share a single buffer in memory
+    _tied_weights_keys = {}
+
     def __init__(self, *args, **kwargs):
         super(BaseModel, self).__init__(*args, **kwargs)
+        # building drops every variable sharing its array with another one, so
+        # the tied weights are only restored once the model has been built,
+        # which reading `v` triggers for the models whose build was deferred
+        if self._tied_weights_keys and self.v is not None and self._built:
+            self.__dict__["v"] = self._tie_weights(self.v)
+            self._tie_module_weights()
 
     def __setattr__(self, key, value):
-        prev_call = inspect.getframeinfo(inspect.currentframe().f_back)[0]
-        from_test = "ivy_models_tests" in prev_call
-        from_ivy_module = "ivy/stateful/module" in prev_call
-        if (
+        tie = (
             key == "v"
-            and "v" in self.__dict__.keys()
-            and self.__dict__["v"] is not None
-            and not (from_test or from_ivy_module)
-        ):
-            ivy.Container.cont_assert_identical_structure([self.v, value])
+            and isinstance(value, ivy.Container)
+            and self.__dict__.get("_built", False)
+        )
+        if tie:
+            value = self._tie_weights(value)
+        # module construction sets thousands of attributes, so the caller is only
+        # looked up when `v` is actually being replaced
+        if key == "v" and self.__dict__.get("v") is not None:
+            prev_call = sys._getframe(1).f_code.co_filename
+            from_test = "ivy_models_tests" in prev_call
+            from_ivy_module = "ivy/stateful/module" in prev_call
+            # the placeholders bound by the lazy weights check their structure
+            from_lazy_weights = "ivy_models/helpers/lazy_weights" in prev_call
+            if not (from_test or from_ivy_module or from_lazy_weights):
+                ivy.Container.cont_assert_identical_structure([self.v, value])
         self.__dict__[key] = value
+        if tie:
+            self._tie_module_weights()
 
     @abstractclassmethod
     def get_spec_class(self):
         raise NotImplementedError()
 
+    @classmethod
+    def _tie_weights(cls, weights):
+        """Point every tied key chain of `weights` at the weight it aliases."""
+        for alias, target in cls._tied_weights_keys.items():
+            # the build only keeps one of the key chains sharing an array
+            if not weights.cont_has_key_chain(target) and weights.cont_has_key_chain(
+                alias
+            ):
+                weights = weights.cont_set_at_key_chain(
+                    target, weights.cont_at_key_chain(alias)
+                )
+        for alias, target in cls._tied_weights_keys.items():
+            if weights.cont_has_key_chain(target):
+                weights = weights.cont_set_at_key_chain(
+                    alias, weights.cont_at_key_chain(target)
+                )
+        return weights
+
+    def _tie_module_weights(self):
+        # the submodules keep variables of their own, used when they are called
+        # directly rather than through the model, so these are tied as well
+        for alias, target in self._tied_weights_keys.items():
+            if not self.v.cont_has_key_chain(target):
+                continue
+            x = self.v.cont_at_key_chain(target)
+            for key_chain in (alias, target):
+                module, key_chain = self, key_chain.split("/")
+                while isinstance(getattr(module, key_chain[0], None), ivy.Module):
+                    module, key_chain = getattr(module, key_chain[0]), key_chain[1:]
+                    if module.v.cont_has_key_chain("/".join(key_chain)):
+                        module.v = module.v.cont_set_at_key_chain(
+                            "/".join(key_chain), x
+                        )
+
+    @classmethod
+    def _untie_weights(cls, weights):
+        aliases = [
+            alias
+            for alias in cls._tied_weights_keys.keys()
+            if weights.cont_has_key_chain(alias)
+        ]
+        return weights.cont_prune_key_chains(aliases) if aliases else weights
+
+    def _save_weights(
+        self,
+        weights_path,
+        safe_serialization,
+        max_shard_size=None,
+        dtype=None,
+        keep_fp32=True,
+    ):
+        """Save the weights and return the paths of the files written."""
+        # tied weights are only written once, loading restores the aliasing
+        weights = self._untie_weights(self.v)
+        if dtype is not None:
+            if dtype == "bfloat16" and not safe_serialization:
+                raise ivy.exceptions.IvyException(
+                    "Storing weights as bfloat16 requires `safe_serialization`."
+                )
+            weights = cast_weights(weights, dtype, keep_fp32)
+        if max_shard_size is not None:
+            return save_sharded_weights(
+                weights, weights_path, max_shard_size, safe_serialization
+            )
+        if safe_serialization:
+            save_flat_weights(weights, weights_path)
+        else:
+            weights.cont_to_disk_as_hdf5(weights_path)
+        return [weights_path]
+
+    def _cast_loaded_weights(self, weights, dtype, keep_fp32):
+        if dtype is not None:
+            return cast_weights(weights, dtype, keep_fp32)
+        return _restore_dtypes(weights, self.v)
+
+    @staticmethod
+    def _load_weights(weights_path, safe_serialization, shard_paths=None):
+        index_path = sharded_weights_index_path(weights_path)
+        if os.path.isfile(index_path):
+            weights = load_sharded_weights(
+                index_path,
+                safe_serialization=safe_serialization,
+                shard_paths=shard_paths,
+            )
+        elif safe_serialization:
+            weights = load_flat_weights(weights_path)
+        else:
+            return ivy.Container.cont_from_disk_as_hdf5(weights_path)
+        return flat_weights_to_backend(weights) if safe_serialization else weights
+
     def _hf_verify_or_login(self):
         from huggingface_hub import login, HfFolder
 
@@ -45,7 +193,7 @@ class BaseModel(ivy.Module):
         repo_id: str,
         config_path: str = "config.json",
         model_path: str = "model.pkl",
-        weights_path: str = "weights.hdf5",
+        weights_path: Optional[str] = None,
         repo_type: str = "model",
         token: Optional[str] = None,
         private: bool = False,
@@ -54,6 +202,9 @@ class BaseModel(ivy.Module):
         commit_description: Optional[str] = None,
         create_pr: bool = False,
         safe_serialization: bool = False,
+        max_shard_size: Optional[Union[int, str]] = None,
+        dtype: Optional[str] = None,
+        keep_fp32: bool = True,
         push_config: bool = True,
         push_model: bool = True,
         push_weights: bool = True,
@@ -61,6 +212,7 @@ class BaseModel(ivy.Module):
         from huggingface_hub import HfApi
 
         self._hf_verify_or_login()
+        weights_path = weights_path or _default_weights_path(safe_serialization)
 
         api = HfApi()
         api.create_repo(
@@ -91,14 +243,17 @@ class BaseModel(ivy.Module):
 
         if push_weights:
             print("Pushing model weights to Hugging Face...")
-            self.v.cont_to_disk_as_hdf5(weights_path)
-            api.upload_file(
-                path_or_fileobj=weights_path,
-                repo_id=repo_id,
-                path_in_repo=weights_path,
-                repo_type=repo_type,
+            paths = self._save_weights(
+                weights_path, safe_serialization, max_shard_size, dtype, keep_fp32
             )
-            os.remove(weights_path)
+            for path in paths:
+                api.upload_file(
+                    path_or_fileobj=path,
+                    repo_id=repo_id,
+                    path_in_repo=os.path.basename(path),
+                    repo_type=repo_type,
+                )
+                os.remove(path)
 
         print("Successful!")
 
@@ -106,11 +261,24 @@ class BaseModel(ivy.Module):
         self,
         config_path: str = "config.json",
         model_path: str = "model.pkl",
-        weights_path: str = "weights.hdf5",
+        weights_path: Optional[str] = None,
         save_config: bool = True,
         save_model: bool = True,
         save_weights: bool = True,
+        safe_serialization: bool = False,
+        max_shard_size: Optional[Union[int, str]] = None,
+        dtype: Optional[str] = None,
+        keep_fp32: bool = True,
     ):
+        """
+        Save the config, the model object and the weights. With `max_shard_size`
+        (in bytes, or a string such as "2GB") the weights are split into shards
+        written concurrently, along with an index at `<weights_path>.index.json`.
+        With `dtype` ("float16", or "bfloat16" with `safe_serialization`) the
+        weights are stored in reduced precision, apart from the normalization
+        parameters and position embeddings unless `keep_fp32` is False.
+        """
+        weights_path = weights_path or _default_weights_path(safe_serialization)
         if save_config:
             print("Saving config...")
             self.spec.to_json_file()
@@ -121,24 +289,89 @@ class BaseModel(ivy.Module):
 
         if save_weights:
             print("Saving model weights...")
-            self.v.cont_to_disk_as_hdf5(weights_path)
+            self._save_weights(
+                weights_path, safe_serialization, max_shard_size, dtype, keep_fp32
+            )
 
         print("Successful!")
 
+    @classmethod
+    def load_pretrained(
+        self,
+        config_path: str = "config.json",
+        weights_path: Optional[str] = None,
+        safe_serialization: bool = False,
+        lazy: bool = False,
+        dtype: Optional[str] = None,
+        keep_fp32: bool = True,
+    ):
+        """
+        Load a model saved with `save_pretrained`. With `safe_serialization` the
+        weights file is memory-mapped and the model variables are views over it.
+        With `lazy` the variables are placeholders which each submodule reads from
+        the memory-mapped file the first time its forward pass runs, see
+        `lazy_weights_stats`. Weights stored in reduced precision are cast back
+        to the dtypes of the model, or to `dtype` if given (see `save_pretrained`
+        for `keep_fp32`).
+        """
+        weights_path = weights_path or _default_weights_path(safe_serialization)
+        spec = self.get_spec_class().from_json_file(config_path)
+        if lazy:
+            if os.path.isfile(sharded_weights_index_path(weights_path)):
+                raise ivy.exceptions.IvyException(
+                    "Lazy loading doesn't support sharded weights."
+                )
+            if not safe_serialization:
+                raise ivy.exceptions.IvyException(
+                    "Lazy loading requires weights saved with `safe_serialization`."
+                )
+        with skeleton_weights():
+            model = self(spec=spec)
+        if lazy:
+            # the placeholders can't be built with, they are bound once the
+            # skeleton is built
+            weights = self._tie_weights(load_lazy_weights(weights_path))
+            return enable_lazy_weights(model, weights)
+        weights = self._load_weights(weights_path, safe_serialization)
+        model.v = model._cast_loaded_weights(weights, dtype, keep_fp32)
+        return model
+
+    def materialize_weights(self):
+        """Read every weight which has not been materialized yet by a forward."""
+        materialize_weights(self)
+
+    def lazy_weights_stats(self):
+        return lazy_weights_stats(self)
+
     @classmethod
     def load_from_huggingface(
         self,
         repo_id: str,
         config_path: str = "config.json",
         model_path: str = "model.pkl",
-        weights_path: str = "weights.hdf5",
+        weights_path: Optional[str] = None,
         repo_type: str = "model",
         token: Optional[str] = None,
         revision: Optional[str] = None,
         safe_serialization: bool = False,
         load_model_object: bool = False,
+        dtype: Optional[str] = None,
+        keep_fp32: bool = True,
     ):
         from huggingface_hub import hf_hub_download
+        from huggingface_hub.utils import EntryNotFoundError
+
+        weights_path = weights_path or _default_weights_path(safe_serialization)
+        index_path = None
+        if not load_model_object:
+            try:
+                index_path = hf_hub_download(
+                    filename=sharded_weights_index_path(weights_path),
+                    repo_id=repo_id,
+                    repo_type="model",
+                )
+            except EntryNotFoundError:
+                pass
 
         if load_model_object:
             hf_hub_download(
@@ -151,26 +384,53 @@ class BaseModel(ivy.Module):
             os.remove(model_path)
             return obj
 
-        else:
-            hf_hub_download(
+        elif index_path is not None:
+            # the shards are fetched concurrently into the hub cache and read
+            # from there, next to the index
+            names = sharded_weights_files(index_path)
+            with ThreadPoolExecutor(get_weights_num_workers()) as executor:
+                paths = executor.map(
+                    lambda name: hf_hub_download(
+                        filename=name, repo_id=repo_id, repo_type="model"
+                    ),
+                    names,
+                )
+                shard_paths = dict(zip(names, paths))
+            weights = self._load_weights(
+                index_path[: -len(".index.json")], safe_serialization, shard_paths
+            )
+
+        elif safe_serialization:
+            # the weights are memory-mapped, so they are read straight from the
+            # hub cache rather than from a temporary copy which gets removed
+            weights_path = hf_hub_download(
                 filename=weights_path,
                 repo_id=repo_id,
                 repo_type="model",
-                local_dir=".",
             )
-            weights = ivy.Container.cont_from_disk_as_hdf5(weights_path)
-            os.remove(weights_path)
+            weights = self._load_weights(weights_path, safe_serialization)
 
+        else:
             hf_hub_download(
-                filename=config_path,
+                filename=weights_path,
                 repo_id=repo_id,
                 repo_type="model",
                 local_dir=".",
             )
-            spec = self.get_spec_class().from_json_file(config_path)
-            os.remove(config_path)
+            weights = self._load_weights(weights_path, safe_serialization)
+            os.remove(weights_path)
+
+        hf_hub_download(
+            filename=config_path,
+            repo_id=repo_id,
+            repo_type="model",
+            local_dir=".",
+        )
+        spec = self.get_spec_class().from_json_file(config_path)
+        os.remove(config_path)
 
+        with skeleton_weights():
             model = self(spec=spec)
-            model.v = weights
+        model.v = model._cast_loaded_weights(weights, dtype, keep_fp32)
 
-            return model
+        return model
@@ -1,7 +1,21 @@
 import ivy
 from ivy_models.base import BaseModel, BaseSpec
-from ivy_models.helpers import load_transformers_weights
-from .layers import BertAttention, BertFeedForward, BertEmbedding
+from ivy_models.helpers import (
+    StaticKVCache,
+    fuse_linear_weights,
+    load_transformers_weights,
+    model_factory,
+    pack_tokens,
+    past_key_values_length as _past_key_values_length,
+    unpack_tokens,
+    unpad_indices,
+)
+from .layers import (
+    BertAttention,
+    BertFeedForward,
+    BertEmbedding,
+    extended_attention_mask,
+)
 
 
 # BertConfig
@@ -25,6 +39,12 @@ class BertConfig(BaseSpec):
     layer_norm_eps = 1e-12
     is_decoder: bool = False
     is_cross_attention: bool = False
+    fused_qkv: bool = False
+    attention_mode: str = "dense"
+    attention_tile_size: int = 128
+    attention_window: int = 256
+    num_global_tokens: int = 0
+    position_extension: str = "tile"
 
     def get(self, *attr_names):
         new_dict = {}
@@ -51,6 +71,11 @@ class BertConfig(BaseSpec):
             "hidden_dropout",
             "layer_norm_eps",
             "is_decoder",
+            "fused_qkv",
+            "attention_mode",
+            "attention_tile_size",
+            "attention_window",
+            "num_global_tokens",
         )
 
     def get_embd_attrs(self):
@@ -63,6 +88,7 @@ class BertConfig(BaseSpec):
             "embd_drop_rate",
             "layer_norm_eps",
             "position_embedding_type",
+            "position_extension",
         )
 
 
@@ -114,6 +140,7 @@ class BertLayer(ivy.Module):
         encoder_attention_mask=None,
         past_key_value=None,
         output_attentions=False,
+        cu_seqlens=None,
     ):
         outputs = self.attention(
             hidden_states,
@@ -122,6 +149,7 @@ class BertLayer(ivy.Module):
             encoder_attention_mask,
             past_key_value,
             output_attentions,
+            cu_seqlens,
         )
 
         ffd_out = apply_chunking_to_forward(self.ffd, self.chunk_size, 1, outputs[0])
@@ -147,6 +175,7 @@ class BertEncoder(ivy.Module):
         past_key_values=None,
         use_cache=None,
         output_attentions=False,
+        cu_seqlens=None,
     ):
         all_self_attentions = () if output_attentions else None
         next_decoder_cache = () if use_cache else None
@@ -160,6 +189,7 @@ class BertEncoder(ivy.Module):
                 encoder_attention_mask,
                 past_key_value,
                 output_attentions,
+                cu_seqlens,
             )
 
             hidden_states = layer_outputs[0]
@@ -192,6 +222,9 @@ class BertModel(BaseModel):
     def __init__(self, config: BertConfig, pooler_out=False, v=None):
         self.config = config
         self.pooler_out = pooler_out
+        if v is not None and config.fused_qkv:
+            # the weights of the checkpoints have separate projections
+            v = fuse_linear_weights(v, ["query", "key", "value"], "qkv")
         super(BertModel, self).__init__(v=v)
 
     @classmethod
@@ -214,16 +247,34 @@ class BertModel(BaseModel):
         past_key_values=None,
         use_cache=None,
         output_attentions=None,
+        packed=False,
+        pad_outputs=False,
     ):
+        """
+        With `packed=True` the real tokens of the rows, given by
+        `attention_mask`, are packed into a single row before the embeddings,
+        so that the feed forward layers and layer norms only run on them and
+        every row only attends to its own tokens. The last hidden state is then
+        of shape `(1, num_tokens, hidden_size)`, with the tokens of row `i` at
+        `cu_seqlens[i]:cu_seqlens[i + 1]`, unless `pad_outputs` in which case it
+        is scattered back to the padded layout.
+        """
+        if packed:
+            return self._packed_forward(
+                input_ids,
+                attention_mask,
+                token_type_ids,
+                position_ids,
+                output_attentions,
+                pad_outputs,
+            )
         if self.config.is_decoder:
             use_cache = use_cache if use_cache is not None else self.config.use_cache
         else:
             use_cache = False
 
         # past_key_values_length
-        past_key_values_length = (
-            past_key_values[0][0].shape[2] if past_key_values is not None else 0
-        )
+        past_key_values_length = _past_key_values_length(past_key_values)
         embeddings = self.embeddings(
             input_ids,
             token_type_ids,
@@ -231,6 +282,14 @@ class BertModel(BaseModel):
             past_key_values_length,
         )
 
+        if attention_mask is not None:
+            # computed once here rather than in every layer
+            attention_mask = extended_attention_mask(attention_mask, embeddings.dtype)
+        if encoder_attention_mask is not None:
+            encoder_attention_mask = extended_attention_mask(
+                encoder_attention_mask, embeddings.dtype
+            )
+
         encoder_outs = self.encoder(
             embeddings,
             attention_mask,
@@ -248,7 +307,70 @@ class BertModel(BaseModel):
             "pooler_output": pooler_out,
             "last_hidden_state": encoder_outs[0],
             "attention_probs": encoder_outs[1],
-            "next_decoder_cache": encoder_outs[2],
+            "next_decoder_cache": (
+                past_key_values
+                if use_cache and isinstance(past_key_values, StaticKVCache)
+                else encoder_outs[2]
+            ),
+        }
+
+    def _packed_forward(
+        self,
+        input_ids,
+        attention_mask,
+        token_type_ids,
+        position_ids,
+        output_attentions,
+        pad_outputs,
+    ):
+        if attention_mask is None:
+            attention_mask = ivy.ones(input_ids.shape, dtype=ivy.int64)
+        indices, cu_seqlens = unpad_indices(attention_mask)
+        # an empty row has no first token for the pooler and no segment
+        empty_rows = [
+            i for i in range(len(cu_seqlens) - 1) if cu_seqlens[i] == cu_seqlens[i + 1]
+        ]
+        if empty_rows:
+            raise ivy.exceptions.IvyException(
+                f"Rows {empty_rows} of the attention mask have no tokens, they "
+                "can't be packed."
+            )
+        seq_length = input_ids.shape[1]
+        if position_ids is None:
+            # the positions the tokens have in the padded rows
+            position_ids = ivy.expand_dims(indices % seq_length, axis=0)
+        else:
+            position_ids = pack_tokens(
+                ivy.broadcast_to(position_ids, input_ids.shape), indices
+            )
+        if token_type_ids is None:
+            token_type_ids = ivy.zeros((1, cu_seqlens[-1]), dtype=ivy.int32)
+        else:
+            token_type_ids = pack_tokens(token_type_ids, indices)
+
+        embeddings = self.embeddings(
+            pack_tokens(input_ids, indices), token_type_ids, position_ids
+        )
+        hidden_states, attention_probs, _ = self.encoder(
+            embeddings,
+            output_attentions=output_attentions,
+            cu_seqlens=cu_seqlens,
+        )
+        if self.pooler_out:
+            first_tokens = ivy.gather(
+                hidden_states[0], ivy.asarray(cu_seqlens[:-1]), axis=0
+            )
+            pooler_out = self.pooler(ivy.expand_dims(first_tokens, axis=1))
+        else:
+            pooler_out = None
+        if pad_outputs:
+            hidden_states = unpack_tokens(hidden_states, indices, input_ids.shape)
+        return {
+            "pooler_output": pooler_out,
+            "last_hidden_state": hidden_states,
+            "attention_probs": attention_probs,
+            "next_decoder_cache": None,
+            "cu_seqlens": cu_seqlens,
         }
 
 
@@ -278,6 +400,7 @@ def _bert_weights_mapping(name):
     return name
 
 
+@model_factory
 def bert_base_uncased(pretrained=True):
     # instantiate the hyperparameters same as bert
     # set the dropout rate to 0.0 to avoid stochasticity in the output
@@ -1,5 +1,47 @@
 import ivy
 import math
+from ivy_models.helpers import StaticKVCacheLayer, linear_slice, tiled_attention
+
+
+def extended_attention_mask(attention_mask, dtype):
+    """
+    Turn a `(batch_size, seq_len)` or `(batch_size, tgt_len, seq_len)` mask of
+    the keys to attend to into an additive mask which broadcasts over the heads
+    and queries of the attention scores, `(batch_size, 1, 1, seq_len)` or
+    `(batch_size, 1, tgt_len, seq_len)`. A 4-dimensional float mask is assumed
+    to be extended already and is returned as is, an integer or boolean one is
+    a mask of the keys to attend to and is converted likewise.
+    """
+    shape = ivy.shape(attention_mask)
+    if len(shape) == 4:
+        if ivy.is_float_dtype(attention_mask):
+            return attention_mask
+    elif len(shape) == 2:
+        attention_mask = ivy.expand_dims(attention_mask, axis=(1, 2))
+    else:
+        attention_mask = ivy.expand_dims(attention_mask, axis=1)
+    # the masked keys get the lowest finite score rather than -inf, so that a
+    # fully masked row doesn't give NaNs after the softmax
+    return (1.0 - ivy.astype(attention_mask, dtype)) * ivy.finfo(dtype).min
+
+
+def _window_blocks(x, num_blocks, block_size):
+    """
+    Split `x`, of shape `(..., (num_blocks + 2) * block_size, dim)`, into the
+    `3 * block_size` positions seen by each block of queries of a sliding
+    window: the positions of the block along with the ones of the previous and
+    next blocks, of shape `(..., num_blocks, 3 * block_size, dim)`.
+    """
+    shape = tuple(x.shape[:-2]) + (num_blocks, block_size, x.shape[-1])
+    return ivy.concat(
+        [
+            ivy.reshape(
+                x[..., i * block_size : (i + num_blocks) * block_size, :], shape
+            )
+            for i in range(3)
+        ],
+        axis=-2,
+    )
 
 
 class BertEmbedding(ivy.Module):
@@ -13,8 +55,14 @@ class BertEmbedding(ivy.Module):
         embd_drop_rate=0.1,
         layer_norm_eps=1e-5,
         position_embedding_type="absolute",
+        position_extension="tile",
         v=None,
     ):
+        if position_extension not in ("tile", "interpolate"):
+            raise ValueError(
+                f"The position extension should be 'tile' or 'interpolate', "
+                f"got {position_extension}"
+            )
         self.vocab_size = vocab_size
         self.hidden_size = hidden_size
         self.type_token_size = type_vocab_size
@@ -23,6 +71,9 @@ class BertEmbedding(ivy.Module):
         self.drop_rate = embd_drop_rate
         self.position_type_embd = position_embedding_type
         self.layer_norm_eps = layer_norm_eps
+        # how the position embeddings are extended to the positions past
+        # `max_position_embeddings`, see `_position_embeddings`
+        self.position_extension = position_extension
         super(BertEmbedding, self).__init__(v=v)
 
     def _build(self, *args, **kwargs):
@@ -49,32 +100,53 @@ class BertEmbedding(ivy.Module):
         seq_length = input_shape[1]
 
         if position_ids is None:
-            pos_ids = ivy.expand_dims(ivy.arange(self.max_position_embeddings), axis=0)
-            position_ids = pos_ids[
-                :, past_key_values_length : seq_length + past_key_values_length
-            ]
+            num_positions = seq_length + past_key_values_length
+            position_ids = ivy.expand_dims(
+                ivy.arange(past_key_values_length, num_positions, dtype=ivy.int64),
+                axis=0,
+            )
+        else:
+            num_positions = int(ivy.max(position_ids)) + 1
 
         if token_type_ids is None:
-            token_type_ids = ivy.zeros(
-                (1, self.max_position_embeddings), dtype=ivy.int32
-            )
-            buffered_token_type_ids = token_type_ids[:, :seq_length]
-            token_type_ids = buffered_token_type_ids.expand(
-                (input_shape[0], seq_length)
-            )
+            token_type_ids = ivy.zeros((input_shape[0], seq_length), dtype=ivy.int32)
 
         inputs_embeds = self.word_embeddings(input_ids)
         token_type_embeddings = self.token_type_embeddings(token_type_ids)
 
         embeddings = inputs_embeds + token_type_embeddings
         if self.position_type_embd == "absolute":
-            position_embeddings = self.position_embeddings(position_ids)
+            position_embeddings = self._position_embeddings(position_ids, num_positions)
             embeddings = embeddings + position_embeddings
 
         embeddings = self.LayerNorm(embeddings)
         embeddings = self.dropout(embeddings)
         return embeddings
 
+    def _position_embeddings(self, position_ids, num_positions):
+        """
+        Embed the positions, extending the learned embeddings when there are
+        more than `max_position_embeddings` positions, for the long sequences
+        of the sliding window attention. With `"tile"` the embeddings are
+        repeated every `max_position_embeddings` positions, with
+        `"interpolate"` the `num_positions` positions are mapped linearly onto
+        the learned ones and their embeddings interpolated.
+        """
+        max_positions = self.max_position_embeddings
+        if num_positions <= max_positions:
+            return self.position_embeddings(position_ids)
+        if self.position_extension == "tile":
+            return self.position_embeddings(position_ids % max_positions)
+        positions = ivy.astype(position_ids, self.v.position_embeddings.w.dtype)
+        positions = positions * ((max_positions - 1) / (num_positions - 1))
+        lower = ivy.floor(positions)
+        weight = ivy.expand_dims(positions - lower, axis=-1)
+        lower = ivy.astype(lower, ivy.int64)
+        upper = ivy.minimum(lower + 1, max_positions - 1)
+        lower_embeddings = self.position_embeddings(lower)
+        upper_embeddings = self.position_embeddings(upper)
+        return lower_embeddings + weight * (upper_embeddings - lower_embeddings)
+
 
 class BertSelfAttention(ivy.Module):
     def __init__(
@@ -85,6 +157,11 @@ class BertSelfAttention(ivy.Module):
         position_embedding_type=None,
         attn_drop_rate=0.1,
         is_decoder=False,
+        fused_qkv=False,
+        attention_mode="dense",
+        attention_tile_size=128,
+        attention_window=256,
+        num_global_tokens=0,
         v=None,
     ):
         if hidden_size % num_attention_heads != 0:
@@ -106,14 +183,48 @@ class BertSelfAttention(ivy.Module):
         )
         self.is_decoder = is_decoder
         self.max_position_embeddings = max_position_embeddings
+        # project the query, key and value with a single matmul of a `qkv` layer,
+        # the weights of the checkpoints are fused by `BertModel`
+        self.fused_qkv = fused_qkv
+        if attention_mode not in ("dense", "tiled", "sliding_window"):
+            raise ValueError(
+                f"The attention mode should be 'dense', 'tiled' or "
+                f"'sliding_window', got {attention_mode}"
+            )
+        if attention_mode == "sliding_window" and is_decoder:
+            raise ValueError(
+                "The sliding window attention looks at the following tokens, "
+                "it can't be used by a decoder"
+            )
+        # the tiled attention goes through the keys and values a tile at a time,
+        # never holding the scores of all the keys at once
+        self.attention_mode = attention_mode
+        self.attention_tile_size = attention_tile_size
+        # with the sliding window attention a token attends to the tokens at
+        # most `attention_window` positions away, and to the first
+        # `num_global_tokens` tokens, which attend to all the tokens
+        self.attention_window = attention_window
+        self.num_global_tokens = num_global_tokens
         super(BertSelfAttention, self).__init__(v=v)
 
     def _build(self, *args, **kwargs):
-        self.query = ivy.Linear(self.hidden_size, self.all_head_size)
-        self.key = ivy.Linear(self.hidden_size, self.all_head_size)
-        self.value = ivy.Linear(self.hidden_size, self.all_head_size)
+        if self.fused_qkv:
+            self.qkv = ivy.Linear(self.hidden_size, 3 * self.all_head_size)
+        else:
+            self.query = ivy.Linear(self.hidden_size, self.all_head_size)
+            self.key = ivy.Linear(self.hidden_size, self.all_head_size)
+            self.value = ivy.Linear(self.hidden_size, self.all_head_size)
         self.dropout = ivy.Dropout(self.attn_drop_rate)
 
+    def _project(self, x, name):
+        # the query, key or value projection alone, a slice of the fused layer
+        if not self.fused_qkv:
+            return getattr(self, name)(x)
+        i = ("query", "key", "value").index(name)
+        return linear_slice(
+            x, self.v.qkv, i * self.all_head_size, (i + 1) * self.all_head_size
+        )
+
     def transpose_for_scores(self, x: ivy.Array):
         # transpose the hidden_states from (bs, seq_len, hidden_size)
         # - > (bs, seq_len, num_heads, head_size)
@@ -132,9 +243,16 @@ class BertSelfAttention(ivy.Module):
         encoder_attention_mask=None,
         past_key_value=None,
         output_attentions=False,
+        cu_seqlens=None,
     ):
-        mixed_query_layer = self.query(hidden_states)
         is_cross_attention = encoder_hidden_states is not None
+        if self.fused_qkv and not is_cross_attention:
+            mixed_query_layer, mixed_key_layer, mixed_value_layer = ivy.split(
+                self.qkv(hidden_states), num_or_size_splits=3, axis=-1
+            )
+        else:
+            mixed_query_layer = self._project(hidden_states, "query")
+            mixed_key_layer = mixed_value_layer = None
 
         if is_cross_attention and past_key_value is not None:
             # reuse k,v, cross_attentions
@@ -142,46 +260,229 @@ class BertSelfAttention(ivy.Module):
             value_layer = past_key_value[1]
             attention_mask = encoder_attention_mask
         elif is_cross_attention:
-            key_layer = self.transpose_for_scores(self.key(encoder_hidden_states))
-            value_layer = self.transpose_for_scores(self.value(encoder_hidden_states))
+            key_layer = self.transpose_for_scores(
+                self._project(encoder_hidden_states, "key")
+            )
+            value_layer = self.transpose_for_scores(
+                self._project(encoder_hidden_states, "value")
+            )
             attention_mask = encoder_attention_mask
-        elif past_key_value is not None:
-            key_layer = self.transpose_for_scores(self.key(hidden_states))
-            value_layer = self.transpose_for_scores(self.value(hidden_states))
-            key_layer = ivy.concat([past_key_value[0], key_layer], dim=2)
-            value_layer = ivy.concat([past_key_value[1], value_layer], dim=2)
         else:
-            key_layer = self.transpose_for_scores(self.key(hidden_states))
-            value_layer = self.transpose_for_scores(self.value(hidden_states))
+            if mixed_key_layer is None:
+                mixed_key_layer = self._project(hidden_states, "key")
+                mixed_value_layer = self._project(hidden_states, "value")
+            key_layer = self.transpose_for_scores(mixed_key_layer)
+            value_layer = self.transpose_for_scores(mixed_value_layer)
+            if isinstance(past_key_value, StaticKVCacheLayer):
+                key_layer, value_layer = past_key_value.update(key_layer, value_layer)
+            elif past_key_value is not None:
+                key_layer = ivy.concat([past_key_value[0], key_layer], axis=2)
+                value_layer = ivy.concat([past_key_value[1], value_layer], axis=2)
 
         query_layer = self.transpose_for_scores(mixed_query_layer)
-        if self.is_decoder:
+        if self.is_decoder and not isinstance(past_key_value, StaticKVCacheLayer):
             past_key_value = (key_layer, value_layer)
+        if cu_seqlens is not None:
+            context_layer, attention_probs = self._packed_attention(
+                query_layer, key_layer, value_layer, cu_seqlens
+            )
+            return self._outputs(
+                context_layer, attention_probs, past_key_value, output_attentions
+            )
+
+        if self.attention_mode == "sliding_window":
+            context_layer, attention_probs = self._sliding_window_attention(
+                query_layer, key_layer, value_layer, attention_mask
+            )
+            return self._outputs(
+                context_layer, attention_probs, past_key_value, output_attentions
+            )
+
+        # the attention probabilities can only be returned by the dense attention
+        if self.attention_mode == "tiled" and not output_attentions:
+            if attention_mask is not None:
+                attention_mask = extended_attention_mask(
+                    attention_mask, query_layer.dtype
+                )
+            context_layer = tiled_attention(
+                query_layer / math.sqrt(self.attention_head_size),
+                key_layer,
+                value_layer,
+                attention_mask,
+                tile_size=self.attention_tile_size,
+                dropout=self.dropout,
+            )
+            return self._outputs(context_layer, None, past_key_value, False)
+
         # scaled Dot product
         # Take the dot product between "query" and "key"
         # to get the raw attention scores.
         attention_scores = ivy.matmul(query_layer, key_layer.permute_dims((0, 1, 3, 2)))
         attention_scores = attention_scores / math.sqrt(self.attention_head_size)
-        # Masking
+        # Masking, BertModel extends the mask once for all the layers
         if attention_mask is not None:
-            shape = ivy.shape(attention_mask)
-            attention_mask = ivy.astype(attention_mask, bool)
-            if len(shape) == 2:
-                attention_mask = ivy.expand_dims(attention_mask, axis=(1, -1))
-            elif len(shape) == 3:
-                attention_mask = ivy.expand_dims(attention_mask, axis=-1)
-
-            attention_scores = ivy.where(attention_mask, attention_scores, -ivy.inf)
+            attention_scores = attention_scores + extended_attention_mask(
+                attention_mask, attention_scores.dtype
+            )
 
         # Normalize the attention scores to probabilities.
         attention_probs = ivy.softmax(attention_scores, axis=-1)
-        # solving the softmax nan number problem
-        attention_probs = ivy.nan_to_num(attention_probs, nan=0.0)
 
         attention_probs = self.dropout(attention_probs)
 
         context_layer = ivy.matmul(attention_probs, value_layer)
+        return self._outputs(
+            context_layer, attention_probs, past_key_value, output_attentions
+        )
 
+    def _sliding_window_attention(
+        self, query_layer, key_layer, value_layer, attention_mask
+    ):
+        """
+        Attention of every token to the tokens at most `attention_window`
+        positions away and to the global tokens, in O(seq_len * window).
+
+        The queries are split into blocks of `attention_window` tokens, each
+        block attending to the keys of itself and of the previous and next
+        blocks, the keys out of the window being masked. The global tokens are
+        attended to by every query, and attend to all the keys. The returned
+        probabilities are of shape `(batch_size, num_heads, seq_len,
+        num_global_tokens + 3 * attention_window)`, the ones of the global keys
+        followed by the ones of the keys of the blocks. The rows of the global
+        tokens aren't the probabilities of their attention to all the keys.
+        """
+        batch_size, _, seq_length, _ = query_layer.shape
+        dtype = query_layer.dtype
+        min_value = ivy.finfo(dtype).min
+        window = self.attention_window
+        num_global = min(self.num_global_tokens, seq_length)
+        num_blocks = -(-seq_length // window)
+        pad = num_blocks * window - seq_length
+        query_layer = query_layer / math.sqrt(self.attention_head_size)
+
+        # only masks of the keys can be applied to the blocks of keys
+        if attention_mask is None:
+            key_mask = ivy.zeros((batch_size, 1, 1, seq_length), dtype=dtype)
+        else:
+            key_mask = extended_attention_mask(attention_mask, dtype)
+            if key_mask.shape[-2] != 1:
+                raise ValueError(
+                    "The sliding window attention only supports masks of the "
+                    f"keys, got a mask of shape {key_mask.shape}"
+                )
+            key_mask = ivy.broadcast_to(key_mask, (batch_size, 1, 1, seq_length))
+
+        # a query attends to the keys of the window around it, which are neither
+        # padding nor global tokens, attended to separately
+        query_pos = ivy.reshape(
+            ivy.arange(num_blocks * window, dtype=ivy.int64), (num_blocks, window, 1)
+        )
+        key_pos = ivy.reshape(
+            ivy.arange(num_blocks, dtype=ivy.int64) * window - window, (-1, 1, 1)
+        ) + ivy.arange(3 * window, dtype=ivy.int64)
+        in_window = ivy.logical_and(
+            ivy.abs(key_pos - query_pos) <= window,
+            ivy.logical_and(key_pos >= num_global, key_pos < seq_length),
+        )
+        key_blocks_mask = _window_blocks(
+            ivy.swapaxes(
+                ivy.constant_pad(
+                    key_mask,
+                    ((0, 0), (0, 0), (0, 0), (window, window + pad)),
+                    value=min_value,
+                ),
+                -1,
+                -2,
+            ),
+            num_blocks,
+            window,
+        )
+        local_mask = ivy.where(
+            in_window,
+            ivy.swapaxes(key_blocks_mask, -1, -2),
+            ivy.asarray(min_value, dtype=dtype),
+        )
+
+        padding = ((0, 0), (0, 0), (window, window + pad), (0, 0))
+        key_blocks = _window_blocks(
+            ivy.zero_pad(key_layer, padding), num_blocks, window
+        )
+        value_blocks = _window_blocks(
+            ivy.zero_pad(value_layer, padding), num_blocks, window
+        )
+        query_blocks = ivy.reshape(
+            ivy.zero_pad(query_layer, ((0, 0), (0, 0), (0, pad), (0, 0))),
+            (batch_size, self.num_attention_heads, num_blocks, window, -1),
+        )
+        attention_scores = (
+            ivy.matmul(query_blocks, ivy.swapaxes(key_blocks, -1, -2)) + local_mask
+        )
+        if num_global:
+            global_keys = ivy.expand_dims(key_layer[:, :, :num_global], axis=2)
+            global_scores = ivy.matmul(
+                query_blocks, ivy.swapaxes(global_keys, -1, -2)
+            ) + ivy.expand_dims(key_mask[..., :num_global], axis=2)
+            attention_scores = ivy.concat([global_scores, attention_scores], axis=-1)
+
+        attention_probs = self.dropout(ivy.softmax(attention_scores, axis=-1))
+        context_layer = ivy.matmul(attention_probs[..., num_global:], value_blocks)
+        if num_global:
+            global_values = ivy.expand_dims(value_layer[:, :, :num_global], axis=2)
+            context_layer = context_layer + ivy.matmul(
+                attention_probs[..., :num_global], global_values
+            )
+        context_layer = ivy.reshape(
+            context_layer,
+            (
+                batch_size,
+                self.num_attention_heads,
+                num_blocks * window,
+                self.attention_head_size,
+            ),
+        )[:, :, :seq_length]
+        attention_probs = ivy.reshape(
+            attention_probs,
+            (batch_size, self.num_attention_heads, num_blocks * window, -1),
+        )[:, :, :seq_length]
+
+        if num_global:
+            # the global tokens attend to all the tokens
+            global_probs = self.dropout(
+                ivy.softmax(
+                    ivy.matmul(
+                        query_layer[:, :, :num_global], ivy.swapaxes(key_layer, -1, -2)
+                    )
+                    + key_mask,
+                    axis=-1,
+                )
+            )
+            context_layer = ivy.concat(
+                [
+                    ivy.matmul(global_probs, value_layer),
+                    context_layer[:, :, num_global:],
+                ],
+                axis=2,
+            )
+        return context_layer, attention_probs
+
+    def _packed_attention(self, query_layer, key_layer, value_layer, cu_seqlens):
+        # the rows are packed in a single one, each attends only to its own
+        # tokens, so no score is computed between tokens of different rows
+        contexts, probs = [], []
+        for start, end in zip(cu_seqlens[:-1], cu_seqlens[1:]):
+            attention_scores = ivy.matmul(
+                query_layer[:, :, start:end],
+                key_layer[:, :, start:end].permute_dims((0, 1, 3, 2)),
+            )
+            attention_scores = attention_scores / math.sqrt(self.attention_head_size)
+            attention_probs = self.dropout(ivy.softmax(attention_scores, axis=-1))
+            contexts.append(ivy.matmul(attention_probs, value_layer[:, :, start:end]))
+            probs.append(attention_probs)
+        return ivy.concat(contexts, axis=2), tuple(probs)
+
+    def _outputs(
+        self, context_layer, attention_probs, past_key_value, output_attentions
+    ):
         context_layer = context_layer.permute_dims((0, 2, 1, 3))
         new_context_layer_shape = context_layer.shape[:-2] + (self.all_head_size,)
         context_layer = context_layer.reshape(new_context_layer_shape)
@@ -205,6 +506,11 @@ class BertAttention(ivy.Module):
         hidden_dropout=0.1,
         layer_norm_eps=1e-5,
         is_decoder=False,
+        fused_qkv=False,
+        attention_mode="dense",
+        attention_tile_size=128,
+        attention_window=256,
+        num_global_tokens=0,
         v=None,
     ):
         self.hidden_size = hidden_size
@@ -219,6 +525,11 @@ class BertAttention(ivy.Module):
         self.layer_norm_eps = layer_norm_eps
         self.max_position_embeddings = max_position_embeddings
         self.num_attention_heads = num_attention_heads
+        self.fused_qkv = fused_qkv
+        self.attention_mode = attention_mode
+        self.attention_tile_size = attention_tile_size
+        self.attention_window = attention_window
+        self.num_global_tokens = num_global_tokens
         super(BertAttention, self).__init__(v=v)
 
     def _build(self, *args, **kwargs):
@@ -229,6 +540,11 @@ class BertAttention(ivy.Module):
             self.position_type_embd,
             self.attn_drop_rate,
             self.is_decoder,
+            self.fused_qkv,
+            self.attention_mode,
+            self.attention_tile_size,
+            self.attention_window,
+            self.num_global_tokens,
         )
         self.dense = ivy.Linear(self.hidden_size, self.hidden_size)
         self.LayerNorm = ivy.LayerNorm([self.hidden_size], eps=self.layer_norm_eps)
@@ -242,6 +558,7 @@ class BertAttention(ivy.Module):
         encoder_attention_mask=None,
         past_key_value=None,
         output_attentions=False,
+        cu_seqlens=None,
     ):
         outputs = self.self(
             hidden_states,
@@ -250,6 +567,7 @@ class BertAttention(ivy.Module):
             encoder_attention_mask,
             past_key_value,
             output_attentions,
+            cu_seqlens,
         )
 
         out = self.dense(outputs[0])
@@ -2,7 +2,7 @@ import ivy
 from ivy_models.convnext.layers import ConvNeXtBlock, ConvNeXtV2Block, ConvNeXtLayerNorm
 
 from ivy_models.base import BaseModel, BaseSpec
-from ivy_models.helpers import load_torch_weights
+from ivy_models.helpers import load_torch_weights, model_factory
 
 
 class ConvNeXtSpec(BaseSpec):
@@ -172,6 +172,7 @@ def _convnext_torch_weights_mapping(old_key, new_key):
     return new_mapping
 
 
+@model_factory
 def convnext_tiny(data_format="NCHW", pretrained=True):
     """Loads a ConvNeXt with specified size, optionally pretrained."""
     depths, dims = ([3, 3, 9, 3], [96, 192, 384, 768])
@@ -193,6 +194,7 @@ def convnext_tiny(data_format="NCHW", pretrained=True):
     return model
 
 
+@model_factory
 def convnext_small(data_format="NCHW", pretrained=True):
     """Loads a ConvNeXt with specified size, optionally pretrained."""
     depths, dims = ([3, 3, 27, 3], [96, 192, 384, 768])
@@ -210,6 +212,7 @@ def convnext_small(data_format="NCHW", pretrained=True):
     return model
 
 
+@model_factory
 def convnext_base(data_format="NCHW", pretrained=True):
     """Loads a ConvNeXt with specified size, optionally pretrained."""
     depths, dims = ([3, 3, 27, 3], [128, 256, 512, 1024])
@@ -227,6 +230,7 @@ def convnext_base(data_format="NCHW", pretrained=True):
     return model
 
 
+@model_factory
 def convnext_large(data_format="NCHW", pretrained=True):
     """Loads a ConvNeXt with specified size, optionally pretrained."""
     depths, dims = ([3, 3, 27, 3], [192, 384, 768, 1536])
@@ -244,6 +248,7 @@ def convnext_large(data_format="NCHW", pretrained=True):
     return model
 
 
+@model_factory
 def convnextv2_atto(data_format="NCHW", pretrained=True):
     """Loads a ConvNeXtV2 with specified size, optionally pretrained."""
     depths, dims = ([2, 2, 6, 2], [40, 80, 160, 320])
@@ -261,6 +266,7 @@ def convnextv2_atto(data_format="NCHW", pretrained=True):
     return model
 
 
+@model_factory
 def convnextv2_base(data_format="NCHW", pretrained=True):
     """Loads a ConvNeXtV2 with specified size, optionally pretrained."""
     depths, dims = ([3, 3, 27, 3], [128, 256, 512, 1024])
@@ -2,7 +2,7 @@ from collections import OrderedDict
 from typing import Tuple
 import builtins
 
-from ivy_models.helpers import load_torch_weights
+from ivy_models.helpers import load_torch_weights, model_factory
 from ivy_models.densenet.denselayers import DenseNetBlock, DenseNetTransition, ivy
 from ivy_models.base import BaseSpec, BaseModel
 
@@ -158,6 +158,7 @@ def densenet(
     return model
 
 
+@model_factory
 def densenet121(v=None, pretrained=True):
     model = densenet(32, (6, 12, 24, 16), 64, v=v)
     if pretrained:
@@ -173,6 +174,7 @@ def densenet121(v=None, pretrained=True):
     return model
 
 
+@model_factory
 def densenet161(v=None, pretrained=True):
     model = densenet(48, (6, 12, 36, 24), 96, v=v)
     if pretrained:
@@ -187,6 +189,7 @@ def densenet161(v=None, pretrained=True):
     return model
 
 
+@model_factory
 def densenet169(v=None, pretrained=True):
     model = densenet(32, (6, 12, 32, 32), 64, v=v)
     if pretrained:
@@ -201,6 +204,7 @@ def densenet169(v=None, pretrained=True):
     return model
 
 
+@model_factory
 def densenet201(v=None, pretrained=True):
     model = densenet(32, (6, 12, 48, 32), 64, v=v)
     if pretrained:
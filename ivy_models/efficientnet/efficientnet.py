@@ -9,6 +9,7 @@ from dataclasses import dataclass
 from functools import partial
 from typing import Callable, Optional, Sequence, Union, Tuple
 from ivy_models.base import BaseSpec, BaseModel
+from ivy_models.helpers import model_factory
 
 from ivy_models.efficientnet.layers import (
     _make_divisible,
@@ -514,6 +515,7 @@ def _efficient_net_torch_weights_mapping(old_key, new_key):
     return new_mapping
 
 
+@model_factory
 def efficientnet_b0(pretrained=True, data_format="NHWC"):
     inverted_residual_setting, last_channel, dropout, norm_layer = _efficientnet_conf(
         "efficientnet_b0"
@@ -539,6 +541,7 @@ def efficientnet_b0(pretrained=True, data_format="NHWC"):
     return model
 
 
+@model_factory
 def efficientnet_b1(pretrained=True, data_format="NHWC"):
     inverted_residual_setting, last_channel, dropout, norm_layer = _efficientnet_conf(
         "efficientnet_b1"
@@ -564,6 +567,7 @@ def efficientnet_b1(pretrained=True, data_format="NHWC"):
     return model
 
 
+@model_factory
 def efficientnet_b2(pretrained=True, data_format="NHWC"):
     inverted_residual_setting, last_channel, dropout, norm_layer = _efficientnet_conf(
         "efficientnet_b2"
@@ -589,6 +593,7 @@ def efficientnet_b2(pretrained=True, data_format="NHWC"):
     return model
 
 
+@model_factory
 def efficientnet_b3(pretrained=True, data_format="NHWC"):
     inverted_residual_setting, last_channel, dropout, norm_layer = _efficientnet_conf(
         "efficientnet_b3"
@@ -614,6 +619,7 @@ def efficientnet_b3(pretrained=True, data_format="NHWC"):
     return model
 
 
+@model_factory
 def efficientnet_b4(pretrained=True, data_format="NHWC"):
     inverted_residual_setting, last_channel, dropout, norm_layer = _efficientnet_conf(
         "efficientnet_b4"
@@ -639,6 +645,7 @@ def efficientnet_b4(pretrained=True, data_format="NHWC"):
     return model
 
 
+@model_factory
 def efficientnet_b5(pretrained=True, data_format="NHWC"):
     inverted_residual_setting, last_channel, dropout, norm_layer = _efficientnet_conf(
         "efficientnet_b5"
@@ -664,6 +671,7 @@ def efficientnet_b5(pretrained=True, data_format="NHWC"):
     return model
 
 
+@model_factory
 def efficientnet_b6(pretrained=True, data_format="NHWC"):
     inverted_residual_setting, last_channel, dropout, norm_layer = _efficientnet_conf(
         "efficientnet_b6"
@@ -689,6 +697,7 @@ def efficientnet_b6(pretrained=True, data_format="NHWC"):
     return model
 
 
+@model_factory
 def efficientnet_b7(pretrained=True, data_format="NHWC"):
     inverted_residual_setting, last_channel, dropout, norm_layer = _efficientnet_conf(
         "efficientnet_b7"
@@ -714,6 +723,7 @@ def efficientnet_b7(pretrained=True, data_format="NHWC"):
     return model
 
 
+@model_factory
 def efficientnet_v2_s(pretrained=True, data_format="NHWC"):
     inverted_residual_setting, last_channel, dropout, norm_layer = _efficientnet_conf(
         "efficientnet_v2_s"
@@ -737,6 +747,7 @@ def efficientnet_v2_s(pretrained=True, data_format="NHWC"):
     return model
 
 
+@model_factory
 def efficientnet_v2_m(pretrained=True, data_format="NHWC"):
     inverted_residual_setting, last_channel, dropout, norm_layer = _efficientnet_conf(
         "efficientnet_v2_m"
@@ -760,6 +771,7 @@ def efficientnet_v2_m(pretrained=True, data_format="NHWC"):
     return model
 
 
+@model_factory
 def efficientnet_v2_l(pretrained=True, data_format="NHWC"):
     inverted_residual_setting, last_channel, dropout, norm_layer = _efficientnet_conf(
         "efficientnet_v2_l"
@@ -2,6 +2,7 @@
 import ivy
 import ivy_models
 from ivy_models.base import BaseSpec, BaseModel
+from ivy_models.helpers import model_factory
 from ivy_models.googlenet.layers import (
     InceptionConvBlock,
     InceptionBlock,
@@ -134,6 +135,7 @@ def _inceptionNet_torch_weights_mapping(old_key, new_key):
     return new_key
 
 
+@model_factory
 def inceptionNet_v1(
     pretrained=True,
     training=False,
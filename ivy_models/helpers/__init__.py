@@ -1 +1,15 @@
 from .weights_helpers import *
+from .weights_cache import *
+from .flat_weights import *
+from .lazy_weights import *
+from .download_helpers import *
+from .sharded_weights import *
+from .dtype_policy import *
+from .factory_helpers import *
+from .hot_swap import *
+from .kv_cache import *
+from .encoder_cache import *
+from .fused_linear import *
+from .packing import *
+from .batching import *
+from .tiled_attention import *
@@ -0,0 +1,146 @@
+# global
+import time
+import threading
+import numpy as np
+import ivy
+from concurrent.futures import Future
+
+
+def _row(outputs, i, length, sequence_outputs=()):
+    """
+    Take the outputs of row `i` of a batch, trimming the sequence dimension of
+    the `sequence_outputs`, given by key for a dict of outputs and by position
+    for a tuple, to the `length` tokens of the row.
+    """
+    if isinstance(outputs, dict):
+        return {
+            k: v[i, :length] if k in sequence_outputs else _row(v, i, length)
+            for k, v in outputs.items()
+        }
+    if isinstance(outputs, (list, tuple)):
+        return type(outputs)(
+            v[i, :length] if j in sequence_outputs else _row(v, i, length)
+            for j, v in enumerate(outputs)
+        )
+    if not ivy.is_array(outputs):
+        return outputs
+    return outputs[i]
+
+
+class DynamicBatcher:
+    """
+    Batch the requests of concurrent callers of a sequence model.
+
+    A request is the list of token ids of a single sequence. It's queued in the
+    bucket of the shortest of `bucket_lengths` which fits it, and a background
+    thread runs `fn(input_ids, attention_mask)` on the requests of a bucket as
+    soon as `max_batch_size` of them are pending, or once the oldest one has
+    waited for `max_delay` seconds. The batch is padded to the bucket length
+    rather than to the longest possible sequence, and its arrays are filled in
+    a single preallocated buffer before being converted at once. `fn` can be a
+    `BertModel` or a `BartEncoder`, whose outputs are split back per request.
+    The outputs with a sequence dimension, trimmed to the tokens of each
+    request, are given by key or position in `sequence_outputs`, the
+    `last_hidden_state` of both by default.
+    """
+
+    def __init__(
+        self,
+        fn,
+        bucket_lengths=(32, 64, 128, 256, 512),
+        max_batch_size=32,
+        max_delay=0.005,
+        pad_token_id=0,
+        sequence_outputs=("last_hidden_state", 0),
+    ):
+        self.fn = fn
+        self.bucket_lengths = sorted(bucket_lengths)
+        self.max_batch_size = max_batch_size
+        self.max_delay = max_delay
+        self.pad_token_id = pad_token_id
+        self.sequence_outputs = sequence_outputs
+        # pending (token ids, future, deadline) of every bucket, oldest first
+        self._pending = {length: [] for length in self.bucket_lengths}
+        self._closed = False
+        self._cond = threading.Condition()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def submit(self, input_ids):
+        """Queue a request, returning a future of its outputs."""
+        input_ids = list(input_ids)
+        buckets = [b for b in self.bucket_lengths if b >= len(input_ids)]
+        if not buckets:
+            raise ivy.exceptions.IvyException(
+                f"A request of {len(input_ids)} tokens is longer than the "
+                f"longest bucket of {self.bucket_lengths[-1]} tokens."
+            )
+        future = Future()
+        with self._cond:
+            if self._closed:
+                raise ivy.exceptions.IvyException("The batcher is closed.")
+            self._pending[buckets[0]].append(
+                (input_ids, future, time.monotonic() + self.max_delay)
+            )
+            self._cond.notify()
+        return future
+
+    def __call__(self, input_ids):
+        return self.submit(input_ids).result()
+
+    def close(self):
+        """Run the pending requests right away and stop the background thread."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        self._thread.join()
+
+    def _next_batch(self):
+        """
+        Return the bucket length and the requests of the next batch to run, if
+        one is ready, along with the time to wait for the next deadline.
+        """
+        now = time.monotonic()
+        timeout = None
+        # the buckets with the oldest requests go first, so that none starves
+        buckets = sorted(
+            ((length, pending) for length, pending in self._pending.items() if pending),
+            key=lambda bucket: bucket[1][0][2],
+        )
+        for length, pending in buckets:
+            deadline = pending[0][2]
+            full = len(pending) >= self.max_batch_size
+            if full or deadline <= now or self._closed:
+                batch = pending[: self.max_batch_size]
+                del pending[: self.max_batch_size]
+                return length, batch, None
+            wait = deadline - now
+            timeout = wait if timeout is None else min(timeout, wait)
+        return None, None, timeout
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while True:
+                    length, batch, timeout = self._next_batch()
+                    if batch is not None:
+                        break
+                    if self._closed:
+                        return
+                    self._cond.wait(timeout)
+            self._run_batch(length, batch)
+
+    def _run_batch(self, seq_len, batch):
+        input_ids = np.full((len(batch), seq_len), self.pad_token_id, dtype=np.int64)
+        attention_mask = np.zeros((len(batch), seq_len), dtype=np.int64)
+        for i, (tokens, _, _) in enumerate(batch):
+            input_ids[i, : len(tokens)] = tokens
+            attention_mask[i, : len(tokens)] = 1
+        try:
+            outputs = self.fn(ivy.asarray(input_ids), ivy.asarray(attention_mask))
+        except Exception as e:
+            for _, future, _ in batch:
+                future.set_exception(e)
+            return
+        for i, (tokens, future, _) in enumerate(batch):
+            future.set_result(_row(outputs, i, len(tokens), self.sequence_outputs))
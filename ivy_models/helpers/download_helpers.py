@@ -0,0 +1,165 @@
+# global
+import os
+import re
+import json
+import hashlib
+import tempfile
+import threading
+import contextlib
+import urllib.parse
+import urllib.request
+import ivy
+
+# local
+from .weights_cache import get_weights_cache_dir
+
+
+_WEIGHTS_ROOT = os.environ.get("IVY_MODELS_WEIGHTS_ROOT")
+_CHECKSUMS_NAME = "checksums.json"
+# torchvision style file names embed a prefix of the sha256 of the file
+_HASH_REGEX = re.compile(r"-([a-f0-9]{8,64})\.")
+_CHUNK_SIZE = 1024**2
+_CHECKSUMS = {}
+
+
+def set_weights_root(root):
+    """
+    Resolve every pretrained checkpoint by its file name under `root` instead of
+    its original url. `root` can either be a local directory or the url of a
+    mirror serving the files over HTTP. A `checksums.json` file at the root,
+    mapping file names to sha256 digests, is used to verify the checkpoints.
+    """
+    global _WEIGHTS_ROOT
+    _WEIGHTS_ROOT = root
+    _CHECKSUMS.clear()
+
+
+def get_weights_root():
+    return _WEIGHTS_ROOT
+
+
+def _is_url(path):
+    return urllib.parse.urlparse(path).scheme in ("http", "https", "file")
+
+
+def _file_name(url):
+    return os.path.basename(urllib.parse.urlparse(url).path)
+
+
+def _join(root, name):
+    if _is_url(root):
+        return root.rstrip("/") + "/" + name
+    return os.path.join(root, name)
+
+
+def _load_checksums(root):
+    if root not in _CHECKSUMS:
+        location = _join(root, _CHECKSUMS_NAME)
+        try:
+            if _is_url(location):
+                with urllib.request.urlopen(location) as f:
+                    _CHECKSUMS[root] = json.load(f)
+            else:
+                with open(location) as f:
+                    _CHECKSUMS[root] = json.load(f)
+        except (OSError, ValueError):
+            _CHECKSUMS[root] = {}
+    return _CHECKSUMS[root]
+
+
+def _expected_checksum(name):
+    if _WEIGHTS_ROOT is not None:
+        checksum = _load_checksums(_WEIGHTS_ROOT).get(name)
+        if checksum is not None:
+            return checksum
+    match = _HASH_REGEX.search(name)
+    return match.group(1) if match else None
+
+
+def _check_digest(name, digest, expected):
+    if expected is not None and not digest.startswith(expected):
+        raise ivy.exceptions.IvyException(
+            f"Checksum mismatch for {name}: expected {expected}, got {digest}."
+        )
+
+
+def _download(url, path):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    sha = hashlib.sha256()
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f, urllib.request.urlopen(url) as response:
+            for chunk in iter(lambda: response.read(_CHUNK_SIZE), b""):
+                sha.update(chunk)
+                f.write(chunk)
+        name = os.path.basename(path)
+        _check_digest(name, sha.hexdigest(), _expected_checksum(name))
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+
+
+def fetch_weights(url):
+    """
+    Return the local path of the checkpoint published at `url`. With a weights
+    root set the file is looked up by name under the root, otherwise it is
+    downloaded once into the ivy_models cache directory.
+    """
+    name = _file_name(url)
+    if _WEIGHTS_ROOT is not None and not _is_url(_WEIGHTS_ROOT):
+        path = os.path.join(_WEIGHTS_ROOT, name)
+        if not os.path.isfile(path):
+            raise ivy.exceptions.IvyException(
+                f"{name} not found in the weights root {_WEIGHTS_ROOT}."
+            )
+        return path
+    if _WEIGHTS_ROOT is not None:
+        url = _join(_WEIGHTS_ROOT, name)
+    path = os.path.join(get_weights_cache_dir(), "downloads", name)
+    if not os.path.isfile(path):
+        _download(url, path)
+    return path
+
+
+def _hash_file(path, result):
+    sha = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(_CHUNK_SIZE), b""):
+            sha.update(chunk)
+    result.append(sha.hexdigest())
+
+
+@contextlib.contextmanager
+def verify_checksum(path):
+    """
+    Hash `path` on a background thread while the body of the with statement
+    parses it, and raise once the body is done if the checksum doesn't match.
+    """
+    name = os.path.basename(path)
+    expected = _expected_checksum(name)
+    if expected is None:
+        yield
+        return
+    result = []
+    thread = threading.Thread(target=_hash_file, args=(path, result), daemon=True)
+    thread.start()
+    try:
+        yield
+    finally:
+        thread.join()
+    if not result:
+        raise ivy.exceptions.IvyException(f"Failed to compute the checksum of {path}.")
+    _check_digest(name, result[0], expected)
+
+
+def resolve_hf_repo(hf_repo):
+    """
+    Return the local copy of a Hugging Face repo under the weights root if there
+    is one. Remote mirrors of the hub are configured with `HF_ENDPOINT`.
+    """
+    if _WEIGHTS_ROOT is not None and not _is_url(_WEIGHTS_ROOT):
+        path = os.path.join(_WEIGHTS_ROOT, hf_repo)
+        if os.path.isdir(path):
+            return path
+    return hf_repo
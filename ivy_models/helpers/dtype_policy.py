@@ -0,0 +1,70 @@
+# global
+import re
+import numpy as np
+import ivy
+
+
+# batch norm statistics are matched by their `running_mean` sibling instead
+_FP32_NAME_REGEX = re.compile(
+    r"norm|^bn\d*$|^ln(_\d+)?$|pos(ition)?_?emb|embed_positions|class_token",
+    re.IGNORECASE,
+)
+
+
+def _float32_to_bfloat16_bits(x):
+    """Round a float32 numpy array to bfloat16, returned as its uint16 bits."""
+    x = np.ascontiguousarray(x, dtype=np.float32)
+    bits = x.view(np.uint32)
+    # round to nearest even
+    rounded = (bits + 0x7FFF + ((bits >> 16) & 1)) >> 16
+    # rounding would carry the payload of a NaN into its exponent and turn it
+    # into an infinity, NaNs are truncated and kept quiet instead
+    rounded = np.where(np.isnan(x), (bits >> 16) | 0x40, rounded)
+    return rounded.astype(np.uint16)
+
+
+def _bfloat16_bits_to_float32(bits):
+    return (bits.astype(np.uint32) << 16).view(np.float32)
+
+
+def _fp32_key_chains(weights, keep_fp32=True):
+    """
+    Return the key chains of `weights` which should stay in float32. With
+    `keep_fp32=True` these are the normalization parameters and statistics and
+    the position embeddings, a list of regular expressions matched against the
+    key chains can be passed instead, and `False` keeps nothing in float32.
+    """
+    if not keep_fp32:
+        return set()
+    key_chains = list(weights.cont_to_iterator_keys())
+    if keep_fp32 is not True:
+        return {kc for kc in key_chains if any(re.search(p, kc) for p in keep_fp32)}
+    bn_nodes = {
+        kc.rpartition("/")[0]
+        for kc in key_chains
+        if kc.rpartition("/")[2] in ("running_mean", "running_var")
+    }
+    return {
+        kc
+        for kc in key_chains
+        if kc.rpartition("/")[0] in bn_nodes
+        or any(_FP32_NAME_REGEX.search(key) for key in kc.split("/"))
+    }
+
+
+def cast_weights(weights, dtype, keep_fp32=True):
+    """
+    Cast the floating point leaves of `weights` to `dtype`. The accuracy
+    sensitive ones selected by `keep_fp32` (see `_fp32_key_chains`) are cast to
+    float32 instead, so that weights stored in reduced precision get them back
+    in full precision.
+    """
+    fp32_key_chains = _fp32_key_chains(weights, keep_fp32)
+
+    def cast(x, kc):
+        if not ivy.is_float_dtype(x):
+            return x
+        target = "float32" if kc in fp32_key_chains else dtype
+        return x if ivy.dtype(x) == target else ivy.astype(x, target)
+
+    return weights.cont_map(cast)
@@ -0,0 +1,91 @@
+# global
+import hashlib
+import threading
+import numpy as np
+import ivy
+from collections import OrderedDict
+
+
+def _leaves(value):
+    if isinstance(value, (list, tuple)):
+        return [leaf for v in value for leaf in _leaves(v)]
+    return [] if value is None else [value]
+
+
+def _nbytes(value):
+    return sum(
+        int(np.prod(ivy.shape(x))) * ivy.dtype_bits(ivy.dtype(x)) // 8
+        for x in _leaves(value)
+    )
+
+
+class EncoderOutputCache:
+    """
+    A cache of encoder outputs shared across requests, bounded by `max_bytes`.
+
+    Entries are keyed by a hash of the encoder inputs, see `key`, and hold
+    arbitrary nested tuples of arrays, such as the encoder hidden states along
+    with the cross-attention keys and values of every decoder layer, so that a
+    repeated source skips the encoder and the cross-attention projections. The
+    least recently used entries are evicted once the arrays held exceed the
+    budget. The cache is tied to the weights the entries were computed with and
+    must be cleared when they change.
+    """
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    @staticmethod
+    def key(*arrays):
+        """Hash the dtypes, shapes and contents of the given arrays or Nones."""
+        digest = hashlib.sha1()
+        for x in arrays:
+            if x is None:
+                digest.update(b"none")
+                continue
+            x = np.ascontiguousarray(ivy.to_numpy(x))
+            digest.update(f"{x.dtype}{x.shape}".encode())
+            digest.update(x.tobytes())
+        return digest.hexdigest()
+
+    def get(self, key):
+        with self._lock:
+            if key not in self._entries:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return self._entries[key][0]
+
+    def put(self, key, value):
+        """
+        Store `value` under `key`, evicting the least recently used entries to
+        stay within the budget. A value larger than the whole budget isn't
+        stored.
+        """
+        nbytes = _nbytes(value)
+        with self._lock:
+            if key in self._entries:
+                self.nbytes -= self._entries.pop(key)[1]
+            if nbytes > self.max_bytes:
+                return
+            while self._entries and self.nbytes + nbytes > self.max_bytes:
+                self.nbytes -= self._entries.popitem(last=False)[1][1]
+            self._entries[key] = (value, nbytes)
+            self.nbytes += nbytes
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.nbytes = 0
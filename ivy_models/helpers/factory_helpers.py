@@ -0,0 +1,100 @@
+# global
+import inspect
+import functools
+import threading
+import contextlib
+import ivy
+from ivy.stateful import initializers
+
+# local
+from .dtype_policy import cast_weights
+
+
+# the depth of the `skeleton_weights` contexts entered by the current thread
+_skeleton = threading.local()
+_patch_lock = threading.Lock()
+_patched = False
+
+
+def _create_empty_variables(self, var_shape, device=None, *args, dtype=None, **kwargs):
+    return ivy.empty(var_shape, device=device, dtype=dtype)
+
+
+def _initializer_classes():
+    return [
+        cls
+        for cls in vars(initializers).values()
+        if isinstance(cls, type)
+        and issubclass(cls, initializers.Initializer)
+        and "create_variables" in vars(cls)
+    ]
+
+
+def _gated_create_variables(create_variables):
+    @functools.wraps(create_variables)
+    def wrapper(self, *args, **kwargs):
+        if getattr(_skeleton, "depth", 0):
+            return _create_empty_variables(self, *args, **kwargs)
+        return create_variables(self, *args, **kwargs)
+
+    return wrapper
+
+
+def _patch_initializers():
+    # the initializers are wrapped once and for all, the wrappers only skip the
+    # sampling on the threads within `skeleton_weights`
+    global _patched
+    with _patch_lock:
+        if _patched:
+            return
+        for cls in _initializer_classes():
+            cls.create_variables = _gated_create_variables(
+                vars(cls)["create_variables"]
+            )
+        _patched = True
+
+
+@contextlib.contextmanager
+def skeleton_weights():
+    """
+    Build models with uninitialized variables within the context. Every ivy
+    initializer only allocates its variables with the right shape and dtype
+    instead of sampling them, for models whose variables are about to be
+    replaced by pretrained weights anyway. Variables created without an
+    initializer, such as the batch norm statistics, are left untouched. Only
+    the models built by the thread which entered the context are affected.
+    """
+    _patch_initializers()
+    _skeleton.depth = getattr(_skeleton, "depth", 0) + 1
+    try:
+        yield
+    finally:
+        _skeleton.depth -= 1
+
+
+def model_factory(factory):
+    """
+    Decorate a model factory taking a `pretrained` argument.
+
+    With `pretrained=True` the model is built within `skeleton_weights`, as its
+    variables are overwritten by the checkpoint. The factory also gains `dtype`
+    and `keep_fp32` arguments: with `dtype` the weights of the model are kept in
+    that precision in memory, apart from the ones selected by `keep_fp32` (see
+    `cast_weights`) which stay in float32.
+    """
+    signature = inspect.signature(factory)
+
+    @functools.wraps(factory)
+    def wrapper(*args, dtype=None, keep_fp32=True, **kwargs):
+        bound = signature.bind(*args, **kwargs)
+        bound.apply_defaults()
+        if bound.arguments.get("pretrained", False):
+            with skeleton_weights():
+                model = factory(*args, **kwargs)
+        else:
+            model = factory(*args, **kwargs)
+        if dtype is not None:
+            model.v = cast_weights(model.v, dtype, keep_fp32)
+        return model
+
+    return wrapper
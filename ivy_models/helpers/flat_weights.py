@@ -0,0 +1,158 @@
+# global
+import os
+import json
+import mmap
+import struct
+import warnings
+import numpy as np
+import ivy
+
+# local
+from .dtype_policy import _float32_to_bfloat16_bits, _bfloat16_bits_to_float32
+
+
+FLAT_WEIGHTS_NAME = "weights.ivyw"
+_ALIGNMENT = 64
+_METADATA_KEY = "__metadata__"
+_DTYPE_CODES = {
+    "float64": "F64",
+    "float32": "F32",
+    "float16": "F16",
+    "int64": "I64",
+    "int32": "I32",
+    "int16": "I16",
+    "int8": "I8",
+    "uint8": "U8",
+    "bool": "BOOL",
+}
+_CODE_DTYPES = {code: np.dtype(dtype) for dtype, code in _DTYPE_CODES.items()}
+_CODE_DTYPES["BF16"] = np.dtype("uint16")
+
+
+def _align(offset, alignment=_ALIGNMENT):
+    return (offset + alignment - 1) // alignment * alignment
+
+
+def _to_numpy(x):
+    """Return the little-endian numpy array to store for `x` and its dtype code."""
+    if not isinstance(x, np.ndarray) and ivy.dtype(x) == "bfloat16":
+        # numpy has no bfloat16, the raw bits are stored instead
+        x = ivy.to_numpy(ivy.astype(x, "float32"))
+        return _float32_to_bfloat16_bits(x).astype("<u2", copy=False), "BF16"
+    x = x if isinstance(x, np.ndarray) else ivy.to_numpy(x)
+    # `ascontiguousarray` returns 0-d arrays with a single dimension
+    x = np.ascontiguousarray(x).reshape(x.shape)
+    if x.dtype.name not in _DTYPE_CODES:
+        return x, None
+    return x.astype(x.dtype.newbyteorder("<"), copy=False), _DTYPE_CODES[x.dtype.name]
+
+
+def save_flat_weights(weights, path, metadata=None):
+    """
+    Save a container of weights as a single flat file.
+
+    The layout follows safetensors: a little-endian u64 giving the header size,
+    a JSON header mapping every key chain to its dtype, shape and byte offsets,
+    and then one contiguous byte buffer. Unlike safetensors every tensor starts
+    on a 64 byte boundary, so that it can be viewed in place once mapped.
+    bfloat16 tensors are stored as such and read back as float32.
+    """
+    flat = {}
+    header = {}
+    if metadata:
+        header[_METADATA_KEY] = {str(k): str(v) for k, v in metadata.items()}
+    offset = 0
+    for key_chain, x in weights.cont_to_iterator():
+        x, code = _to_numpy(x)
+        if code is None:
+            raise ivy.exceptions.IvyException(
+                f"Can't save {key_chain} with unsupported dtype {x.dtype}"
+            )
+        flat[key_chain] = x
+        offset = _align(offset)
+        header[key_chain] = {
+            "dtype": code,
+            "shape": list(x.shape),
+            "data_offsets": [offset, offset + x.nbytes],
+        }
+        offset += x.nbytes
+
+    header = json.dumps(header, separators=(",", ":")).encode()
+    # pad the header with spaces so that the data buffer starts aligned as well
+    header += b" " * (_align(8 + len(header)) - 8 - len(header))
+
+    with open(path, "wb") as f:
+        f.write(struct.pack("<Q", len(header)))
+        f.write(header)
+        data_start = f.tell()
+        for x in flat.values():
+            f.seek(data_start + _align(f.tell() - data_start))
+            f.write(x.data)
+        f.truncate(data_start + offset)
+
+
+def read_flat_weights_header(path):
+    """Return the parsed JSON header and the byte offset of the data buffer."""
+    with open(path, "rb") as f:
+        (header_size,) = struct.unpack("<Q", f.read(8))
+        header = json.loads(f.read(header_size))
+    return header, 8 + header_size
+
+
+def _view(buffer, data_start, info):
+    dtype = _CODE_DTYPES[info["dtype"]]
+    begin, end = info["data_offsets"]
+    x = np.frombuffer(
+        buffer,
+        dtype=dtype,
+        count=(end - begin) // dtype.itemsize,
+        offset=data_start + begin,
+    )
+    if info["dtype"] == "BF16":
+        # bfloat16 tensors are upcast, which makes them the only copied ones
+        x = _bfloat16_bits_to_float32(x)
+    return x.reshape(info["shape"])
+
+
+def load_flat_weights(path, mmap_weights=True):
+    """
+    Load weights saved with `save_flat_weights`.
+
+    With `mmap_weights` the file is memory-mapped read-only and every leaf of the
+    returned container is a zero-copy numpy view over the mapping, so processes
+    loading the same file share its page-cache pages and a tensor is only read
+    from disk once it is first accessed.
+    """
+    header, data_start = read_flat_weights_header(path)
+    header.pop(_METADATA_KEY, None)
+    with open(path, "rb") as f:
+        if mmap_weights and os.path.getsize(path) > 0:
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        else:
+            buffer = f.read()
+    weights = {}
+    for key_chain, info in header.items():
+        cont = weights
+        splits = key_chain.split("/")
+        for sp in splits[:-1]:
+            cont = cont.setdefault(sp, {})
+        cont[splits[-1]] = _view(buffer, data_start, info)
+    return ivy.Container(weights)
+
+
+def flat_weights_to_backend(weights):
+    """
+    Wrap the leaves returned by `load_flat_weights` in arrays of the current
+    backend without copying them where the backend supports it, so that the
+    arrays remain views over the mapped file. The mapping is read-only, the
+    arrays can't be updated in place.
+    """
+    with warnings.catch_warnings():
+        # torch warns when wrapping a buffer which isn't writeable
+        warnings.simplefilter("ignore", UserWarning)
+        return weights.cont_map(lambda x, kc: ivy.asarray(x, copy=False))
+
+
+def load_flat_weights_metadata(path):
+    header, _ = read_flat_weights_header(path)
+    return header.get(_METADATA_KEY, {})
@@ -0,0 +1,39 @@
+# global
+import ivy
+
+
+def fuse_linear_weights(v, names, fused_name):
+    """
+    Return the weights `v` with the linear layers `names` of every module
+    concatenated, in this order, into a single linear layer `fused_name`, the
+    layout of the attention modules built with fused projections.
+
+    The checkpoints and their mappings keep the separate layers, the weights
+    are loaded with them and fused once, when a model with fused projections is
+    built from them. The fused layer then replaces the separate ones, so that
+    it's the only copy of the weights and the one updated by the optimizers.
+    The modules which are already fused are left as is.
+    """
+    if not isinstance(v, ivy.Container):
+        return v
+    if all(name in v for name in names):
+        layers = [v[name] for name in names]
+        fused = {"w": ivy.concat([layer.w for layer in layers], axis=0)}
+        if all("b" in layer for layer in layers):
+            fused["b"] = ivy.concat([layer.b for layer in layers], axis=0)
+        weights = {k: x for k, x in v.items() if k not in names}
+        weights[fused_name] = ivy.Container(fused)
+        return ivy.Container(weights)
+    return ivy.Container(
+        {k: fuse_linear_weights(x, names, fused_name) for k, x in v.items()}
+    )
+
+
+def linear_slice(x, v, start, end):
+    """
+    Apply the output features `start:end` of the linear layer of weights `v`,
+    such as the key and value projections of a fused query, key and value
+    layer for a cross-attention.
+    """
+    bias = v.b[start:end] if "b" in v else None
+    return ivy.linear(x, v.w[start:end], bias=bias)
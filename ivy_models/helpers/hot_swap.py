@@ -0,0 +1,138 @@
+# global
+import copy
+import threading
+import numpy as np
+import ivy
+from concurrent.futures import ThreadPoolExecutor
+
+# local
+from .dtype_policy import cast_weights
+
+
+def validate_weights(weights, ref):
+    """
+    Check that `weights` has the key chains, shapes and dtypes of `ref`, and
+    raise an `IvyException` listing every mismatch otherwise.
+    """
+    ref_flat = dict(ref.cont_to_iterator())
+    flat = dict(weights.cont_to_iterator())
+    errors = []
+    missing = sorted(set(ref_flat.keys()) - set(flat.keys()))
+    unexpected = sorted(set(flat.keys()) - set(ref_flat.keys()))
+    if missing:
+        errors.append(f"missing key chains {missing}")
+    if unexpected:
+        errors.append(f"unexpected key chains {unexpected}")
+    for kc, x in flat.items():
+        if kc not in ref_flat:
+            continue
+        shape, ref_shape = tuple(ivy.shape(x)), tuple(ivy.shape(ref_flat[kc]))
+        if shape != ref_shape:
+            errors.append(f"{kc} has shape {shape} instead of {ref_shape}")
+        dtype, ref_dtype = str(ivy.dtype(x)), str(ivy.dtype(ref_flat[kc]))
+        if dtype != ref_dtype:
+            errors.append(f"{kc} has dtype {dtype} instead of {ref_dtype}")
+    if errors:
+        raise ivy.exceptions.IvyException("Invalid weights: " + "; ".join(errors) + ".")
+
+
+class HotSwapModel:
+    """
+    Serve a model whose weights can be replaced while it handles requests.
+
+    Every version of the weights is served by its own copy of the model, which
+    shares the structure of the original one but is given its weights once,
+    before being published, and is never modified afterwards. A request reads
+    the published model once and runs its forward without passing `v`, which
+    would rebind the variables of the module tree for the whole call, so
+    concurrent requests and swaps never see each other's weights and in-flight
+    requests finish on the version they started with. New weights are
+    converted and validated before being published by a single reference
+    assignment, either on the calling thread with `swap` or on a background
+    thread with `swap_async`. `close` stops the background thread.
+
+    ivy keeps the array and device modes its functions run with in global
+    state, which concurrent calls would change under each other, so the
+    forwards and the preparation of the weights are run one at a time.
+    """
+
+    def __init__(self, model):
+        self._template = model
+        # (version, model) replaced as a whole, so a request never pairs the
+        # version of one swap with the model of another
+        self._published = (0, model)
+        self._lock = threading.Lock()
+        self._compute_lock = threading.RLock()
+        self._executor = ThreadPoolExecutor(1)
+
+    @property
+    def model(self):
+        return self._published[1]
+
+    @property
+    def weights(self):
+        return self._published[1].v
+
+    @property
+    def version(self):
+        return self._published[0]
+
+    def __call__(self, *args, **kwargs):
+        model = self._published[1]
+        with self._compute_lock:
+            return model(*args, **kwargs)
+
+    def call_with_version(self, *args, **kwargs):
+        """Run a request, returning the version of the weights it used too."""
+        version, model = self._published
+        with self._compute_lock:
+            return model(*args, **kwargs), version
+
+    def prepare(self, weights, dtype=None, keep_fp32=True):
+        """
+        Convert `weights` to arrays of the current backend, cast them with the
+        dtype policy if `dtype` is given, and validate them against the served
+        weights. This is the expensive part of a swap and doesn't affect the
+        requests being served.
+        """
+        with self._compute_lock:
+            weights = weights.cont_map(
+                lambda x, kc: ivy.asarray(x) if isinstance(x, np.ndarray) else x
+            )
+            if dtype is not None:
+                weights = cast_weights(weights, dtype, keep_fp32)
+            if hasattr(self._template, "_tie_weights"):
+                weights = self._template._tie_weights(weights)
+            validate_weights(weights, self.weights)
+        return weights
+
+    def _replica(self, weights):
+        # the arrays of the original model are shared rather than copied, and
+        # replaced by `weights` before the copy serves any request
+        memo = {id(x): x for _, x in self._template.v.cont_to_iterator()}
+        with self._compute_lock:
+            replica = copy.deepcopy(self._template, memo)
+            replica.v = weights
+        return replica
+
+    def swap(self, weights, prepared=False, **kwargs):
+        """Publish new weights, preparing them first unless `prepared`."""
+        if not prepared:
+            weights = self.prepare(weights, **kwargs)
+        replica = self._replica(weights)
+        with self._lock:
+            version = self._published[0] + 1
+            # the requests only ever read this reference, so swapping it is atomic
+            self._published = (version, replica)
+            return version
+
+    def swap_async(self, weights, **kwargs):
+        """
+        Prepare and publish new weights on a background thread, returning a
+        future of the version published.
+        """
+        return self._executor.submit(self.swap, weights, **kwargs)
+
+    def close(self):
+        """Wait for the pending swaps and stop the background thread."""
+        self._executor.shutdown(wait=True)
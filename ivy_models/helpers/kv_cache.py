@@ -0,0 +1,132 @@
+# global
+import ivy
+
+
+def _write(cache, start, x):
+    """
+    Write `x` at positions `start:` of the sequence axis of `cache`, in place
+    where the backend supports it. The arrays of jax and tensorflow are
+    immutable, the updated copy is returned instead and has to be stored back
+    in the cache.
+    """
+    end = start + x.shape[2]
+    if ivy.inplace_arrays_supported():
+        cache[:, :, start:end] = x
+        return cache
+    return ivy.concat([cache[:, :, :start], x, cache[:, :, end:]], axis=2)
+
+
+class StaticKVCacheLayer:
+    """
+    The view of a `StaticKVCache` used by the attention modules of one layer.
+    It can stand in for the `(key, value)` tuple of the layer in
+    `past_key_value`, and also holds the cross-attention keys and values, which
+    are computed once and don't grow.
+    """
+
+    def __init__(self, cache, layer_idx):
+        self.cache = cache
+        self.layer_idx = layer_idx
+        self.cross_key_value = None
+
+    @property
+    def length(self):
+        return self.cache.lengths[self.layer_idx]
+
+    def update(self, key_states, value_states):
+        """
+        Write the keys and values of the new positions, of shape
+        `(batch_size, num_heads, num_new, head_dim)`, after the filled ones and
+        return the keys and values of all the filled positions.
+        """
+        start = self.length
+        end = start + key_states.shape[2]
+        if end > self.cache.max_length:
+            raise ivy.exceptions.IvyException(
+                f"The static cache holds {self.cache.max_length} positions, "
+                f"{end} are needed."
+            )
+        keys = _write(self.cache.keys[self.layer_idx], start, key_states)
+        values = _write(self.cache.values[self.layer_idx], start, value_states)
+        self.cache.keys[self.layer_idx] = keys
+        self.cache.values[self.layer_idx] = values
+        self.cache.lengths[self.layer_idx] = end
+        return keys[:, :, :end], values[:, :, :end]
+
+
+class StaticKVCache:
+    """
+    Self-attention keys and values of every layer, preallocated for
+    `max_length` positions of `batch_size` rows.
+
+    Decoding writes the keys and values of each new token in place at the
+    current position and attends over the filled prefix, instead of
+    concatenating them to the previous ones, which copies the whole cache and
+    allocates a new one at every step of every layer. The backends with
+    immutable arrays, jax and tensorflow, still copy the cache of the layer at
+    every step, see `_write`. Indexing the cache gives
+    the `StaticKVCacheLayer` of a layer, so it can be passed as
+    `past_key_values` in place of the tuples of arrays.
+    """
+
+    def __init__(
+        self,
+        num_layers,
+        batch_size,
+        num_heads,
+        max_length,
+        head_dim,
+        dtype=None,
+        device=None,
+    ):
+        self.max_length = max_length
+        shape = (batch_size, num_heads, max_length, head_dim)
+        self.keys = [
+            ivy.zeros(shape, dtype=dtype, device=device) for _ in range(num_layers)
+        ]
+        self.values = [
+            ivy.zeros(shape, dtype=dtype, device=device) for _ in range(num_layers)
+        ]
+        self.lengths = [0] * num_layers
+        self.layers = [StaticKVCacheLayer(self, i) for i in range(num_layers)]
+
+    def __len__(self):
+        return len(self.layers)
+
+    def __getitem__(self, layer_idx):
+        return self.layers[layer_idx]
+
+    def get_seq_length(self, layer_idx=0):
+        return self.lengths[layer_idx]
+
+    def reorder(self, indices):
+        """
+        Select the rows of the cache given by `indices` along the batch, as beam
+        search does when beams are replaced by the extensions of other beams.
+        The filled positions are gathered and written back, in place where the
+        backend supports it, the cross-attention keys and values are per source
+        and are left untouched.
+        """
+        for i, length in enumerate(self.lengths):
+            for caches in (self.keys, self.values):
+                rows = ivy.gather(caches[i][:, :, :length], indices, axis=0)
+                caches[i] = _write(caches[i], 0, rows)
+
+    def reset(self):
+        """Empty the cache so that it can be reused for a new batch."""
+        self.lengths = [0] * len(self.layers)
+        for layer in self.layers:
+            layer.cross_key_value = None
+
+
+def past_key_values_length(past_key_values):
+    """
+    Return the number of positions held by `past_key_values`, either a
+    `StaticKVCache` or tuples of `(batch_size, num_heads, length, head_dim)`
+    arrays per layer.
+    """
+    if past_key_values is None:
+        return 0
+    if isinstance(past_key_values, StaticKVCache):
+        return past_key_values.get_seq_length()
+    return past_key_values[0][0].shape[2]
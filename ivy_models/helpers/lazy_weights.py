@@ -0,0 +1,182 @@
+# global
+import mmap
+import functools
+import numpy as np
+import ivy
+
+# local
+from .flat_weights import _METADATA_KEY, read_flat_weights_header, _view
+
+
+class _LazyWeightsSource:
+    def __init__(self, path):
+        self.path = path
+        self.header, self.data_start = read_flat_weights_header(path)
+        self.header.pop(_METADATA_KEY, None)
+        with open(path, "rb") as f:
+            self.buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def read(self, info):
+        return _view(self.buffer, self.data_start, info)
+
+
+class LazyWeight:
+    """
+    Placeholder for a single tensor of a flat weights file. The tensor is only
+    read and converted to an array of the current backend on first access.
+    """
+
+    def __init__(self, source, key_chain):
+        self._source = source
+        self._info = source.header[key_chain]
+        self.key_chain = key_chain
+        self._value = None
+
+    @property
+    def shape(self):
+        return tuple(self._info["shape"])
+
+    @property
+    def nbytes(self):
+        begin, end = self._info["data_offsets"]
+        return end - begin
+
+    @property
+    def materialized(self):
+        return self._value is not None
+
+    def materialize(self):
+        if self._value is None:
+            self._value = ivy.asarray(self._source.read(self._info))
+        return self._value
+
+    def __repr__(self):
+        return f"LazyWeight({self.key_chain}, shape={self.shape})"
+
+
+def load_lazy_weights(path):
+    """Return a container of `LazyWeight` placeholders for a flat weights file."""
+    source = _LazyWeightsSource(path)
+    weights = {}
+    for key_chain in source.header.keys():
+        cont = weights
+        splits = key_chain.split("/")
+        for sp in splits[:-1]:
+            cont = cont.setdefault(sp, {})
+        cont[splits[-1]] = LazyWeight(source, key_chain)
+    return ivy.Container(weights)
+
+
+def _iter_modules(obj, _visited=None):
+    _visited = set() if _visited is None else _visited
+    if id(obj) in _visited:
+        return
+    _visited.add(id(obj))
+    if isinstance(obj, ivy.Module):
+        yield obj
+        children = vars(obj).values()
+    elif isinstance(obj, (list, tuple)):
+        children = obj
+    elif isinstance(obj, dict) and not isinstance(obj, ivy.Container):
+        children = obj.values()
+    else:
+        return
+    for child in children:
+        yield from _iter_modules(child, _visited)
+
+
+def _lazy_leaves(weights):
+    # tied weights share a placeholder, which is only counted once
+    leaves = {
+        id(x): x for _, x in weights.cont_to_iterator() if isinstance(x, LazyWeight)
+    }
+    return list(leaves.values())
+
+
+def _materialize_own_weights(v):
+    # only the leaves at the top level of `v` belong to the module, the nested
+    # ones are materialized by the forward of the submodule owning them
+    return ivy.Container(
+        {k: x.materialize() if isinstance(x, LazyWeight) else x for k, x in v.items()},
+        **v.cont_config,
+    )
+
+
+def _swap_materialized_weights(v):
+    return v.cont_map(
+        lambda x, kc: x.materialize()
+        if isinstance(x, LazyWeight) and x.materialized
+        else x
+    )
+
+
+def _lazy_forward(module, forward, *args, **kwargs):
+    if isinstance(module.v, ivy.Container):
+        module.v = _materialize_own_weights(module.v)
+    ret = forward(*args, **kwargs)
+    if getattr(module, "_lazy_weights", None) is not None:
+        # the submodules are called with their variables extracted from those
+        # of the model, which get the values they materialized
+        module.v = _swap_materialized_weights(module.v)
+    return ret
+
+
+def enable_lazy_weights(model, weights=None):
+    """
+    Make every module of `model` materialize its own `LazyWeight` placeholders
+    the first time its `_forward` runs, so that only the parts of the network
+    which are actually used ever get read from disk.
+
+    `weights`, the container returned by `load_lazy_weights`, are bound to the
+    model, which has to be built already. Otherwise the placeholders are those
+    in the variables of the model. The forwards of the model replace the
+    placeholders of its variables with their values, the model keeps track of
+    them for `lazy_weights_stats`.
+    """
+    if weights is not None:
+        if not ivy.Container.cont_identical_structure(
+            [model.v, weights], check_types=False
+        ):
+            raise ivy.exceptions.IvyException(
+                "The lazy weights don't match the variables of the model."
+            )
+        model.v = weights
+    model._lazy_weights = _lazy_leaves(model.v)
+    for module in _iter_modules(model):
+        if getattr(module, "_lazy_weights_enabled", False):
+            continue
+        module._forward = functools.partial(_lazy_forward, module, module._forward)
+        module._lazy_weights_enabled = True
+    return model
+
+
+def materialize_weights(weights):
+    """
+    Materialize all `LazyWeight` leaves of a container, or of the variables of
+    a model passed to `enable_lazy_weights`, which get the values in place.
+    """
+    if isinstance(weights, ivy.Module):
+        weights.v = materialize_weights(weights.v)
+        return weights
+    return weights.cont_map(
+        lambda x, kc: x.materialize() if isinstance(x, LazyWeight) else x
+    )
+
+
+def lazy_weights_stats(weights):
+    """
+    Report how much of a lazily loaded set of weights has been materialized,
+    given the container of placeholders returned by `load_lazy_weights`, or a
+    model passed to `enable_lazy_weights`.
+    """
+    if isinstance(weights, ivy.Module):
+        lazy_weights = getattr(weights, "_lazy_weights", [])
+    else:
+        lazy_weights = _lazy_leaves(weights)
+    materialized = [x for x in lazy_weights if x.materialized]
+    return {
+        "num_tensors": len(lazy_weights),
+        "num_materialized": len(materialized),
+        "total_bytes": int(np.sum([x.nbytes for x in lazy_weights])),
+        "materialized_bytes": int(np.sum([x.nbytes for x in materialized])),
+    }
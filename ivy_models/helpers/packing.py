@@ -0,0 +1,39 @@
+# global
+import numpy as np
+import ivy
+
+
+def unpad_indices(attention_mask):
+    """
+    Return the flat indices of the real tokens of a `(batch_size, seq_len)`
+    attention mask, in row order, and the cumulative sequence lengths of the
+    rows, `cu_seqlens`, as a list of `batch_size + 1` ints such that the tokens
+    of row `i` are at `cu_seqlens[i]:cu_seqlens[i + 1]` once packed.
+    """
+    mask = np.asarray(ivy.to_numpy(attention_mask)).astype(bool)
+    indices = np.flatnonzero(mask)
+    cu_seqlens = [0] + np.cumsum(mask.sum(axis=-1)).tolist()
+    return ivy.asarray(indices, dtype=ivy.int64), cu_seqlens
+
+
+def pack_tokens(x, indices):
+    """
+    Gather the tokens at `indices` of `x`, of shape `(batch_size, seq_len, ...)`,
+    into a single row of shape `(1, num_tokens, ...)`.
+    """
+    flat = ivy.reshape(x, (-1,) + tuple(x.shape[2:]))
+    return ivy.expand_dims(ivy.gather(flat, indices, axis=0), axis=0)
+
+
+def unpack_tokens(x, indices, batch_shape):
+    """
+    Scatter the packed tokens of `x`, of shape `(1, num_tokens, ...)`, back to
+    a zero-padded array of shape `batch_shape + x.shape[2:]`.
+    """
+    rest = tuple(x.shape[2:])
+    flat = ivy.scatter_nd(
+        ivy.expand_dims(indices, axis=-1),
+        x[0],
+        shape=(int(np.prod(batch_shape)),) + rest,
+    )
+    return ivy.reshape(flat, tuple(batch_shape) + rest)
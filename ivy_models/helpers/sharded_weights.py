@@ -0,0 +1,159 @@
+# global
+import os
+import re
+import json
+import numpy as np
+import ivy
+from concurrent.futures import ThreadPoolExecutor
+
+# local
+from .flat_weights import save_flat_weights, load_flat_weights
+from .weights_helpers import _unflatten_set, get_weights_num_workers
+
+
+_SIZE_UNITS = {"B": 1, "KB": 1024, "MB": 1024**2, "GB": 1024**3, "TB": 1024**4}
+
+
+def sharded_weights_index_path(weights_path):
+    return weights_path + ".index.json"
+
+
+def _parse_size(size):
+    if isinstance(size, int):
+        return size
+    match = re.fullmatch(r"\s*([\d.]+)\s*([KMGT]?B)\s*", size.upper())
+    if match is None:
+        raise ivy.exceptions.IvyException(f"Invalid shard size {size}.")
+    return int(float(match.group(1)) * _SIZE_UNITS[match.group(2)])
+
+
+def _nbytes(x):
+    return int(np.prod(ivy.shape(x))) * ivy.dtype_bits(ivy.dtype(x)) // 8
+
+
+def _shard_name(weights_path, idx, num_shards):
+    stem, ext = os.path.splitext(os.path.basename(weights_path))
+    return f"{stem}-{idx + 1:05d}-of-{num_shards:05d}{ext}"
+
+
+def _split_shards(flat, max_shard_size):
+    shards, size = [[]], 0
+    for key_chain, x in flat.items():
+        nbytes = _nbytes(x)
+        if shards[-1] and size + nbytes > max_shard_size:
+            shards.append([])
+            size = 0
+        shards[-1].append(key_chain)
+        size += nbytes
+    return shards
+
+
+def _container_from_key_chains(flat, key_chains):
+    nested = {}
+    for key_chain in key_chains:
+        _unflatten_set(nested, key_chain, flat[key_chain], split_on="/")
+    return ivy.Container(nested)
+
+
+def _save_shard(weights, path, safe_serialization):
+    if safe_serialization:
+        save_flat_weights(weights, path)
+    else:
+        weights.cont_to_disk_as_hdf5(path)
+
+
+def _load_shard(path, safe_serialization):
+    if safe_serialization:
+        return load_flat_weights(path)
+    return ivy.Container.cont_from_disk_as_hdf5(path)
+
+
+def save_sharded_weights(
+    weights, weights_path, max_shard_size, safe_serialization=False, num_workers=None
+):
+    """
+    Save a container of weights as shards of at most `max_shard_size` bytes
+    (an int, or a string such as "2GB") next to `weights_path`, along with an
+    index file mapping every key chain to its shard. The shards are written
+    concurrently. Returns the paths of all the files written, index first.
+    """
+    flat = dict(weights.cont_to_iterator())
+    shards = _split_shards(flat, _parse_size(max_shard_size))
+    names = [_shard_name(weights_path, i, len(shards)) for i in range(len(shards))]
+    directory = os.path.dirname(weights_path)
+    paths = [os.path.join(directory, name) for name in names]
+
+    def save(i):
+        shard = _container_from_key_chains(flat, shards[i])
+        _save_shard(shard, paths[i], safe_serialization)
+
+    with ThreadPoolExecutor(num_workers or get_weights_num_workers()) as executor:
+        list(executor.map(save, range(len(shards))))
+
+    index = {
+        "metadata": {"total_size": sum(_nbytes(x) for x in flat.values())},
+        "weight_map": {
+            key_chain: name
+            for name, key_chains in zip(names, shards)
+            for key_chain in key_chains
+        },
+    }
+    index_path = sharded_weights_index_path(weights_path)
+    with open(index_path, "w") as f:
+        json.dump(index, f, indent=2)
+    return [index_path] + paths
+
+
+def _selected(key_chain, key_chains):
+    return key_chains is None or any(
+        key_chain == kc or key_chain.startswith(kc + "/") for kc in key_chains
+    )
+
+
+def sharded_weights_files(index_path, key_chains=None):
+    """
+    Return the shard file names of an index which hold the weights under
+    `key_chains`, all of them if `key_chains` is None.
+    """
+    with open(index_path) as f:
+        weight_map = json.load(f)["weight_map"]
+    return sorted(
+        {
+            name
+            for key_chain, name in weight_map.items()
+            if _selected(key_chain, key_chains)
+        }
+    )
+
+
+def load_sharded_weights(
+    index_path,
+    key_chains=None,
+    safe_serialization=False,
+    num_workers=None,
+    shard_paths=None,
+):
+    """
+    Load the weights of a sharded checkpoint. With `key_chains` only the weights
+    under those key chains are returned, and only the shards holding them are
+    read. The shards are read concurrently, `shard_paths` optionally maps shard
+    names to local paths when they aren't stored next to the index.
+    """
+    names = sharded_weights_files(index_path, key_chains)
+    directory = os.path.dirname(index_path)
+    shard_paths = shard_paths or {}
+    paths = [shard_paths.get(name, os.path.join(directory, name)) for name in names]
+
+    def load(path):
+        shard = _load_shard(path, safe_serialization)
+        return {
+            key_chain: x
+            for key_chain, x in shard.cont_to_iterator()
+            if _selected(key_chain, key_chains)
+        }
+
+    flat = {}
+    with ThreadPoolExecutor(num_workers or get_weights_num_workers()) as executor:
+        for shard in executor.map(load, paths):
+            flat.update(shard)
+    return _container_from_key_chains(flat, flat.keys())
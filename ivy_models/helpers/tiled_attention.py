@@ -0,0 +1,61 @@
+# global
+import ivy
+
+
+def tiled_attention(
+    query,
+    key,
+    value,
+    attention_mask=None,
+    head_mask=None,
+    tile_size=128,
+    dropout=None,
+):
+    """
+    Attention of `query`, of shape `(..., tgt_len, head_dim)` and already
+    scaled, over `key` and `value`, of shape `(..., src_len, head_dim)`, without
+    materializing the `(..., tgt_len, src_len)` attention weights.
+
+    The keys and values are processed `tile_size` positions at a time with an
+    online softmax: the running maximum and sum of the exponentiated scores of
+    every query are kept, and the partial outputs are rescaled whenever the
+    maximum grows, so that only `(..., tgt_len, tile_size)` scores are alive at
+    once. The result is the one of the dense softmax, up to rounding.
+
+    `attention_mask` is an additive mask broadcastable to the attention weights,
+    `head_mask` multiplies the weights of each head and is broadcastable to
+    `(..., tgt_len, 1)`, and `dropout`, a function such as an `ivy.Dropout`
+    layer, is applied to the weights of each tile, which gives the dropout of
+    the dense weights as they are normalized by the sums before dropout.
+    """
+    src_len = key.shape[-2]
+    dtype, device = query.dtype, ivy.dev(query)
+    shape = tuple(query.shape[:-1]) + (1,)
+    # starting from the lowest finite score rather than -inf, a fully masked
+    # query gets the uniform weights of the dense softmax instead of NaNs
+    row_max = ivy.full(shape, ivy.finfo(dtype).min, dtype=dtype, device=device)
+    row_sum = ivy.zeros(shape, dtype=dtype, device=device)
+    out = ivy.zeros(
+        tuple(query.shape[:-1]) + (value.shape[-1],), dtype=dtype, device=device
+    )
+    for start in range(0, src_len, tile_size):
+        end = min(start + tile_size, src_len)
+        scores = ivy.matmul(query, ivy.swapaxes(key[..., start:end, :], -1, -2))
+        if attention_mask is not None:
+            # a mask which broadcasts over the keys applies to every tile
+            if attention_mask.shape[-1] != 1:
+                scores = scores + attention_mask[..., start:end]
+            else:
+                scores = scores + attention_mask
+        new_max = ivy.maximum(row_max, ivy.max(scores, axis=-1, keepdims=True))
+        weights = ivy.exp(scores - new_max)
+        correction = ivy.exp(row_max - new_max)
+        row_sum = row_sum * correction + ivy.sum(weights, axis=-1, keepdims=True)
+        if dropout is not None:
+            weights = dropout(weights)
+        out = out * correction + ivy.matmul(weights, value[..., start:end, :])
+        row_max = new_max
+    out = out / row_sum
+    if head_mask is not None:
+        out = out * head_mask
+    return out
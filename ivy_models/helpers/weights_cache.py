@@ -0,0 +1,246 @@
+# global
+import os
+import json
+import hashlib
+import inspect
+import tempfile
+import numpy as np
+import ivy
+
+# local
+from .dtype_policy import (
+    _fp32_key_chains,
+    _float32_to_bfloat16_bits,
+    _bfloat16_bits_to_float32,
+)
+
+
+_CACHE_FORMAT_VERSION = 1
+_WEIGHTS_CACHE_DIR = os.environ.get(
+    "IVY_MODELS_CACHE",
+    os.path.join(os.path.expanduser("~"), ".cache", "ivy_models"),
+)
+_WEIGHTS_CACHE_SIZE_LIMIT = int(
+    os.environ.get("IVY_MODELS_CACHE_SIZE_LIMIT", 20 * 1024**3)
+)
+_WEIGHTS_CACHE_DTYPE = os.environ.get("IVY_MODELS_CACHE_DTYPE")
+_STORAGE_KEY = "__storage__"
+
+
+def set_weights_cache_dir(path):
+    """Set the directory in which converted pretrained weights are cached."""
+    global _WEIGHTS_CACHE_DIR
+    _WEIGHTS_CACHE_DIR = path
+
+
+def get_weights_cache_dir():
+    return _WEIGHTS_CACHE_DIR
+
+
+def set_weights_cache_size_limit(num_bytes):
+    """
+    Set the maximum total size of the weights cache in bytes. Least recently
+    used entries are evicted once the limit is exceeded, a limit of 0 disables
+    the cache altogether.
+    """
+    global _WEIGHTS_CACHE_SIZE_LIMIT
+    _WEIGHTS_CACHE_SIZE_LIMIT = int(num_bytes)
+
+
+def get_weights_cache_size_limit():
+    return _WEIGHTS_CACHE_SIZE_LIMIT
+
+
+def set_weights_cache_dtype(dtype):
+    """
+    Store the cached weights as float16 or bfloat16 (None for their own dtype).
+    Normalization parameters, batch norm statistics and position embeddings are
+    kept in float32, and every tensor is cast back to its dtype when loaded.
+    """
+    global _WEIGHTS_CACHE_DTYPE
+    if dtype not in (None, "float16", "bfloat16"):
+        raise ivy.exceptions.IvyException(
+            f"Weights can only be cached as float16 or bfloat16, got {dtype}."
+        )
+    _WEIGHTS_CACHE_DTYPE = dtype
+
+
+def get_weights_cache_dtype():
+    return _WEIGHTS_CACHE_DTYPE
+
+
+def clear_weights_cache():
+    """Remove the cached weights and mapping plans."""
+    for path in _cached_files():
+        os.remove(path)
+
+
+def _weights_cache_enabled():
+    return _WEIGHTS_CACHE_SIZE_LIMIT > 0
+
+
+def _weights_dir():
+    path = os.path.join(_WEIGHTS_CACHE_DIR, "weights")
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def _cached_files():
+    """Return the paths of the cached weights and of the cached mapping plans."""
+    paths = []
+    for subdir, ext in (("weights", ".npz"), ("plans", ".json")):
+        path = os.path.join(_WEIGHTS_CACHE_DIR, subdir)
+        if os.path.isdir(path):
+            paths += [
+                os.path.join(path, name)
+                for name in os.listdir(path)
+                if name.endswith(ext)
+            ]
+    return paths
+
+
+def _hash_file(path, chunk_size=1024**2):
+    sha = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            sha.update(chunk)
+    return sha.hexdigest()
+
+
+def _hash_callable(fn):
+    if fn is None:
+        return None
+    try:
+        source = inspect.getsource(fn)
+    except (OSError, TypeError):
+        source = ""
+    name = getattr(fn, "__module__", "") + "." + getattr(fn, "__qualname__", repr(fn))
+    return name + ":" + hashlib.sha256(source.encode()).hexdigest()
+
+
+def _ref_spec(ref):
+    return [
+        [kc, list(ivy.shape(x)), str(ivy.dtype(x))] for kc, x in ref.cont_to_iterator()
+    ]
+
+
+def _weights_cache_key(source, ref_model, custom_mapping=None, **kwargs):
+    """
+    Build the content address of a converted checkpoint. The key covers the
+    checkpoint itself (its url, or its content hash for local files), the mapping
+    function, any extra loader arguments such as the prune lists, and the key
+    chains, shapes and dtypes of the target model's variables.
+    """
+    if os.path.isfile(source):
+        source = "sha256:" + _hash_file(source)
+    key = {
+        "version": _CACHE_FORMAT_VERSION,
+        "source": source,
+        "custom_mapping": _hash_callable(custom_mapping),
+        "kwargs": kwargs,
+        "storage_dtype": _WEIGHTS_CACHE_DTYPE,
+        "ref": _ref_spec(ref_model.v),
+    }
+    key = json.dumps(key, sort_keys=True, default=repr)
+    return hashlib.sha256(key.encode()).hexdigest()
+
+
+def _mapping_plan_key(raw_keys, ref, custom_mapping=None):
+    key = {
+        "version": _CACHE_FORMAT_VERSION,
+        "raw": sorted(raw_keys),
+        "custom_mapping": _hash_callable(custom_mapping),
+        "ref": _ref_spec(ref),
+    }
+    key = json.dumps(key, sort_keys=True)
+    return hashlib.sha256(key.encode()).hexdigest()
+
+
+def _load_mapping_plan(key):
+    path = os.path.join(_WEIGHTS_CACHE_DIR, "plans", key + ".json")
+    if not _weights_cache_enabled() or not os.path.isfile(path):
+        return None
+    with open(path) as f:
+        plan = json.load(f)
+    os.utime(path)
+    return plan
+
+
+def _save_mapping_plan(key, plan):
+    if not _weights_cache_enabled():
+        return
+    plans_dir = os.path.join(_WEIGHTS_CACHE_DIR, "plans")
+    os.makedirs(plans_dir, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=plans_dir, suffix=".tmp")
+    with os.fdopen(fd, "w") as f:
+        json.dump(plan, f)
+    os.replace(tmp_path, os.path.join(plans_dir, key + ".json"))
+    _evict_weights_cache()
+
+
+def _load_cached_weights(key):
+    """Return the flat dict of cached numpy arrays for `key`, or None on a miss."""
+    path = os.path.join(_WEIGHTS_CACHE_DIR, "weights", key + ".npz")
+    if not os.path.isfile(path):
+        return None
+    try:
+        with np.load(path) as data:
+            flat = {kc: data[kc] for kc in data.files}
+    except (OSError, ValueError):
+        os.remove(path)
+        return None
+    if _STORAGE_KEY in flat:
+        storage = json.loads(str(flat.pop(_STORAGE_KEY)))
+        for kc, dtype in storage["key_chains"].items():
+            x = flat[kc]
+            if storage["dtype"] == "bfloat16":
+                x = _bfloat16_bits_to_float32(x)
+            flat[kc] = x.astype(dtype, copy=False)
+    # refresh the entry so that it is the most recently used one
+    os.utime(path)
+    return flat
+
+
+def _to_storage(weights, flat, dtype):
+    fp32_key_chains = _fp32_key_chains(weights)
+    stored = {}
+    for kc, x in flat.items():
+        if x.dtype.kind != "f" or x.dtype.itemsize <= 2 or kc in fp32_key_chains:
+            continue
+        stored[kc] = x.dtype.name
+        if dtype == "bfloat16":
+            flat[kc] = _float32_to_bfloat16_bits(x)
+        else:
+            flat[kc] = x.astype(np.float16)
+    flat[_STORAGE_KEY] = np.array(json.dumps({"dtype": dtype, "key_chains": stored}))
+    return flat
+
+
+def _save_cached_weights(key, weights):
+    flat = {kc: ivy.to_numpy(x) for kc, x in weights.cont_to_iterator()}
+    if _WEIGHTS_CACHE_DTYPE is not None:
+        flat = _to_storage(weights, flat, _WEIGHTS_CACHE_DTYPE)
+    cache_dir = _weights_dir()
+    fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            np.savez(f, **flat)
+        os.replace(tmp_path, os.path.join(cache_dir, key + ".npz"))
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+    _evict_weights_cache()
+
+
+def _evict_weights_cache():
+    # the weights and the plans are evicted together, least recently used first
+    entries = []
+    for path in _cached_files():
+        stat = os.stat(path)
+        entries.append((stat.st_mtime, stat.st_size, path))
+    total_size = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total_size <= _WEIGHTS_CACHE_SIZE_LIMIT:
+            break
+        os.remove(path)
+        total_size -= size
@@ -1,9 +1,34 @@
 # global
 import ivy
-import torch
-import urllib
 import os
-import copy
+import json
+import heapq
+import functools
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+from .download_helpers import fetch_weights, verify_checksum, resolve_hf_repo
+from .weights_cache import (
+    _weights_cache_enabled,
+    _weights_cache_key,
+    _load_cached_weights,
+    _save_cached_weights,
+    _mapping_plan_key,
+    _load_mapping_plan,
+    _save_mapping_plan,
+)
+
+_MAPPING_PLANS = {}
+_NUM_WORKERS = int(os.environ.get("IVY_MODELS_NUM_WORKERS", os.cpu_count() or 1))
+
+
+def set_weights_num_workers(num_workers):
+    """Set the default number of threads used to convert checkpoint tensors."""
+    global _NUM_WORKERS
+    _NUM_WORKERS = max(int(num_workers), 1)
+
+
+def get_weights_num_workers():
+    return _NUM_WORKERS
 
 
 def _prune_keys(raw, ref, raw_keys_to_prune=[], ref_keys_to_prune=[]):
@@ -29,6 +54,151 @@ def _map_weights(raw, ref, custom_mapping=None):
     return mapping
 
 
+def _compile_mapping_plan(raw, ref, custom_mapping=None):
+    """
+    Turn the key mapping into a serializable plan: one entry per tensor giving
+    its source key chain, target key chain and einops pattern. The tensors keep
+    the dtype they have in the checkpoint.
+    """
+    plan = []
+    for old_key, new_mapping in _map_weights(raw, ref, custom_mapping).items():
+        entry = {"source": old_key, "target": new_mapping, "pattern": None}
+        if isinstance(new_mapping, dict):
+            entry["target"] = new_mapping["key_chain"]
+            entry["pattern"] = new_mapping.get("pattern")
+        plan.append(entry)
+    return plan
+
+
+def _mapping_plan(raw, ref, custom_mapping=None):
+    """
+    Return the mapping plan for this checkpoint layout, target model and mapping
+    function, compiling it only the first time it is requested and caching it
+    both in memory and on disk.
+    """
+    key = _mapping_plan_key(list(raw.cont_to_iterator_keys()), ref, custom_mapping)
+    plan = _MAPPING_PLANS.get(key)
+    if plan is None:
+        plan = _load_mapping_plan(key)
+        if plan is None:
+            plan = _compile_mapping_plan(raw, ref, custom_mapping)
+            _save_mapping_plan(key, plan)
+        _MAPPING_PLANS[key] = plan
+    return plan
+
+
+def _as_numpy(x):
+    return x if isinstance(x, np.ndarray) else ivy.to_numpy(x)
+
+
+def _torch_to_numpy(x):
+    """Return zero-copy numpy views of the cpu tensors of a (nested) state dict."""
+    import torch
+
+    if isinstance(x, dict):
+        return {k: _torch_to_numpy(v) for k, v in x.items()}
+    if not isinstance(x, torch.Tensor):
+        return x
+    x = x.detach().cpu()
+    # numpy has no bfloat16
+    return (x.float() if x.dtype == torch.bfloat16 else x).numpy()
+
+
+def _to_backend(x):
+    # adopt the numpy buffer through DLPack where the backend supports it, the
+    # buffer then backs the array of the backend without a copy
+    if (
+        ivy.current_backend_str() != "numpy"
+        and x.flags.writeable
+        and "cpu" in str(ivy.default_device())
+    ):
+        try:
+            return ivy.to_ivy(ivy.from_dlpack(x))
+        except (BufferError, TypeError, RuntimeError, ivy.exceptions.IvyException):
+            pass
+    return ivy.asarray(x)
+
+
+@functools.lru_cache(maxsize=None)
+def _compile_pattern(pattern):
+    # plain permutations with optional singleton axes are done with numpy
+    # directly, anything else falls back to einops
+    src, dst = (side.split() for side in pattern.split("->"))
+    src_names = [t for t in src if t != "1"]
+    dst_names = [t for t in dst if t != "1"]
+    if (
+        not all(t.isidentifier() for t in src_names + dst_names)
+        or len(set(src_names)) != len(src_names)
+        or sorted(src_names) != sorted(dst_names)
+    ):
+        return None
+    squeeze = tuple(i for i, t in enumerate(src) if t == "1")
+    axes = tuple(src_names.index(t) for t in dst_names)
+    expand = tuple(i for i, t in enumerate(dst) if t == "1")
+    return squeeze, axes, expand
+
+
+def _rearrange(x, pattern):
+    compiled = _compile_pattern(pattern)
+    if compiled is None:
+        return ivy.to_numpy(ivy.einops_rearrange(x, pattern))
+    squeeze, axes, expand = compiled
+    if squeeze:
+        x = np.squeeze(x, squeeze)
+    x = np.transpose(x, axes)
+    if expand:
+        x = np.expand_dims(x, expand)
+    return x
+
+
+def _balanced_chunks(sizes, num_chunks):
+    """Split the indices of `sizes` into chunks of roughly equal total size."""
+    chunks = [[] for _ in range(num_chunks)]
+    loads = [(0, i) for i in range(num_chunks)]
+    for idx in sorted(range(len(sizes)), key=lambda i: -sizes[i]):
+        load, chunk = heapq.heappop(loads)
+        chunks[chunk].append(idx)
+        heapq.heappush(loads, (load + sizes[idx], chunk))
+    return [chunk for chunk in chunks if chunk]
+
+
+def _convert_tensor(x, pattern=None):
+    x = _as_numpy(x)
+    if pattern is not None:
+        x = _rearrange(x, pattern)
+    return _to_backend(np.ascontiguousarray(x))
+
+
+def _convert_tensors(tasks, num_workers=None):
+    """
+    Rearrange and convert a list of `(key_chain, array, pattern)` tasks to arrays
+    of the current backend. The tasks are split into size-balanced chunks which
+    are converted concurrently, numpy releases the GIL while copying.
+    """
+    num_workers = min(num_workers or _NUM_WORKERS, len(tasks))
+    if num_workers <= 1:
+        return [(kc, _convert_tensor(x, pattern)) for kc, x, pattern in tasks]
+
+    def convert_chunk(chunk):
+        return [(tasks[i][0], _convert_tensor(*tasks[i][1:])) for i in chunk]
+
+    sizes = [int(np.prod(ivy.shape(x))) for _, x, _ in tasks]
+    with ThreadPoolExecutor(num_workers) as executor:
+        chunks = executor.map(convert_chunk, _balanced_chunks(sizes, num_workers))
+        return [converted for chunk in chunks for converted in chunk]
+
+
+def _apply_mapping_plan(raw_flat, plan, num_workers=None):
+    """Build the nested target weights from a flat dict of source arrays."""
+    tasks = [
+        (entry["target"], raw_flat[entry["source"]], entry["pattern"]) for entry in plan
+    ]
+    nested = {}
+    for key_chain, x in _convert_tensors(tasks, num_workers):
+        _unflatten_set(nested, key_chain, x, split_on="/")
+    return ivy.Container(nested)
+
+
 def _rename_weights(raw, ref, rename_dict={}):
     renamed_ref = []
     for raw_key, ref_key in rename_dict.items():
@@ -92,24 +262,38 @@ def load_jax_weights(
     ref_keys_to_prune=[],
     special_rename={},
     with_mha=False,
+    use_cache=True,
+    num_workers=None,
 ):
     import pickle
 
-    ivy_jax = ivy.with_backend("jax")
-    # todo: refactor this into a url load helper
-    urllib.request.urlretrieve(url, filename="jax_weights.pystate")
-    with open("jax_weights.pystate", "rb") as f:
-        weights = pickle.loads(f.read())
-    os.remove("jax_weights.pystate")
+    cache_key = None
+    if use_cache and _weights_cache_enabled():
+        cache_key = _weights_cache_key(
+            url,
+            ref_model,
+            custom_mapping=custom_mapping,
+            raw_keys_to_prune=raw_keys_to_prune,
+            ref_keys_to_prune=ref_keys_to_prune,
+            special_rename=special_rename,
+            with_mha=with_mha,
+        )
+        w_cached = _load_cached_weights(cache_key)
+        if w_cached is not None:
+            return _container_from_flat(w_cached, num_workers=num_workers)
+
+    path = fetch_weights(url)
+    with verify_checksum(path), open(path, "rb") as f:
+        # unpickle straight from the file instead of reading all its bytes first
+        weights = pickle.load(f)
 
     try:
         weights = {**weights["params"], **weights["state"]}
     except KeyError:
         pass
 
-    weights_raw = ivy.Container(
-        ivy_jax.to_numpy(ivy_jax.Container(weights)).cont_to_dict()
-    )
+    # np.asarray is a view of the cpu buffers of jax arrays and numpy leaves
+    weights_raw = ivy.Container(weights).cont_map(lambda x, kc: np.asarray(x))
     weights_ref = ref_model.v
 
     if raw_keys_to_prune or ref_keys_to_prune:
@@ -122,14 +306,22 @@ def load_jax_weights(
         )
     if with_mha:
         weights_raw = _with_mha(weights_raw)
-    mapping = _map_weights(weights_raw, weights_ref, custom_mapping=custom_mapping)
-
-    w_clean = weights_raw.cont_restructure(mapping, keep_orig=False)
+    plan = _mapping_plan(weights_raw, weights_ref, custom_mapping=custom_mapping)
+    w_clean = _apply_mapping_plan(
+        dict(weights_raw.cont_to_iterator()), plan, num_workers=num_workers
+    )
     if ref_keys_to_prune:
         w_clean = ivy.Container.cont_combine(w_clean, pruned_ref)
     if special_rename:
+        # the renamed subtrees bypass the mapping plan and still hold the numpy
+        # arrays of the checkpoint
+        renamed_ref = [
+            ref.cont_map(lambda x, kc: _to_backend(x)) for ref in renamed_ref
+        ]
         w_clean = ivy.Container.cont_combine(w_clean, *renamed_ref)
-    return ivy.asarray(w_clean)
+    if cache_key is not None:
+        _save_cached_weights(cache_key, w_clean)
+    return w_clean
 
 
 def load_torch_weights(
@@ -138,21 +330,39 @@ def load_torch_weights(
     raw_keys_to_prune=[],
     ref_keys_to_prune=[],
     custom_mapping=None,
-    map_location=torch.device("cpu"),
+    map_location="cpu",
+    use_cache=True,
+    num_workers=None,
 ):
-    ivy_torch = ivy.with_backend("torch")
-    weights = torch.hub.load_state_dict_from_url(url, map_location=map_location)
-    weights_raw = ivy.Container(
-        ivy_torch.to_numpy(ivy_torch.Container(weights)).cont_to_dict()
-    )
+    cache_key = None
+    if use_cache and _weights_cache_enabled():
+        cache_key = _weights_cache_key(
+            url,
+            ref_model,
+            custom_mapping=custom_mapping,
+            raw_keys_to_prune=raw_keys_to_prune,
+            ref_keys_to_prune=ref_keys_to_prune,
+        )
+        w_cached = _load_cached_weights(cache_key)
+        if w_cached is not None:
+            return _container_from_flat(w_cached, num_workers=num_workers)
+
+    path = fetch_weights(url)
+    with verify_checksum(path):
+        weights = _load_torch_state_dict(path, map_location=map_location)
+    weights_raw = ivy.Container(_torch_to_numpy(weights))
     weights_raw, weights_ref, pruned_ref = _prune_keys(
         weights_raw, ref_model.v, raw_keys_to_prune, ref_keys_to_prune
     )
-    mapping = _map_weights(weights_raw, weights_ref, custom_mapping=custom_mapping)
-    w_clean = weights_raw.cont_restructure(mapping, keep_orig=False)
+    plan = _mapping_plan(weights_raw, weights_ref, custom_mapping=custom_mapping)
+    w_clean = _apply_mapping_plan(
+        dict(weights_raw.cont_to_iterator()), plan, num_workers=num_workers
+    )
     if ref_keys_to_prune:
         w_clean = ivy.Container.cont_combine(w_clean, pruned_ref)
-    return ivy.asarray(w_clean)
+    if cache_key is not None:
+        _save_cached_weights(cache_key, w_clean)
+    return w_clean
 
 
 def _unflatten_set(container, name, to_set, split_on="__"):
@@ -163,20 +373,142 @@ def _unflatten_set(container, name, to_set, split_on="__"):
     cont[splits[-1]] = to_set
 
 
-def load_transformers_weights(hf_repo, model, map_fn, split_on="__"):
-    from transformers import AutoModel
+def _container_from_flat(flat, split_on="/", num_workers=None):
+    tasks = [(key_chain, x, None) for key_chain, x in flat.items()]
+    nested = {}
+    for key_chain, x in _convert_tensors(tasks, num_workers):
+        _unflatten_set(nested, key_chain, x, split_on)
+    return ivy.Container(nested)
 
-    base = AutoModel.from_pretrained(hf_repo)
-    ref_weights = base.state_dict()
-    ivy_torch = ivy.with_backend("torch")
-    ref_weights = ivy.Container(
-        ivy_torch.to_numpy(ivy_torch.Container(ref_weights)).cont_to_dict()
-    )
-    old_mapping = copy.deepcopy(model.v)
-    param_names = old_mapping.cont_flatten_key_chains().keys()
-    mapping_list = map(lambda x: map_fn(x), param_names)
-    mapping = dict(zip(param_names, mapping_list))
-    for old_name, ref_name in mapping.items():
-        to_set = ivy.asarray(ref_weights[ref_name])
-        _unflatten_set(old_mapping, old_name, to_set, split_on)
-    return old_mapping
+
+_HF_WEIGHTS_FILES = [
+    ("model.safetensors.index.json", "model.safetensors"),
+    ("pytorch_model.bin.index.json", "pytorch_model.bin"),
+]
+
+
+def _hf_file(hf_repo, filename):
+    if os.path.isdir(hf_repo):
+        path = os.path.join(hf_repo, filename)
+        return path if os.path.isfile(path) else None
+    from huggingface_hub import hf_hub_download
+    from huggingface_hub.utils import EntryNotFoundError
+
+    try:
+        return hf_hub_download(repo_id=hf_repo, filename=filename)
+    except EntryNotFoundError:
+        return None
+
+
+def _hf_checkpoint_shards(hf_repo):
+    """
+    Return a dict mapping every tensor name of a Hugging Face checkpoint to the
+    local file holding it, preferring safetensors and following sharded index
+    files. Only the files are fetched, no model is instantiated.
+    """
+    hf_repo = resolve_hf_repo(hf_repo)
+    for index_name, weights_name in _HF_WEIGHTS_FILES:
+        index_path = _hf_file(hf_repo, index_name)
+        if index_path is not None:
+            with open(index_path) as f:
+                weight_map = json.load(f)["weight_map"]
+            shards = {
+                shard: _hf_file(hf_repo, shard) for shard in set(weight_map.values())
+            }
+            return {name: shards[shard] for name, shard in weight_map.items()}
+        weights_path = _hf_file(hf_repo, weights_name)
+        if weights_path is not None:
+            return {name: weights_path for name in _hf_shard_keys(weights_path)}
+    raise ivy.exceptions.IvyException(f"No pytorch checkpoint found for {hf_repo}.")
+
+
+def _load_torch_state_dict(path, map_location="cpu"):
+    import torch
+
+    try:
+        # memory-map the file so that only the tensors which are read get paged in
+        return torch.load(path, map_location=map_location, mmap=True, weights_only=True)
+    except (TypeError, RuntimeError):
+        return torch.load(path, map_location=map_location)
+
+
+def _hf_shard_keys(path):
+    if path.endswith(".safetensors"):
+        from safetensors import safe_open
+
+        with safe_open(path, framework="np") as f:
+            return list(f.keys())
+    return list(_load_torch_state_dict(path).keys())
+
+
+def _read_hf_shard(path, names):
+    """Yield (name, numpy array) pairs for `names`, reading one tensor at a time."""
+    if path.endswith(".safetensors"):
+        from safetensors import safe_open
+
+        with safe_open(path, framework="np") as f:
+            for name in names:
+                yield name, f.get_tensor(name)
+    else:
+        state_dict = _load_torch_state_dict(path)
+        for name in names:
+            yield name, _torch_to_numpy(state_dict.pop(name))
+
+
+def _normalize_hf_key(name):
+    # old checkpoints name the LayerNorm parameters gamma and beta
+    return name.replace(".gamma", ".weight").replace(".beta", ".bias")
+
+
+def _resolve_hf_keys(ref_names, checkpoint_keys):
+    """
+    Match the mapped names of the target model to the checkpoint keys, which can
+    be prefixed with the base model name (e.g. `bert.`) when the checkpoint was
+    saved from a model with a task specific head.
+    """
+    lookup = {}
+    for key in checkpoint_keys:
+        lookup.setdefault(_normalize_hf_key(key), key)
+    # the names without their prefix never shadow a name of the checkpoint
+    for name, key in list(lookup.items()):
+        lookup.setdefault(name.split(".", 1)[-1], key)
+    missing = [name for name in ref_names if name not in lookup]
+    if missing:
+        raise ivy.exceptions.IvyException(
+            f"Weights missing from the checkpoint: {missing}"
+        )
+    return {name: lookup[name] for name in ref_names}
+
+
+def load_transformers_weights(hf_repo, model, map_fn, split_on="__", num_workers=None):
+    """
+    Load the weights of a Hugging Face checkpoint into the variable structure of
+    `model`. The `.safetensors` or `.bin` files (sharded or not) are read tensor
+    by tensor, one shard at a time, and `map_fn` maps every flattened key chain
+    of `model.v` to its checkpoint name.
+    """
+    ref_shapes = {
+        kc.replace("/", split_on): tuple(ivy.shape(x))
+        for kc, x in model.v.cont_to_iterator()
+    }
+    mapping = {map_fn(name): name for name in ref_shapes.keys()}
+    shards = _hf_checkpoint_shards(hf_repo)
+    checkpoint_keys = _resolve_hf_keys(mapping.keys(), shards.keys())
+
+    by_shard = {}
+    for ref_name, key in checkpoint_keys.items():
+        by_shard.setdefault(shards[key], {})[key] = mapping[ref_name]
+    weights = {}
+    for path, keys in by_shard.items():
+        tasks = []
+        for key, x in _read_hf_shard(path, list(keys.keys())):
+            name = keys[key]
+            if tuple(x.shape) != ref_shapes[name]:
+                raise ivy.exceptions.IvyException(
+                    f"Shape mismatch for {name}: expected {ref_shapes[name]}, "
+                    f"got {tuple(x.shape)} from {key}."
+                )
+            tasks.append((name, x, None))
+        for name, to_set in _convert_tensors(tasks, num_workers):
+            _unflatten_set(weights, name, to_set, split_on)
+    return ivy.Container(weights)
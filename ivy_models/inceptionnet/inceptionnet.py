@@ -13,6 +13,7 @@ from ivy_models.inceptionnet.layers import (
     InceptionE,
 )
 from ivy_models.base import BaseSpec, BaseModel
+from ivy_models.helpers import model_factory
 from typing import List
 
 
@@ -198,6 +199,7 @@ def _inceptionNet_v3_torch_weights_mapping(old_key, new_key):
     return new_key
 
 
+@model_factory
 def inceptionNet_v3(
     pretrained=True, training=False, num_classes=1000, dropout=0.5, data_format="NHWC"
 ):
@@ -1,5 +1,6 @@
 import ivy
 from ivy_models.base import BaseSpec, BaseModel
+from ivy_models.helpers import model_factory
 
 
 class MLPMixerSpec(BaseSpec):
@@ -137,6 +138,7 @@ class MLPMixer(BaseModel):
         return probs
 
 
+@model_factory
 def mlpmixer(
     pretrained=True,
     vol=72,
@@ -6,6 +6,7 @@ import ivy
 import ivy_models
 from ivy_models.resnet.layers import conv1x1, BasicBlock, Bottleneck
 from ivy_models.base import BaseSpec, BaseModel
+from ivy_models.helpers import model_factory
 
 
 class ResNetSpec(BaseSpec):
@@ -171,6 +172,7 @@ def _resnet_torch_weights_mapping(old_key, new_key):
     return new_mapping
 
 
+@model_factory
 def resnet_18(pretrained=True):
     """ResNet-18 model"""
     model = ResNet(BasicBlock, [2, 2, 2, 2])
@@ -186,6 +188,7 @@ def resnet_18(pretrained=True):
     return model
 
 
+@model_factory
 def resnet_34(pretrained=True):
     """ResNet-34 model"""
     model = ResNet(BasicBlock, [3, 4, 6, 3])
@@ -201,6 +204,7 @@ def resnet_34(pretrained=True):
     return model
 
 
+@model_factory
 def resnet_50(pretrained=True):
     """ResNet-50 model"""
     model = ResNet(Bottleneck, [3, 4, 6, 3])
@@ -216,6 +220,7 @@ def resnet_50(pretrained=True):
     return model
 
 
+@model_factory
 def resnet_101(pretrained=True):
     """ResNet-101 model"""
     model = ResNet(Bottleneck, [3, 4, 23, 3])
@@ -231,6 +236,7 @@ def resnet_101(pretrained=True):
     return model
 
 
+@model_factory
 def resnet_152(pretrained=True):
     """ResNet-152 model"""
     model = ResNet(Bottleneck, [3, 8, 36, 3])
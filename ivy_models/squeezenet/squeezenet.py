@@ -1,4 +1,4 @@
-from ivy_models.helpers import load_torch_weights
+from ivy_models.helpers import load_torch_weights, model_factory
 import ivy
 from ivy_models.base import BaseSpec, BaseModel
 
@@ -152,6 +152,7 @@ def _squeezenet_torch_weights_mapping(old_key, new_key):
     return new_mapping
 
 
+@model_factory
 def squeezenet1_0(
     num_classes: int = 1000,
     dropout: float = 0.5,
@@ -172,6 +173,7 @@ def squeezenet1_0(
     return model
 
 
+@model_factory
 def squeezenet1_1(
     num_classes: int = 1000,
     dropout: float = 0.5,
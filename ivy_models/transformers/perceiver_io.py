@@ -10,6 +10,7 @@ from ivy_models.transformers.helpers import (
     FeedForward,
     _perceiver_jax_weights_mapping,
 )
+from ivy_models.helpers import model_factory
 
 
 # Specification class #
@@ -305,6 +306,7 @@ class PerceiverIO(ivy.Module):
         return ret_flat[0]
 
 
+@model_factory
 def perceiver_io_img_classification(spec, pretrained=True):
     if not pretrained:
         return PerceiverIO(spec)
@@ -3,7 +3,7 @@ from ivy_models.unet.layers import UNetDoubleConv, UNetDown, UNetOutConv, UNetUp
 
 import builtins
 import re
-from ivy_models.helpers import load_torch_weights
+from ivy_models.helpers import load_torch_weights, model_factory
 from ivy_models.base import BaseSpec, BaseModel
 
 
@@ -77,6 +77,7 @@ def _unet_torch_weights_mapping(old_key, new_key):
     return new_mapping
 
 
+@model_factory
 def unet_carvana(n_channels=3, n_classes=2, v=None, pretrained=True):
     model = UNET(n_channels=3, n_classes=2)
     if pretrained:
@@ -1,6 +1,7 @@
 import ivy
 import ivy_models
 from ivy_models.base import BaseSpec, BaseModel
+from ivy_models.helpers import model_factory
 
 
 def vgg_conv_block(inp_channels, out_channels, with_bn=False):
@@ -103,6 +104,7 @@ def _vgg_torch_weights_mapping(old_key, new_key):
     return new_mapping
 
 
+@model_factory
 def vgg11(pretrained=True, data_format="NHWC"):
     """VGG11 model"""
     model = VGG([1, 1, 2, 2, 2], False)
@@ -115,6 +117,7 @@ def vgg11(pretrained=True, data_format="NHWC"):
     return model
 
 
+@model_factory
 def vgg11_bn(pretrained=True, data_format="NHWC"):
     """VGG11 model with BatchNorm2D"""
     model = VGG([1, 1, 2, 2, 2], True)
@@ -127,6 +130,7 @@ def vgg11_bn(pretrained=True, data_format="NHWC"):
     return model
 
 
+@model_factory
 def vgg13(pretrained=True, data_format="NHWC"):
     """VGG13 model"""
     model = VGG([2, 2, 2, 2, 2], False)
@@ -139,6 +143,7 @@ def vgg13(pretrained=True, data_format="NHWC"):
     return model
 
 
+@model_factory
 def vgg13_bn(pretrained=True, data_format="NHWC"):
     """VGG13 model with BatchNorm2D"""
     model = VGG([2, 2, 2, 2, 2], True)
@@ -151,6 +156,7 @@ def vgg13_bn(pretrained=True, data_format="NHWC"):
     return model
 
 
+@model_factory
 def vgg16(pretrained=True, data_format="NHWC"):
     """VGG16 model"""
     model = VGG([2, 2, 3, 3, 3], False)
@@ -163,6 +169,7 @@ def vgg16(pretrained=True, data_format="NHWC"):
     return model
 
 
+@model_factory
 def vgg16_bn(pretrained=True, data_format="NHWC"):
     """VGG16 model with BatchNorm2D"""
     model = VGG([2, 2, 3, 3, 3], True)
@@ -175,6 +182,7 @@ def vgg16_bn(pretrained=True, data_format="NHWC"):
     return model
 
 
+@model_factory
 def vgg19(pretrained=True, data_format="NHWC"):
     """VGG19 model"""
     model = VGG([2, 2, 4, 4, 4], False)
@@ -187,6 +195,7 @@ def vgg19(pretrained=True, data_format="NHWC"):
     return model
 
 
+@model_factory
 def vgg19_bn(pretrained=True, data_format="NHWC"):
     """VGG19 model with BatchNorm2D"""
     model = VGG([2, 2, 4, 4, 4], True)
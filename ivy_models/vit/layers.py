@@ -4,6 +4,7 @@ from itertools import repeat
 from functools import partial
 from ivy.stateful.initializers import Zeros
 import ivy
+from ivy_models.helpers import tiled_attention
 
 
 def _make_ntuple(x: Any, n: int) -> Tuple[Any, ...]:
@@ -205,13 +206,21 @@ class VIT_EncoderBlock(ivy.Module):
         dropout: float,
         attention_dropout: float,
         norm_layer: Callable[..., ivy.Module] = partial(ivy.LayerNorm, eps=1e-6),
+        attention_mode: str = "dense",
+        attention_tile_size: int = 128,
     ):
+        ivy.utils.assertions.check_true(
+            attention_mode in ("dense", "tiled"),
+            f"Expected the attention mode 'dense' or 'tiled' got {attention_mode}",
+        )
         self.num_heads = num_heads
         self.hidden_dim = hidden_dim
         self.mlp_dim = mlp_dim
         self.dropout_p = dropout
         self.attention_dropout = attention_dropout
         self.norm_layer = norm_layer
+        self.attention_mode = attention_mode
+        self.attention_tile_size = attention_tile_size
 
         super().__init__()
 
@@ -235,7 +244,10 @@ class VIT_EncoderBlock(ivy.Module):
             f"Expected (batch_size, seq_length, hidden_dim) got {input.shape}",
         )
         x = self.ln_1(input)
-        x = self.self_attention(x, x, x)
+        if self.attention_mode == "tiled":
+            x = self._tiled_self_attention(x)
+        else:
+            x = self.self_attention(x, x, x)
         x = self.dropout(x)
         x = x + input
 
@@ -243,6 +255,30 @@ class VIT_EncoderBlock(ivy.Module):
         y = self.mlp(y)
         return x + y
 
+    def _tiled_self_attention(self, x):
+        # the projections of `ivy.MultiHeadAttention`, with its variables, around
+        # an attention which goes through the keys and values a tile at a time.
+        # The variables are read from those of the block, which the submodules
+        # are only given when they are called
+        w = self.v.self_attention
+        n, seq_length, _ = x.shape
+        head_dim = self.hidden_dim // self.num_heads
+        qkv = ivy.linear(x, w.in_proj_weights, bias=w.get("in_proj_bias"))
+        qkv = ivy.reshape(qkv, (n, seq_length, 3, self.num_heads, head_dim))
+        q, k, v = ivy.unstack(ivy.permute_dims(qkv, (2, 0, 3, 1, 4)), axis=0)
+        out = tiled_attention(
+            q * head_dim**-0.5,
+            k,
+            v,
+            tile_size=self.attention_tile_size,
+            dropout=self._attention_dropout,
+        )
+        out = ivy.reshape(ivy.permute_dims(out, (0, 2, 1, 3)), (n, seq_length, -1))
+        return ivy.linear(out, w.out_proj_weights, bias=w.get("out_proj_bias"))
+
+    def _attention_dropout(self, x):
+        return ivy.dropout(x, self.attention_dropout, training=self.training)
+
 
 class VIT_Encoder(ivy.Module):
     """Transformer Model Encoder for sequence to sequence translation."""
@@ -257,6 +293,8 @@ class VIT_Encoder(ivy.Module):
         dropout: float,
         attention_dropout: float,
         norm_layer: Callable[..., ivy.Module] = partial(ivy.LayerNorm, eps=1e-6),
+        attention_mode: str = "dense",
+        attention_tile_size: int = 128,
     ):
         # Note that batch_size is on the first dim because
         # we have batch_first=True in nn.MultiAttention() by default
@@ -273,6 +311,8 @@ class VIT_Encoder(ivy.Module):
                     dropout,
                     attention_dropout,
                     norm_layer,
+                    attention_mode,
+                    attention_tile_size,
                 )
             )
         self.layers = ivy.Sequential(*layers)
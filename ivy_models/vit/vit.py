@@ -1,4 +1,4 @@
-from ivy_models.helpers import load_torch_weights
+from ivy_models.helpers import load_torch_weights, model_factory
 from ivy_models.vit.layers import (
     Callable,
     Conv2dNormActivation,
@@ -29,6 +29,8 @@ class VisionTransformerSpec(BaseSpec):
         norm_layer: Callable[..., ivy.Module] = partial(ivy.LayerNorm, eps=1e-6),
         data_format: str = "NHWC",
         conv_stem_configs: Optional[List[ConvStemConfig]] = None,
+        attention_mode: str = "dense",
+        attention_tile_size: int = 128,
     ):
         ivy.utils.assertions.check_true(
             image_size % patch_size == 0, "Input shape indivisible by patch size!"
@@ -48,6 +50,8 @@ class VisionTransformerSpec(BaseSpec):
             norm_layer=norm_layer,
             data_format=data_format,
             conv_stem_configs=conv_stem_configs,
+            attention_mode=attention_mode,
+            attention_tile_size=attention_tile_size,
         )
 
 
@@ -69,6 +73,8 @@ class VisionTransformer(BaseModel):
         norm_layer: Callable[..., ivy.Module] = partial(ivy.LayerNorm, eps=1e-6),
         conv_stem_configs: Optional[List[ConvStemConfig]] = None,
         data_format: str = "NHWC",
+        attention_mode: str = "dense",
+        attention_tile_size: int = 128,
         spec=None,
         v=None,
     ):
@@ -89,6 +95,8 @@ class VisionTransformer(BaseModel):
                 norm_layer=norm_layer,
                 data_format=data_format,
                 conv_stem_configs=conv_stem_configs,
+                attention_mode=attention_mode,
+                attention_tile_size=attention_tile_size,
             )
         )
         super().__init__(v=v)
@@ -139,6 +147,8 @@ class VisionTransformer(BaseModel):
             self.spec.dropout,
             self.spec.attention_dropout,
             self.spec.norm_layer,
+            self.spec.attention_mode,
+            self.spec.attention_tile_size,
         )
         self.seq_length = seq_length
 
@@ -244,6 +254,7 @@ def _vision_transformer(
     return model
 
 
+@model_factory
 def vit_b_16(data_format="NHWC", pretrained=True) -> VisionTransformer:
     model = _vision_transformer(
         patch_size=16,
@@ -265,6 +276,7 @@ def vit_b_16(data_format="NHWC", pretrained=True) -> VisionTransformer:
     return model
 
 
+@model_factory
 def vit_b_32(data_format="NHWC", pretrained=True) -> VisionTransformer:
     ref_model = _vision_transformer(
         patch_size=32,
@@ -286,6 +298,7 @@ def vit_b_32(data_format="NHWC", pretrained=True) -> VisionTransformer:
     return ref_model
 
 
+@model_factory
 def vit_l_16(data_format="NHWC", pretrained=True) -> VisionTransformer:
     ref_model = _vision_transformer(
         patch_size=16,
@@ -307,6 +320,7 @@ def vit_l_16(data_format="NHWC", pretrained=True) -> VisionTransformer:
     return ref_model
 
 
+@model_factory
 def vit_l_32(data_format="NHWC", pretrained=True) -> VisionTransformer:
     ref_model = _vision_transformer(
         patch_size=32,
@@ -328,6 +342,7 @@ def vit_l_32(data_format="NHWC", pretrained=True) -> VisionTransformer:
     return ref_model
 
 
+@model_factory
 def vit_h_14(data_format="NHWC", pretrained=True) -> VisionTransformer:
     ref_model = _vision_transformer(
         patch_size=14,
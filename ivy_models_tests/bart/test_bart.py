@@ -0,0 +1,172 @@
+import ivy
+import numpy as np
+from ivy_models import BartConfig, BartModel
+from ivy_models.helpers import (
+    EncoderOutputCache,
+    StaticKVCache,
+    load_flat_weights,
+    skeleton_weights,
+)
+
+
+def _tiny_bart_config():
+    return BartConfig(
+        vocab_size=64,
+        max_position_embeddings=32,
+        encoder_layers=2,
+        encoder_ffn_dim=32,
+        encoder_attention_heads=2,
+        decoder_layers=2,
+        decoder_ffn_dim=32,
+        decoder_attention_heads=2,
+        d_model=16,
+        dropout=0.0,
+    )
+
+
+def test_bart_generate(device, fw):
+    model = BartModel(_tiny_bart_config())
+    input_ids = ivy.asarray([[0, 5, 9, 13, 2], [0, 7, 2, 1, 1]], dtype="int64")
+    attention_mask = ivy.asarray([[1, 1, 1, 1, 1], [1, 1, 1, 0, 0]], dtype="int64")
+
+    cached = model.generate(input_ids, attention_mask, max_length=8)
+    uncached = model.generate(input_ids, attention_mask, max_length=8, use_cache=False)
+    assert cached.shape[0] == 2 and cached.shape[1] <= 8
+    assert np.array_equal(ivy.to_numpy(cached), ivy.to_numpy(uncached))
+
+    sampled = model.generate(
+        input_ids, attention_mask, max_length=8, do_sample=True, top_k=5, top_p=0.9
+    )
+    assert sampled.shape[0] == 2 and sampled.shape[1] <= 8
+
+
+def test_bart_static_kv_cache(device, fw):
+    config = _tiny_bart_config()
+    model = BartModel(config)
+    input_ids = ivy.asarray([[0, 5, 9, 13, 2]], dtype="int64")
+    decoder_input_ids = ivy.asarray([[2, 0, 11, 4]], dtype="int64")
+    static_cache = StaticKVCache(config.decoder_layers, 1, 2, 8, 8)
+
+    past_key_values = None
+    for i in range(decoder_input_ids.shape[1]):
+        outputs = model(
+            input_ids=input_ids,
+            decoder_input_ids=decoder_input_ids[:, i : i + 1],
+            past_key_values=past_key_values,
+            use_cache=True,
+        )
+        static_outputs = model(
+            input_ids=input_ids,
+            decoder_input_ids=decoder_input_ids[:, i : i + 1],
+            past_key_values=static_cache,
+            use_cache=True,
+        )
+        past_key_values = outputs[1]
+        assert np.allclose(
+            ivy.to_numpy(outputs[0]), ivy.to_numpy(static_outputs[0]), atol=1e-5
+        )
+    assert static_cache.get_seq_length() == decoder_input_ids.shape[1]
+
+
+def test_bart_beam_search(device, fw):
+    model = BartModel(_tiny_bart_config())
+    input_ids = ivy.asarray([[0, 5, 9, 13, 2], [0, 7, 2, 1, 1]], dtype="int64")
+    attention_mask = ivy.asarray([[1, 1, 1, 1, 1], [1, 1, 1, 0, 0]], dtype="int64")
+
+    cached = model.generate(input_ids, attention_mask, max_length=8, num_beams=3)
+    uncached = model.generate(
+        input_ids, attention_mask, max_length=8, num_beams=3, use_cache=False
+    )
+    assert cached.shape[0] == 2 and cached.shape[1] <= 8
+    assert np.array_equal(ivy.to_numpy(cached), ivy.to_numpy(uncached))
+
+
+def test_bart_encoder_cache(device, fw):
+    model = BartModel(_tiny_bart_config())
+    input_ids = ivy.asarray([[0, 5, 9, 13, 2]], dtype="int64")
+    encoder_cache = EncoderOutputCache(max_bytes=2**20)
+
+    reference = model.generate(input_ids, max_length=8)
+    first = model.generate(input_ids, max_length=8, encoder_cache=encoder_cache)
+    second = model.generate(input_ids, max_length=8, encoder_cache=encoder_cache)
+    assert encoder_cache.hits == 1 and encoder_cache.misses == 1
+    assert np.array_equal(ivy.to_numpy(reference), ivy.to_numpy(first))
+    assert np.array_equal(ivy.to_numpy(first), ivy.to_numpy(second))
+
+    # an entry larger than the budget isn't kept
+    small_cache = EncoderOutputCache(max_bytes=16)
+    model.generate(input_ids, max_length=8, encoder_cache=small_cache)
+    assert len(small_cache) == 0 and small_cache.nbytes == 0
+
+
+def test_bart_tied_weights(device, fw, tmp_path):
+    config = _tiny_bart_config()
+    model = BartModel(config)
+    weights_path = str(tmp_path / "weights.ivyw")
+    model._save_weights(weights_path, safe_serialization=True)
+    # the tied embeddings are only written once
+    saved_keys = list(load_flat_weights(weights_path).cont_to_iterator_keys())
+    assert "shared/w" in saved_keys
+    assert not any("embed_tokens" in kc for kc in saved_keys)
+
+    with skeleton_weights():
+        loaded = BartModel(config)
+    loaded.v = BartModel._load_weights(weights_path, safe_serialization=True)
+    assert set(loaded.v.cont_to_iterator_keys()) == set(model.v.cont_to_iterator_keys())
+    for m in (model, loaded):
+        for kc in BartModel._tied_weights_keys.keys():
+            assert m.v.cont_at_key_chain(kc) is m.v.shared.w
+        assert m.shared.v.w is m.v.shared.w
+        assert m.encoder.embed_tokens.v.w is m.v.shared.w
+        assert m.decoder.embed_tokens.v.w is m.v.shared.w
+
+    input_ids = ivy.asarray([[0, 5, 9, 13, 2]], dtype="int64")
+    assert np.allclose(
+        ivy.to_numpy(model(input_ids, return_dict=False)[0]),
+        ivy.to_numpy(loaded(input_ids, return_dict=False)[0]),
+        atol=1e-6,
+    )
+    # replacing the shared embeddings replaces those of the encoder and decoder
+    loaded.v = loaded.v.cont_set_at_key_chain(
+        "shared/w", ivy.zeros_like(model.v.shared.w)
+    )
+    assert loaded.v.encoder.embed_tokens.w is loaded.v.shared.w
+    assert not np.any(ivy.to_numpy(loaded.decoder.embed_tokens(input_ids)))
+
+
+def test_bart_fused_qkv(device, fw):
+    model = BartModel(_tiny_bart_config())
+    fused_config = _tiny_bart_config()
+    fused_config.fused_qkv = True
+    fused_model = BartModel(fused_config, v=model.v)
+
+    input_ids = ivy.asarray([[0, 5, 9, 13, 2]], dtype="int64")
+    assert np.allclose(
+        ivy.to_numpy(model(input_ids, return_dict=False)[0]),
+        ivy.to_numpy(fused_model(input_ids, return_dict=False)[0]),
+        atol=1e-5,
+    )
+    assert np.array_equal(
+        ivy.to_numpy(model.generate(input_ids, max_length=8, num_beams=2)),
+        ivy.to_numpy(fused_model.generate(input_ids, max_length=8, num_beams=2)),
+    )
+
+
+def test_bart_tiled_attention(device, fw):
+    model = BartModel(_tiny_bart_config())
+    tiled_config = _tiny_bart_config()
+    tiled_config.attention_mode = "tiled"
+    tiled_config.attention_tile_size = 2
+    tiled_model = BartModel(tiled_config, v=model.v)
+
+    input_ids = ivy.asarray([[0, 5, 9, 13, 2], [0, 7, 2, 1, 1]], dtype="int64")
+    attention_mask = ivy.asarray([[1, 1, 1, 1, 1], [1, 1, 1, 0, 0]], dtype="int64")
+    assert np.allclose(
+        ivy.to_numpy(model(input_ids, attention_mask, return_dict=False)[0]),
+        ivy.to_numpy(tiled_model(input_ids, attention_mask, return_dict=False)[0]),
+        atol=1e-5,
+    )
+    assert np.array_equal(
+        ivy.to_numpy(model.generate(input_ids, attention_mask, max_length=8)),
+        ivy.to_numpy(tiled_model.generate(input_ids, attention_mask, max_length=8)),
+    )
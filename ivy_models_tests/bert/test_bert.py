@@ -2,7 +2,8 @@ import os
 import ivy
 import pytest
 import numpy as np
-from ivy_models import bert_base_uncased
+from ivy_models import BertConfig, BertModel, bert_base_uncased
+from ivy_models.helpers import DynamicBatcher, StaticKVCache
 
 
 @pytest.mark.parametrize("batch_shape", [[1]])
@@ -25,3 +26,164 @@ def test_bert(device, fw, batch_shape, load_weights):
         logits_path = os.path.join(this_dir, "bert_pooled_output.npy")
         ref_logits = np.load(logits_path)
         assert np.allclose(ref_logits, ivy.to_numpy(logits), rtol=0.005, atol=0.0005)
+
+
+def _tiny_bert_config(**overrides):
+    config = dict(
+        vocab_size=64,
+        hidden_size=32,
+        num_hidden_layers=2,
+        num_attention_heads=4,
+        intermediate_size=64,
+        hidden_act="gelu",
+        max_position_embeddings=16,
+    )
+    config.update(overrides)
+    return BertConfig(**config)
+
+
+def test_bert_fused_qkv(device, fw):
+    model = BertModel(_tiny_bert_config())
+    fused_model = BertModel(_tiny_bert_config(fused_qkv=True), v=model.v)
+
+    input_ids = ivy.asarray([[1, 5, 9, 2, 0]])
+    attention_mask = ivy.asarray([[1, 1, 1, 1, 0]])
+    out = model(input_ids, attention_mask)["last_hidden_state"]
+    fused_out = fused_model(input_ids, attention_mask)["last_hidden_state"]
+    assert np.allclose(ivy.to_numpy(out), ivy.to_numpy(fused_out), atol=1e-5)
+    # the fused layers are the only copy of the projections
+    key_chains = list(fused_model.v.cont_to_iterator_keys())
+    assert any("qkv" in kc for kc in key_chains)
+    assert not any("query" in kc for kc in key_chains)
+
+
+def test_bert_4d_attention_mask(device, fw):
+    model = BertModel(_tiny_bert_config())
+    input_ids = ivy.asarray([[1, 5, 9, 2, 0]])
+    mask = np.array([[1, 1, 1, 1, 0]])
+    out = model(input_ids, ivy.asarray(mask))["last_hidden_state"]
+    # a 4-dimensional mask of 0s and 1s is converted like a 2-dimensional one
+    for mask_4d in (mask[:, None, None], mask[:, None, None].astype(bool)):
+        out_4d = model(input_ids, ivy.asarray(mask_4d))["last_hidden_state"]
+        assert np.allclose(ivy.to_numpy(out), ivy.to_numpy(out_4d), atol=1e-5)
+
+
+def test_bert_static_kv_cache(device, fw):
+    config = _tiny_bert_config(is_decoder=True)
+    model = BertModel(config)
+    input_ids = ivy.asarray([[1, 5, 9, 2, 7]])
+    static_cache = StaticKVCache(config.num_hidden_layers, 1, 4, 8, 8)
+
+    past_key_values = None
+    for i in range(input_ids.shape[1]):
+        outputs = model(
+            input_ids[:, i : i + 1], past_key_values=past_key_values, use_cache=True
+        )
+        static_outputs = model(
+            input_ids[:, i : i + 1], past_key_values=static_cache, use_cache=True
+        )
+        past_key_values = outputs["next_decoder_cache"]
+        assert static_outputs["next_decoder_cache"] is static_cache
+        assert np.allclose(
+            ivy.to_numpy(outputs["last_hidden_state"]),
+            ivy.to_numpy(static_outputs["last_hidden_state"]),
+            atol=1e-5,
+        )
+    assert static_cache.get_seq_length() == input_ids.shape[1]
+
+
+def test_bert_tiled_attention(device, fw):
+    model = BertModel(_tiny_bert_config())
+    tiled_model = BertModel(
+        _tiny_bert_config(attention_mode="tiled", attention_tile_size=4), v=model.v
+    )
+
+    input_ids = ivy.asarray([[1, 5, 9, 2, 7, 3, 0, 0, 0, 0]])
+    attention_mask = ivy.asarray([[1, 1, 1, 1, 1, 1, 0, 0, 0, 0]])
+    out = model(input_ids, attention_mask)["last_hidden_state"]
+    tiled_out = tiled_model(input_ids, attention_mask)["last_hidden_state"]
+    assert np.allclose(ivy.to_numpy(out), ivy.to_numpy(tiled_out), atol=1e-5)
+
+
+def test_bert_sliding_window(device, fw):
+    model = BertModel(_tiny_bert_config())
+    window_model = BertModel(
+        _tiny_bert_config(
+            attention_mode="sliding_window",
+            attention_window=3,
+            num_global_tokens=1,
+        ),
+        v=model.v,
+    )
+
+    # the dense attention with the mask of the window and the global token
+    seq_len, valid = 11, 9
+    input_ids = ivy.asarray([[1] + list(range(5, 5 + valid - 1)) + [0, 0]])
+    key_mask = np.arange(seq_len) < valid
+    positions = np.arange(seq_len)
+    band = np.abs(positions[:, None] - positions[None]) <= 3
+    band[0], band[:, 0] = True, True
+    out = model(input_ids, ivy.asarray((band & key_mask)[None].astype(np.int64)))
+    window_out = window_model(input_ids, ivy.asarray(key_mask[None].astype(np.int64)))
+    assert np.allclose(
+        ivy.to_numpy(out["last_hidden_state"])[:, :valid],
+        ivy.to_numpy(window_out["last_hidden_state"])[:, :valid],
+        atol=1e-5,
+    )
+
+    # longer than max_position_embeddings, the position embeddings are tiled
+    long_ids = ivy.asarray([list(range(1, 41))])
+    long_out = window_model(long_ids)["last_hidden_state"]
+    tiled_ids = ivy.asarray([np.arange(40) % 16])
+    tiled_out = window_model(long_ids, position_ids=tiled_ids)["last_hidden_state"]
+    assert long_out.shape == (1, 40, 32)
+    assert np.allclose(ivy.to_numpy(long_out), ivy.to_numpy(tiled_out), atol=1e-5)
+
+
+def test_bert_packed(device, fw):
+    model = BertModel(_tiny_bert_config(), pooler_out=True)
+    rows = [[1, 5, 9, 2], [1, 7, 2], [1, 3, 4, 6, 8, 2]]
+    input_ids = ivy.asarray([row + [0] * (6 - len(row)) for row in rows])
+    attention_mask = ivy.asarray([[1] * len(r) + [0] * (6 - len(r)) for r in rows])
+
+    out = model(input_ids, attention_mask, packed=True)
+    padded = model(input_ids, attention_mask, packed=True, pad_outputs=True)
+    assert out["last_hidden_state"].shape == (1, 13, 32)
+    assert out["cu_seqlens"] == [0, 4, 7, 13]
+    for i, row in enumerate(rows):
+        ref = model(ivy.asarray([row]))
+        start, end = out["cu_seqlens"][i : i + 2]
+        assert np.allclose(
+            ivy.to_numpy(out["last_hidden_state"][0, start:end]),
+            ivy.to_numpy(ref["last_hidden_state"][0]),
+            atol=1e-5,
+        )
+        assert np.allclose(
+            ivy.to_numpy(padded["last_hidden_state"][i, : len(row)]),
+            ivy.to_numpy(ref["last_hidden_state"][0]),
+            atol=1e-5,
+        )
+        assert np.allclose(
+            ivy.to_numpy(out["pooler_output"][i]),
+            ivy.to_numpy(ref["pooler_output"][0]),
+            atol=1e-5,
+        )
+
+    # a row without any token can't be packed
+    empty_mask = ivy.asarray([[1, 1, 0], [0, 0, 0]])
+    with pytest.raises(ivy.exceptions.IvyException):
+        model(input_ids[:2, :3], empty_mask, packed=True)
+
+
+def test_bert_dynamic_batcher(device, fw):
+    model = BertModel(_tiny_bert_config())
+    batcher = DynamicBatcher(model, bucket_lengths=(4, 8), max_batch_size=2)
+    rows = [[1, 5, 2], [1, 7, 9, 11, 13, 2], [1, 2]]
+    futures = [batcher.submit(row) for row in rows]
+    batcher.close()
+
+    for row, future in zip(rows, futures):
+        out = future.result()["last_hidden_state"]
+        ref = model(ivy.asarray([row]))["last_hidden_state"][0]
+        assert out.shape == (len(row), 32)
+        assert np.allclose(ivy.to_numpy(out), ivy.to_numpy(ref), atol=1e-5)
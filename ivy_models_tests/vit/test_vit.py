@@ -4,6 +4,7 @@ import pytest
 import random
 import ivy
 from ivy_models_tests import helpers
+from ivy_models.vit.layers import VIT_EncoderBlock
 from ivy_models.vit import (
     vit_b_16,
     vit_b_32,
@@ -65,3 +66,14 @@ def test_vit_img_classification(device, fw, data_format):
         true_indices = np.sort(np.array(LOGITS[model_var]))
         calc_indices = np.sort(np.argsort(np_out)[-5:][::-1])
         assert np.array_equal(true_indices, calc_indices)
+
+
+def test_vit_tiled_attention(device, fw):
+    block = VIT_EncoderBlock(4, 32, 64, 0.0, 0.0)
+    tiled_block = VIT_EncoderBlock(
+        4, 32, 64, 0.0, 0.0, attention_mode="tiled", attention_tile_size=8
+    )
+
+    x = ivy.random_uniform(shape=(2, 50, 32))
+    out, tiled_out = block(x), tiled_block(x, v=block.v)
+    assert np.allclose(ivy.to_numpy(out), ivy.to_numpy(tiled_out), atol=1e-5)
@@ -0,0 +1,80 @@
+import ivy
+import pytest
+import numpy as np
+from ivy_models.helpers import cast_weights, save_flat_weights, load_flat_weights
+from ivy_models.helpers import weights_cache
+from ivy_models.helpers.dtype_policy import (
+    _float32_to_bfloat16_bits,
+    _bfloat16_bits_to_float32,
+)
+
+
+def _weights():
+    return ivy.Container(
+        {
+            "conv1": {"w": ivy.random_uniform(shape=(3, 3, 3, 8))},
+            "bn1": {"w": ivy.ones(8), "b": ivy.zeros(8)},
+            "layer1": {
+                "v0": {
+                    "running_mean": ivy.zeros(8),
+                    "running_var": ivy.ones(8),
+                    "w": ivy.ones(8),
+                }
+            },
+            "encoder": {"pos_embedding": ivy.random_uniform(shape=(1, 4, 8))},
+            "fc": {"w": ivy.random_uniform(shape=(8, 10))},
+            "step": ivy.array(3, dtype="int64"),
+        }
+    )
+
+
+def test_cast_weights_keeps_fp32(device, fw):
+    weights = cast_weights(_weights(), "float16")
+    assert ivy.dtype(weights.conv1.w) == "float16"
+    assert ivy.dtype(weights.fc.w) == "float16"
+    for x in [
+        weights.bn1.w,
+        weights.layer1.v0.running_mean,
+        weights.layer1.v0.w,
+        weights.encoder.pos_embedding,
+    ]:
+        assert ivy.dtype(x) == "float32"
+    assert ivy.dtype(weights.step) == "int64"
+
+    weights = cast_weights(_weights(), "float16", keep_fp32=False)
+    assert ivy.dtype(weights.layer1.v0.running_mean) == "float16"
+
+
+def test_bfloat16_flat_weights(device, fw, tmp_path):
+    if fw == "numpy":
+        pytest.skip("numpy has no bfloat16")
+    path = str(tmp_path / "weights.ivyw")
+    weights = _weights()
+    save_flat_weights(cast_weights(weights, "bfloat16"), path)
+    loaded = load_flat_weights(path)
+
+    assert loaded.conv1.w.dtype == np.float32
+    assert np.allclose(loaded.conv1.w, ivy.to_numpy(weights.conv1.w), rtol=1e-2)
+    assert np.array_equal(loaded.bn1.w, ivy.to_numpy(weights.bn1.w))
+
+
+def test_bfloat16_bits_nan(device, fw):
+    # a NaN whose payload is only in the bits dropped by bfloat16
+    nan = np.array([0x7F800001, 0xFFC00000], dtype=np.uint32).view(np.float32)
+    x = np.concatenate([nan, np.array([1.0, -np.inf], dtype=np.float32)])
+    y = _bfloat16_bits_to_float32(_float32_to_bfloat16_bits(x))
+    assert np.isnan(y[:2]).all()
+    assert np.array_equal(y[2:], x[2:])
+
+
+def test_weights_cache_dtype(device, fw, tmp_path, monkeypatch):
+    # the settings of the cache are restored once the test is done
+    monkeypatch.setattr(weights_cache, "_WEIGHTS_CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(weights_cache, "_WEIGHTS_CACHE_DTYPE", "float16")
+    weights = _weights()
+    weights_cache._save_cached_weights("key", weights)
+    cached = weights_cache._load_cached_weights("key")
+
+    for kc, x in weights.cont_to_iterator():
+        assert cached[kc].dtype == ivy.to_numpy(x).dtype
+        assert np.allclose(cached[kc], ivy.to_numpy(x), rtol=1e-3)
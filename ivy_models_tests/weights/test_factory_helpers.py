@@ -0,0 +1,33 @@
+import ivy
+import threading
+import numpy as np
+from ivy.stateful import initializers
+from ivy_models.helpers import skeleton_weights
+
+
+def test_skeleton_weights(device, fw):
+    with skeleton_weights():
+        linear = ivy.Linear(4, 8)
+
+    ref = ivy.Linear(4, 8)
+    linear.v.cont_assert_identical_structure([linear.v, ref.v])
+    for kc, x in ref.v.cont_to_iterator():
+        y = linear.v.cont_at_key_chain(kc)
+        assert ivy.shape(y) == ivy.shape(x)
+        assert ivy.dtype(y) == ivy.dtype(x)
+
+
+def test_skeleton_weights_other_threads(device, fw):
+    # a model built by another thread meanwhile is initialized as usual
+    built = {}
+
+    def build():
+        built["linear"] = ivy.Linear(
+            4, 8, weight_initializer=initializers.Constant(3.0)
+        )
+
+    with skeleton_weights():
+        thread = threading.Thread(target=build)
+        thread.start()
+        thread.join()
+    assert np.all(ivy.to_numpy(built["linear"].v.w) == 3.0)
@@ -0,0 +1,129 @@
+import ivy
+import pytest
+import numpy as np
+from ivy_models.helpers import (
+    save_flat_weights,
+    load_flat_weights,
+    flat_weights_to_backend,
+    load_lazy_weights,
+    enable_lazy_weights,
+    lazy_weights_stats,
+    save_sharded_weights,
+    load_sharded_weights,
+    sharded_weights_files,
+)
+
+
+def test_flat_weights_round_trip(device, fw, tmp_path):
+    path = str(tmp_path / "weights.ivyw")
+    weights = ivy.Container(
+        {
+            "conv": {"w": ivy.random_uniform(shape=(3, 3, 3, 5))},
+            "bn": {
+                "running_mean": ivy.random_uniform(shape=(5,)),
+                "num_batches": ivy.array(7, dtype="int64"),
+            },
+            "fc": {"b": ivy.random_uniform(shape=(3,), dtype="float16")},
+        }
+    )
+    save_flat_weights(weights, path)
+    loaded = load_flat_weights(path)
+
+    assert list(loaded.cont_to_iterator_keys()) == list(weights.cont_to_iterator_keys())
+    for kc, x in weights.cont_to_iterator():
+        y = loaded.cont_at_key_chain(kc)
+        assert isinstance(y, np.ndarray)
+        # leaves are read-only views over the mapped file, aligned to 64 bytes
+        assert not y.flags.owndata and not y.flags.writeable
+        assert y.ctypes.data % 64 == 0
+        assert y.dtype == ivy.to_numpy(x).dtype
+        assert np.array_equal(y, ivy.to_numpy(x))
+
+
+def test_flat_weights_to_backend(device, fw, tmp_path):
+    if fw == "jax":
+        pytest.skip("jax copies host buffers into its own arrays")
+    path = str(tmp_path / "weights.ivyw")
+    weights = ivy.Container({"fc": {"w": ivy.random_uniform(shape=(8, 4))}})
+    save_flat_weights(weights, path)
+    loaded = load_flat_weights(path)
+
+    # the arrays of the backend share the memory of the mapped file
+    wrapped = flat_weights_to_backend(loaded)
+    assert np.shares_memory(np.asarray(ivy.to_native(wrapped.fc.w)), loaded.fc.w)
+    assert np.array_equal(ivy.to_numpy(wrapped.fc.w), ivy.to_numpy(weights.fc.w))
+
+
+def test_lazy_weights(device, fw, tmp_path):
+    path = str(tmp_path / "weights.ivyw")
+    weights = ivy.Container(
+        {
+            "encoder": {"w": ivy.random_uniform(shape=(4, 8))},
+            "decoder": {"w": ivy.random_uniform(shape=(8, 4))},
+        }
+    )
+    save_flat_weights(weights, path)
+    lazy = load_lazy_weights(path)
+
+    stats = lazy_weights_stats(lazy)
+    assert stats["num_tensors"] == 2
+    assert stats["total_bytes"] == 2 * 4 * 8 * 4
+    assert stats["materialized_bytes"] == 0
+
+    encoder_w = lazy.encoder.w.materialize()
+    assert np.allclose(ivy.to_numpy(encoder_w), ivy.to_numpy(weights.encoder.w))
+    stats = lazy_weights_stats(lazy)
+    assert stats["num_materialized"] == 1
+    assert stats["materialized_bytes"] == 4 * 8 * 4
+
+
+def test_lazy_weights_forward(device, fw, tmp_path):
+    path = str(tmp_path / "weights.ivyw")
+    model = ivy.Sequential(ivy.Linear(4, 8), ivy.Linear(8, 2))
+    save_flat_weights(model.v, path)
+    # the placeholders are bound to a model which has already been built
+    lazy_model = enable_lazy_weights(
+        ivy.Sequential(ivy.Linear(4, 8), ivy.Linear(8, 2)), load_lazy_weights(path)
+    )
+    assert lazy_weights_stats(lazy_model)["num_materialized"] == 0
+
+    x = ivy.random_uniform(shape=(1, 4))
+    out = lazy_model(x)
+    assert np.allclose(ivy.to_numpy(out), ivy.to_numpy(model(x)), atol=1e-6)
+    # the forwards swapped the placeholders out of the variables
+    assert all(ivy.is_array(w) for _, w in lazy_model.v.cont_to_iterator())
+    stats = lazy_weights_stats(lazy_model)
+    assert stats["num_tensors"] == stats["num_materialized"] == 4
+    num_bytes = (4 * 8 + 8 + 8 * 2 + 2) * 4
+    assert stats["materialized_bytes"] == stats["total_bytes"] == num_bytes
+
+
+def test_sharded_weights(device, fw, tmp_path):
+    weights_path = str(tmp_path / "weights.ivyw")
+    weights = ivy.Container(
+        {
+            "encoder": {"w": ivy.random_uniform(shape=(16, 16))},
+            "decoder": {"w": ivy.random_uniform(shape=(16, 16))},
+            "head": {"b": ivy.random_uniform(shape=(16,))},
+        }
+    )
+    # every 16x16 float32 weight is 1KB, so each lands in its own shard
+    paths = save_sharded_weights(
+        weights, weights_path, max_shard_size="1KB", safe_serialization=True
+    )
+    index_path = paths[0]
+    assert index_path == weights_path + ".index.json"
+    assert len(paths) == 1 + 3
+
+    loaded = load_sharded_weights(index_path, safe_serialization=True)
+    assert sorted(loaded.cont_to_iterator_keys()) == sorted(
+        weights.cont_to_iterator_keys()
+    )
+    for kc, x in weights.cont_to_iterator():
+        assert np.allclose(loaded.cont_at_key_chain(kc), ivy.to_numpy(x))
+
+    assert len(sharded_weights_files(index_path, ["decoder"])) == 1
+    subset = load_sharded_weights(
+        index_path, key_chains=["decoder"], safe_serialization=True
+    )
+    assert list(subset.cont_to_iterator_keys()) == ["decoder/w"]
@@ -0,0 +1,66 @@
+import ivy
+import pytest
+import threading
+import numpy as np
+from ivy_models.helpers import HotSwapModel
+
+
+def test_hot_swap(device, fw):
+    model = ivy.Linear(4, 2)
+    server = HotSwapModel(model)
+    x = ivy.random_uniform(shape=(1, 4))
+
+    new_weights = model.v.cont_map(lambda w, kc: np.ones(ivy.shape(w), "float32"))
+    assert server.swap_async(new_weights).result() == 1
+    assert server.version == 1
+    assert np.allclose(ivy.to_numpy(server(x)), ivy.to_numpy(ivy.sum(x)) + 1)
+
+    bad_weights = new_weights.cont_map(lambda w, kc: np.ones((3,), "float32"))
+    with pytest.raises(ivy.exceptions.IvyException):
+        server.swap(bad_weights)
+    assert server.version == 1
+    server.close()
+
+
+def test_hot_swap_concurrent(device, fw):
+    model = ivy.Sequential(ivy.Linear(4, 4), ivy.Linear(4, 1))
+    server = HotSwapModel(model)
+    x = ivy.ones((1, 4))
+
+    # with every weight equal to `k`, the output only matches the one of
+    # version `k` if both layers used the weights of that version
+    def weights(k):
+        return model.v.cont_map(lambda w, kc: np.full(ivy.shape(w), k, "float32"))
+
+    def expected(k):
+        return 4 * k * (4 * k + k) + k
+
+    # while the clients run, the threads only call ivy through the server
+    new_weights = [weights(k) for k in range(1, 12)]
+    server.swap(new_weights[0])
+    stop = threading.Event()
+    results, errors = [], []
+
+    def client():
+        while not stop.is_set():
+            try:
+                results.append(server.call_with_version(x))
+            except Exception as e:
+                errors.append(e)
+                return
+
+    threads = [threading.Thread(target=client) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for w in new_weights[1:]:
+        server.swap_async(w).result()
+    stop.set()
+    for thread in threads:
+        thread.join()
+    server.close()
+
+    assert not errors
+    assert server.version == 11
+    assert results
+    for out, version in results:
+        assert np.isclose(float(ivy.to_numpy(out).item()), expected(version))
@@ -0,0 +1,72 @@
+import os
+import ivy
+import pytest
+import numpy as np
+from ivy_models.helpers import weights_cache
+
+
+def _weights(seed):
+    np.random.seed(seed)
+    return ivy.Container(
+        {
+            "conv1": {"w": ivy.array(np.random.uniform(size=(3, 3, 3, 8)))},
+            "fc": {
+                "w": ivy.array(np.random.uniform(size=(8, 10))),
+                "b": ivy.array(np.random.uniform(size=(10,))),
+            },
+        }
+    )
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    # the settings of the cache are restored once the test is done
+    monkeypatch.setattr(weights_cache, "_WEIGHTS_CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(
+        weights_cache,
+        "_WEIGHTS_CACHE_SIZE_LIMIT",
+        weights_cache.get_weights_cache_size_limit(),
+    )
+    return str(tmp_path)
+
+
+def test_weights_cache_round_trip(device, fw, cache_dir):
+    weights = _weights(0)
+
+    assert weights_cache._load_cached_weights("key") is None
+    weights_cache._save_cached_weights("key", weights)
+    cached = weights_cache._load_cached_weights("key")
+
+    assert sorted(cached.keys()) == ["conv1/w", "fc/b", "fc/w"]
+    for kc, x in weights.cont_to_iterator():
+        assert np.allclose(cached[kc], ivy.to_numpy(x))
+
+
+def test_weights_cache_lru_eviction(device, fw, cache_dir):
+    for i, key in enumerate(["a", "b", "c"]):
+        weights_cache._save_cached_weights(key, _weights(i))
+        path = os.path.join(cache_dir, "weights", key + ".npz")
+        os.utime(path, (i, i))
+    entry_size = os.path.getsize(path)
+
+    # touching "a" makes "b" the least recently used entry
+    weights_cache._load_cached_weights("a")
+    weights_cache.set_weights_cache_size_limit(2 * entry_size)
+    weights_cache._evict_weights_cache()
+
+    assert weights_cache._load_cached_weights("b") is None
+    assert weights_cache._load_cached_weights("a") is not None
+    assert weights_cache._load_cached_weights("c") is not None
+
+
+def test_mapping_plans_cache(device, fw, cache_dir):
+    plan = [{"source": "a", "target": "b", "pattern": None}]
+    weights_cache._save_mapping_plan("key", plan)
+    assert weights_cache._load_mapping_plan("key") == plan
+    weights_cache.clear_weights_cache()
+    assert weights_cache._load_mapping_plan("key") is None
+
+    # a disabled cache doesn't write the plans either
+    weights_cache.set_weights_cache_size_limit(0)
+    weights_cache._save_mapping_plan("key", plan)
+    assert not os.path.exists(os.path.join(cache_dir, "plans", "key.json"))
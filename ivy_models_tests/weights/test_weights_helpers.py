@@ -0,0 +1,113 @@
+import os
+import json
+import types
+import ivy
+import torch
+import pytest
+import numpy as np
+from ivy_models.helpers import load_transformers_weights
+from ivy_models.helpers.weights_helpers import (
+    _balanced_chunks,
+    _compile_pattern,
+    _convert_tensors,
+    _rearrange,
+    _resolve_hf_keys,
+)
+
+
+@pytest.mark.parametrize(
+    "pattern, shape",
+    [
+        ("b c h w -> h w c b", (8, 3, 5, 5)),
+        ("b c h w-> w h c b", (8, 3, 5, 4)),
+        ("h -> 1 1 1 h", (8,)),
+        ("h -> 1 h 1 1", (8,)),
+        ("a b -> b a", (4, 6)),
+        ("b 1 h w-> h w b", (8, 1, 3, 3)),
+        ("a 1 c d -> c d a", (8, 1, 3, 3)),
+        ("1 1 1 h -> h", (1, 1, 1, 8)),
+    ],
+)
+def test_mapping_plan_patterns(device, fw, pattern, shape):
+    x = np.random.uniform(size=shape).astype("float32")
+    assert _compile_pattern(pattern) is not None
+
+    ref = ivy.to_numpy(ivy.einops_rearrange(ivy.asarray(x), pattern))
+    assert np.array_equal(_rearrange(x, pattern), ref)
+
+
+def test_parallel_tensor_conversion(device, fw):
+    sizes = [100, 1, 50, 50, 2, 97]
+    chunks = _balanced_chunks(sizes, 2)
+    assert sorted(i for chunk in chunks for i in chunk) == list(range(len(sizes)))
+    assert [sum(sizes[i] for i in chunk) for chunk in chunks] == [150, 150]
+
+    tasks = [
+        (str(i), np.random.uniform(size=(i + 1, 3, 2, 2)), "b c h w -> h w c b")
+        for i in range(6)
+    ]
+    converted = dict(_convert_tensors(tasks, num_workers=3))
+    for kc, x, pattern in tasks:
+        assert np.array_equal(ivy.to_numpy(converted[kc]), _rearrange(x, pattern))
+
+
+def test_resolve_hf_keys(device, fw):
+    # the `pooler.dense.weight` of the base model isn't shadowed by the
+    # `bert.` one stripped of its prefix, whichever comes first
+    checkpoint_keys = [
+        "bert.pooler.dense.weight",
+        "pooler.dense.weight",
+        "bert.embeddings.LayerNorm.gamma",
+    ]
+    resolved = _resolve_hf_keys(
+        ["pooler.dense.weight", "embeddings.LayerNorm.weight"], checkpoint_keys
+    )
+    assert resolved == {
+        "pooler.dense.weight": "pooler.dense.weight",
+        "embeddings.LayerNorm.weight": "bert.embeddings.LayerNorm.gamma",
+    }
+
+
+def test_transformers_weights_from_sharded_checkpoint(device, fw, tmp_path):
+    shards = {
+        "pytorch_model-00001-of-00002.bin": {
+            "bert.embeddings.LayerNorm.gamma": torch.rand(4),
+            "bert.embeddings.LayerNorm.beta": torch.rand(4),
+        },
+        "pytorch_model-00002-of-00002.bin": {
+            "bert.pooler.dense.weight": torch.rand(4, 4),
+            "cls.predictions.bias": torch.rand(8),
+        },
+    }
+    weight_map = {}
+    for shard, state_dict in shards.items():
+        torch.save(state_dict, os.path.join(tmp_path, shard))
+        weight_map.update({name: shard for name in state_dict.keys()})
+    with open(os.path.join(tmp_path, "pytorch_model.bin.index.json"), "w") as f:
+        json.dump({"weight_map": weight_map}, f)
+
+    model = types.SimpleNamespace(
+        v=ivy.Container(
+            {
+                "embeddings": {"LayerNorm": {"w": ivy.zeros(4), "b": ivy.zeros(4)}},
+                "pooler": {"dense": {"w": ivy.zeros((4, 4))}},
+            }
+        )
+    )
+
+    def map_fn(name):
+        name = name.replace("__w", ".weight").replace("__b", ".bias")
+        return name.replace("__", ".")
+
+    weights = load_transformers_weights(str(tmp_path), model, map_fn)
+    weights.cont_assert_identical_structure([weights, model.v])
+    assert np.array_equal(
+        ivy.to_numpy(weights.embeddings.LayerNorm.w),
+        shards["pytorch_model-00001-of-00002.bin"][
+            "bert.embeddings.LayerNorm.gamma"
+        ].numpy(),
+    )
+    assert np.array_equal(
+        ivy.to_numpy(weights.pooler.dense.w),
+        shards["pytorch_model-00002-of-00002.bin"]["bert.pooler.dense.weight"].numpy(),
+    )